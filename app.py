@@ -1,5 +1,5 @@
 
-import os, json, math
+import os, json, math, time, threading, logging
 import tkinter as tk
 import tkinter.font as tkfont
 from tkinter import ttk, filedialog, messagebox
@@ -15,8 +15,21 @@ from matplotlib.colors import Normalize
 from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
 
 from src.utils import load_json
-from src.worm_model import compute_worm_cycle
+from src.worm_model import parse_inputs
 from src.export_xlsx import export_cycle_xlsx
+from src.project import save_project, open_project
+from src.catalog import WormCatalog, result_inputs
+from src.opmap import compute_operating_map
+from src.wear import simulate_wear
+from src.history import DesignHistory
+from src.trace import open_trace, overview, rainflow
+from src.explorer import ExplorerTable, MARKER_LIMIT
+from src.surrogate import fit_from_history, SURROGATE_OUTPUTS
+from src.history import card_hash
+from src.neighbors import DesignIndex
+from src.graph import ModelGraph
+
+log = logging.getLogger(__name__)
 
 # =====================================================================
 # i18n bilingual dictionary
@@ -28,12 +41,39 @@ LANG_ZH = {
     "tab_res": "  \u5e94\u529b\u4e0e\u6548\u7387  ",
     "tab_fat": "  \u5bff\u547d\u6821\u6838  ",
     "tab_formula": "  \u516c\u5f0f\u8bf4\u660e  ",
+    "tab_map": "  \u5de5\u51b5\u56fe\u8c31  ",
+    "tab_explore": "  \u8bbe\u8ba1\u7a7a\u95f4  ",
+    "exp_source": "\u6765\u6e90", "exp_x": "X", "exp_y": "Y", "exp_color": "\u7740\u8272",
+    "exp_filter": "\u7b5b\u9009", "exp_load": "  \u8f7d\u5165\u5386\u53f2  ",
+    "exp_apply": "  \u5e94\u7528\u7b5b\u9009  ", "exp_reset": "  \u91cd\u7f6e\u89c6\u56fe  ",
+    "exp_hint": "\u6eda\u8f6e\u7f29\u653e\uff0c\u62d6\u52a8\u6846\u9009\u7b5b\u9009\uff0c\u5355\u51fb\u8f7d\u5165\u8bbe\u8ba1",
+    "map_T1": "T1 \u8303\u56f4 (min:max)", "map_n1": "n1 \u8303\u56f4 (min:max)",
+    "map_grid": "\u7f51\u683c\u70b9\u6570", "map_calc": "\u8ba1\u7b97\u5de5\u51b5\u56fe\u8c31",
     "menu_file": "  \u6587\u4ef6  ",
     "menu_export": "  \u5bfc\u51fa XLSX\uff08\u66f2\u7ebf\uff09...",
+    "menu_open_project": "  \u6253\u5f00\u9879\u76ee...",
+    "menu_save_project": "  \u4fdd\u5b58\u9879\u76ee...",
     "menu_exit": "  \u9000\u51fa",
+    "menu_tools": "  \u5de5\u5177  ",
+    "menu_catalog": "  \u6807\u51c6\u8717\u6746\u526f\u9009\u578b...",
+    "menu_history": "  \u8bbe\u8ba1\u5386\u53f2...",
+    "menu_similar": "  \u76f8\u4f3c\u8bbe\u8ba1...",
+    "sim_title": "\u76f8\u4f3c\u8bbe\u8ba1\uff08\u6700\u8fd1\u90bb\uff09",
+    "sim_refresh": "  \u6309\u5f53\u524d\u8f93\u5165\u67e5\u627e  ",
+    "sim_indexing": "\u6b63\u5728\u5efa\u7acb\u7d22\u5f15...",
+    "sim_failed": "\u7d22\u5f15\u5efa\u7acb\u5931\u8d25",
+    "hist_title": "\u8bbe\u8ba1\u5386\u53f2",
+    "hist_filter": "\u7b5b\u9009\uff08\u5982 a_mm<60, SF_root>1.3, ratio=25\uff09",
+    "hist_order": "\u6392\u5e8f\u5217\uff08\u524d\u7f00 - \u4e3a\u964d\u5e8f\uff09",
+    "hist_query": "  \u67e5\u8be2  ", "hist_load": "  \u8f7d\u5165\u5230\u8f93\u5165  ",
+    "cat_title": "\u6807\u51c6\u8717\u6746\u526f\u9009\u578b",
+    "cat_T2": "\u6240\u9700\u8f93\u51fa\u626d\u77e9 T2", "cat_ratio": "\u4f20\u52a8\u6bd4 i",
+    "cat_amax": "\u6700\u5927\u4e2d\u5fc3\u8ddd a_max", "cat_sfmin": "\u6700\u5c0f\u5b89\u5168\u7cfb\u6570",
+    "cat_search": "  \u641c\u7d22  ", "cat_apply": "  \u5e94\u7528\u5230\u51e0\u4f55\u9875  ",
     "drive_params": "\u9a71\u52a8\u53c2\u6570",
     "T1_Nm": "\u8f93\u5165\u626d\u77e9 T1", "n1_rpm": "\u8717\u6746\u8f6c\u901f n1",
-    "ratio": "\u4f20\u52a8\u6bd4 i", "life_h": "\u76ee\u6807\u5bff\u547d", "steps": "\u76f8\u4f4d\u70b9\u6570",
+    "ratio": "\u4f20\u52a8\u6bd4 i", "life_h": "\u76ee\u6807\u5bff\u547d",
+    "SF_target": "\u76ee\u6807\u5b89\u5168\u7cfb\u6570", "steps": "\u76f8\u4f4d\u70b9\u6570 (\u6570\u503c/auto)",
     "calc_ratio": "  \u7531z\u7b97i  ", "worm_params": "\u8717\u6746\u53c2\u6570",
     "auto_calc_worm": "  \u81ea\u52a8\u8ba1\u7b97\u8717\u6746\u5c3a\u5bf8  ",
     "basic_params": "\u57fa\u672c\u53c2\u6570", "z1": "\u5934\u6570 z1", "mn_mm": "\u6cd5\u5411\u6a21\u6570 mn",
@@ -54,8 +94,15 @@ LANG_ZH = {
     "common_params": "\u516c\u5171\u53c2\u6570\u4e0e\u4fee\u6b63\u7cfb\u6570",
     "cross_angle_deg": "\u4ea4\u9519\u89d2 Sigma", "mu": "\u6469\u64e6\u7cfb\u6570 mu",
     "KA": "\u4f7f\u7528\u7cfb\u6570 KA", "KV": "\u52a8\u8f7d\u7cfb\u6570 KV",
-    "KHb": "\u9f7f\u5bbd\u8f7d\u8377\u7cfb\u6570 KHb", "KFb": "\u9f7f\u6839\u8f7d\u8377\u7cfb\u6570 KFb",
+    "KHb": "\u9f7f\u5bbd\u8f7d\u8377\u7cfb\u6570 KHb (\u6570\u503c/auto)",
+    "n_slices": "\u9f7f\u5bbd\u5206\u7247\u6570", "fHb_um": "\u87ba\u65cb\u7ebf\u503e\u659c\u504f\u5dee fHb",
+    "crown_um": "\u9f13\u5f62\u91cf",
+    "mean_stress": "\u5e73\u5747\u5e94\u529b\u4fee\u6b63 (none/goodman/gerber/walker)",
+    "load_sharing": "\u591a\u9f7f\u8f7d\u8377\u5206\u914d (on/off)", "tip_relief_um": "\u9f7f\u9876\u4fee\u7f18\u91cf",
+    "KFb": "\u9f7f\u6839\u8f7d\u8377\u7cfb\u6570 KFb",
     "temp_C": "\u5de5\u4f5c\u6e29\u5ea6",
+    "thermal": "\u70ed\u5e73\u8861\u6a21\u5f0f (on/off)", "T_amb_C": "\u73af\u5883\u6e29\u5ea6",
+    "k_heat_W_m2K": "\u7bb1\u4f53\u6563\u70ed\u7cfb\u6570 k", "A_housing_m2": "\u7bb1\u4f53\u6563\u70ed\u9762\u79ef A",
     "btn_refresh": "\u66f4\u65b0\u793a\u610f\u56fe", "btn_calc": "\u8ba1\u7b97\u5e76\u7ed8\u56fe",
     "geom_check_wait": "\u51e0\u4f55\u6821\u6838\u4fe1\u606f\uff1a\u7b49\u5f85\u8f93\u5165\u53c2\u6570\u3002",
     "diagram_title": "Worm-Wheel Focused Mesh Section",
@@ -65,6 +112,7 @@ LANG_ZH = {
     "mat_name": "\u6750\u6599\u540d\u79f0", "mat_standard": "\u6807\u51c6", "mat_E": "\u5f39\u6027\u6a21\u91cf E",
     "mat_nu": "\u6cca\u677e\u6bd4 nu", "mat_yield": "\u5c48\u670d\u5f3a\u5ea6 Rp0.2",
     "mat_tensile": "\u62c9\u4f38\u5f3a\u5ea6 Rm", "mat_hardness": "\u786c\u5ea6 HRC",
+    "mat_walker": "Walker \u6307\u6570 gamma",
     "mat_notes": "\u5907\u6ce8",
     "mat_wheel_title": "\u8717\u8f6e\u6750\u6599",
     "mat_base_template": "\u57fa\u7840\u6a21\u677f",
@@ -74,7 +122,18 @@ LANG_ZH = {
     "sn_add": "\u6dfb\u52a0\u884c", "sn_delete": "\u5220\u9664\u9009\u4e2d",
     "sn_apply": "\u5e94\u7528\u6750\u6599\u5361",
     "mat_save_json": "\u4fdd\u5b58\u4e3a JSON...",
+    "sur_preview": "\u9884\u4f30\uff08\u4ee3\u7406\u6a21\u578b\uff09", "sur_exact": "\u7cbe\u786e\u7ed3\u679c",
+    "sur_extrap": "\u8d85\u51fa\u8bad\u7ec3\u8303\u56f4", "sur_running": "\u8ba1\u7b97\u4e2d...",
+    "graph_reused": "\u590d\u7528\u9636\u6bb5",
     "res_footer": "\u8f7b\u91cf\u4ee3\u7406\u6a21\u578b\u7ed3\u679c\uff08\u542b KISSsoft \u98ce\u683c\u4fee\u6b63\u7cfb\u6570\uff09",
+    "wear_max": "\u78e8\u635f\u9650\u503c", "wear_sf_min": "\u6700\u5c0f SF", "wear_chunk": "\u65f6\u95f4\u6b65\u957f",
+    "btn_wear": "\u78e8\u635f\u4eff\u771f",
+    "trace_title": "\u5b9e\u6d4b\u8f7d\u8377\u5386\u7a0b", "btn_trace": "\u5bfc\u5165\u5386\u7a0b...",
+    "trace_kind": "\u7c7b\u578b", "trace_raw": "\u539f\u59cb\u683c\u5f0f",
+    "trace_hint": "\u6eda\u8f6e\u7f29\u653e\u6982\u89c8\u56fe",
+    "trace_need_run": "\u626d\u77e9\u5386\u7a0b\u9700\u8981\u5148\u8ba1\u7b97\u8bbe\u8ba1\uff08\u7528\u4e8e\u6362\u7b97\u9f7f\u6839\u5e94\u529b\uff09\u3002",
+    "coll_title": "\u8f7d\u8377\u8c31 (\u53ef\u9009)",
+    "coll_hint": "\u6bcf\u884c: T1 n1 \u65f6\u95f4\u5360\u6bd4\uff1b2x = 2\u00d7\u8bbe\u8ba1\u503c\uff1b\u7559\u7a7a = \u5355\u4e00\u5de5\u51b5",
     "worm_output": "\u8717\u6746\u8f93\u51fa\u53c2\u6570", "wheel_output": "\u8717\u8f6e\u8f93\u51fa\u53c2\u6570",
     "fat_wait": '\u70b9\u51fb"\u8ba1\u7b97\u5e76\u7ed8\u56fe"\u540e\uff0c\u6b64\u5904\u663e\u793a\u75b2\u52b3\u635f\u4f24\u4e0e\u5b89\u5168\u7cfb\u6570\u6c47\u603b\u3002',
     "formula_title": "\u516c\u5f0f\u4e0e\u53c2\u6570\u8bf4\u660e\uff08\u5ba1\u6838\u7528\uff09",
@@ -87,11 +146,36 @@ LANG_EN = {
     "app_title": "WormGear Studio \u2014 Worm Gear Design & Check",
     "tab_geom": "  Geometry  ", "tab_mat": "  Material & S-N  ",
     "tab_res": "  Stress & Efficiency  ", "tab_fat": "  Fatigue Check  ", "tab_formula": "  Formula Notes  ",
+    "tab_map": "  Operating Map  ",
+    "tab_explore": "  Design Space  ",
+    "exp_source": "Source", "exp_x": "X", "exp_y": "Y", "exp_color": "Color",
+    "exp_filter": "Filter", "exp_load": "  Load History  ",
+    "exp_apply": "  Apply Filter  ", "exp_reset": "  Reset View  ",
+    "exp_hint": "Scroll to zoom, drag to brush, click a design to load it",
+    "map_T1": "T1 range (min:max)", "map_n1": "n1 range (min:max)",
+    "map_grid": "Grid points", "map_calc": "Compute Operating Map",
     "menu_file": "  File  ", "menu_export": "  Export XLSX (curves)...",
+    "menu_open_project": "  Open Project...", "menu_save_project": "  Save Project...",
     "menu_exit": "  Exit",
+    "menu_tools": "  Tools  ", "menu_catalog": "  Catalog Search...",
+    "menu_history": "  Design History...",
+    "menu_similar": "  Similar Designs...",
+    "sim_title": "Similar Designs (nearest neighbours)",
+    "sim_refresh": "  Find for Current Inputs  ",
+    "sim_indexing": "Building index ...",
+    "sim_failed": "Index build failed",
+    "hist_title": "Design History",
+    "hist_filter": "Filter (e.g. a_mm<60, SF_root>1.3, ratio=25)",
+    "hist_order": "Order by (prefix - for descending)",
+    "hist_query": "  Query  ", "hist_load": "  Load into Inputs  ",
+    "cat_title": "Standard Worm Set Search",
+    "cat_T2": "Required Output Torque T2", "cat_ratio": "Ratio i",
+    "cat_amax": "Max Center Distance a_max", "cat_sfmin": "Min Safety Factor",
+    "cat_search": "  Search  ", "cat_apply": "  Apply to Geometry  ",
     "drive_params": "Drive Parameters",
     "T1_Nm": "Input Torque T1", "n1_rpm": "Worm Speed n1",
-    "ratio": "Gear Ratio i", "life_h": "Target Life", "steps": "Phase Points",
+    "ratio": "Gear Ratio i", "life_h": "Target Life",
+    "SF_target": "Target SF", "steps": "Phase Points (value/auto)",
     "calc_ratio": "  Calc i from z  ", "worm_params": "Worm Parameters",
     "auto_calc_worm": "  Auto-Calc Worm Dims  ",
     "basic_params": "Basic Parameters", "z1": "No. of Starts z1",
@@ -110,8 +194,15 @@ LANG_EN = {
     "common_params": "Common Params & Correction Factors",
     "cross_angle_deg": "Shaft Angle Sigma", "mu": "Friction Coeff. mu",
     "KA": "Application Factor KA", "KV": "Dynamic Factor KV",
-    "KHb": "Load Dist. Factor KHb", "KFb": "Root Load Factor KFb",
+    "KHb": "Load Dist. Factor KHb (value/auto)",
+    "n_slices": "Face-Width Slices", "fHb_um": "Helix Slope Dev. fHb",
+    "crown_um": "Crowning",
+    "mean_stress": "Mean Stress (none/goodman/gerber/walker)",
+    "load_sharing": "Multi-Tooth Load Sharing (on/off)", "tip_relief_um": "Tip Relief",
+    "KFb": "Root Load Factor KFb",
     "temp_C": "Operating Temp.",
+    "thermal": "Thermal Balance (on/off)", "T_amb_C": "Ambient Temp.",
+    "k_heat_W_m2K": "Housing Heat Transfer k", "A_housing_m2": "Housing Area A",
     "btn_refresh": "Refresh Diagram", "btn_calc": "Calculate & Plot",
     "geom_check_wait": "Geometry check: waiting for input.",
     "diagram_title": "Worm-Wheel Focused Mesh Section",
@@ -121,6 +212,7 @@ LANG_EN = {
     "mat_name": "Material Name", "mat_standard": "Standard", "mat_E": "Elastic Modulus E",
     "mat_nu": "Poisson Ratio nu", "mat_yield": "Yield Strength Rp0.2",
     "mat_tensile": "Tensile Strength Rm", "mat_hardness": "Hardness HRC",
+    "mat_walker": "Walker Exponent gamma",
     "mat_notes": "Notes",
     "mat_wheel_title": "Wheel Material",
     "mat_base_template": "Base Template",
@@ -130,7 +222,18 @@ LANG_EN = {
     "sn_add": "Add Row", "sn_delete": "Delete Selected",
     "sn_apply": "Apply Material Card",
     "mat_save_json": "Save as JSON...",
+    "sur_preview": "Preview (surrogate)", "sur_exact": "Exact",
+    "sur_extrap": "outside training range", "sur_running": "computing ...",
+    "graph_reused": "stages reused",
     "res_footer": "Lightweight proxy model results (KISSsoft-style correction factors)",
+    "wear_max": "Wear Limit", "wear_sf_min": "Min. SF", "wear_chunk": "Time Step",
+    "btn_wear": "Wear Simulation",
+    "trace_title": "Measured Trace", "btn_trace": "Import Trace...",
+    "trace_kind": "Kind", "trace_raw": "Raw format",
+    "trace_hint": "scroll to zoom the overview",
+    "trace_need_run": "Torque traces need a calculated design first (to scale to root stress).",
+    "coll_title": "Load Collective (optional)",
+    "coll_hint": "Per line: T1 n1 time-share; 2x = 2 x design value; empty = single point",
     "worm_output": "Worm Output", "wheel_output": "Wheel Output",
     "fat_wait": 'Click "Calculate & Plot" to see fatigue damage & safety factor summary.',
     "formula_title": "Formulas and Parameter Notes (for review)",
@@ -229,7 +332,7 @@ class App(tk.Tk):
 
         self._defaults = {
             "T1_Nm": "6.0", "n1_rpm": "3000", "ratio": "25",
-            "life_h": "3000", "steps": "720",
+            "life_h": "3000", "SF_target": "1.0", "steps": "720",
             "z1": "2", "mn_mm": "2.5", "q": "10", "x1": "0.0", "beta_deg": "11.5",
             "alpha_n_deg": "20", "rho_f_mm": "0.6",
             "da1_mm": "", "df1_mm": "", "d1_mm": "",
@@ -238,12 +341,25 @@ class App(tk.Tk):
             "a_target_mm": "", "b2_mm": "18",
             "cross_angle_deg": "90", "mu": "0.06",
             "KA": "1.10", "KV": "1.05", "KHb": "1.00", "KFb": "1.00",
+            "n_slices": "15", "fHb_um": "10", "crown_um": "5",
+            "load_sharing": "off", "tip_relief_um": "5", "mean_stress": "none",
             "temp_C": "80",
+            "thermal": "off", "T_amb_C": "40", "k_heat_W_m2K": "15", "A_housing_m2": "0.25",
         }
         self.inputs = {}
         self.res = None
+        self.project = None
         self.sn_rows = []
         self._cloud_cbar = None
+        self._history = None
+        self._surrogate = None
+        self._surrogate_job = None
+        self._run_job = None
+        self._neighbors = None
+        self._neighbors_job = None
+        self._neighbors_error = None
+        # Memoized model stages: reruns recompute only what changed
+        self._graph = ModelGraph()
 
         # Track all labelled widgets for language refresh
         self._i18n_widgets = []
@@ -277,6 +393,8 @@ class App(tk.Tk):
         self.nb.tab(self.tab_mat, text=self._t("tab_mat"))
         self.nb.tab(self.tab_res, text=self._t("tab_res"))
         self.nb.tab(self.tab_fat, text=self._t("tab_fat"))
+        self.nb.tab(self.tab_map, text=self._t("tab_map"))
+        self.nb.tab(self.tab_explore, text=self._t("tab_explore"))
         self.nb.tab(self.tab_formula, text=self._t("tab_formula"))
         self._refresh_formula_views()
         self.refresh_geom_plot()
@@ -321,10 +439,18 @@ class App(tk.Tk):
         m = tk.Menu(self, bg=CLR_CARD, fg=CLR_TEXT, activebackground=CLR_ACCENT,
                     activeforeground="#FFF", bd=0)
         fm = tk.Menu(m, tearoff=0, bg=CLR_CARD, fg=CLR_TEXT)
+        fm.add_command(label=self._t("menu_open_project"), command=self.open_project_file)
+        fm.add_command(label=self._t("menu_save_project"), command=self.save_project_file)
+        fm.add_separator()
         fm.add_command(label=self._t("menu_export"), command=self.export_xlsx)
         fm.add_separator()
         fm.add_command(label=self._t("menu_exit"), command=self.destroy)
         m.add_cascade(label=self._t("menu_file"), menu=fm)
+        tm = tk.Menu(m, tearoff=0, bg=CLR_CARD, fg=CLR_TEXT)
+        tm.add_command(label=self._t("menu_catalog"), command=self.open_catalog_search)
+        tm.add_command(label=self._t("menu_history"), command=self.open_history)
+        tm.add_command(label=self._t("menu_similar"), command=self.open_similar)
+        m.add_cascade(label=self._t("menu_tools"), menu=tm)
         self.config(menu=m)
 
     # ------------------------------------------------------------------
@@ -405,18 +531,25 @@ class App(tk.Tk):
         self.tab_res  = ttk.Frame(self.nb)
         self.tab_fat  = ttk.Frame(self.nb)
         self.tab_formula = ttk.Frame(self.nb)
+        self.tab_map = ttk.Frame(self.nb)
+        self.tab_explore = ttk.Frame(self.nb)
 
         self.nb.add(self.tab_geom, text=self._t("tab_geom"))
         self.nb.add(self.tab_mat,  text=self._t("tab_mat"))
         self.nb.add(self.tab_res,  text=self._t("tab_res"))
         self.nb.add(self.tab_fat,  text=self._t("tab_fat"))
+        self.nb.add(self.tab_map,  text=self._t("tab_map"))
+        self.nb.add(self.tab_explore, text=self._t("tab_explore"))
         self.nb.add(self.tab_formula, text=self._t("tab_formula"))
 
         self._build_geom_tab()
         self._build_mat_tab()
         self._build_res_tab()
         self._build_fat_tab()
+        self._build_map_tab()
+        self._build_explore_tab()
         self._build_formula_tab()
+        self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
     # ==================================================================
     # Helpers
@@ -490,6 +623,7 @@ class App(tk.Tk):
         r = self._entry(drive_card, "ratio", "ratio", "")
         self._auto_btn(r, "calc_ratio", self._calc_ratio_from_z)
         self._entry(drive_card, "life_h", "life_h", self._t("h"))
+        self._entry(drive_card, "SF_target", "SF_target", "")
         self._entry(drive_card, "steps", "steps", self._t("pts"))
         tk.Frame(drive_card, bg=CLR_CARD, height=6).pack()
 
@@ -565,8 +699,19 @@ class App(tk.Tk):
         self._entry(common_card, "KA", "KA", "")
         self._entry(common_card, "KV", "KV", "")
         self._entry(common_card, "KHb", "KHb", "")
+        self._entry(common_card, "n_slices", "n_slices", "")
+        self._entry(common_card, "fHb_um", "fHb_um", "um")
+        self._entry(common_card, "crown_um", "crown_um", "um")
+        self._entry(common_card, "load_sharing", "load_sharing", "")
+        self._entry(common_card, "tip_relief_um", "tip_relief_um", "um")
+        self._entry(common_card, "mean_stress", "mean_stress", "")
         self._entry(common_card, "KFb", "KFb", "")
         self._entry(common_card, "temp_C", "temp_C", self._t("C"))
+        self._separator(common_card)
+        self._entry(common_card, "thermal", "thermal", "")
+        self._entry(common_card, "T_amb_C", "T_amb_C", self._t("C"))
+        self._entry(common_card, "k_heat_W_m2K", "k_heat_W_m2K", "W/m2K")
+        self._entry(common_card, "A_housing_m2", "A_housing_m2", "m2")
         tk.Frame(common_card, bg=CLR_CARD, height=6).pack()
 
         # ---- Action buttons ----
@@ -576,6 +721,11 @@ class App(tk.Tk):
                        style="normal", side="left", padx=(0, 8))
         self._make_btn(btn_frame, "btn_calc", self.run,
                        style="accent", side="left")
+        # Surrogate preview, replaced by the exact result when the run ends
+        self.preview_var = tk.StringVar(value="")
+        tk.Label(scroll_frame, textvariable=self.preview_var, bg=CLR_BG, fg=CLR_TEXT2,
+                 font=("", 9), justify="left", anchor="w", wraplength=420).pack(
+            fill="x", padx=8, pady=(0, 10))
 
         # ---- Right side: diagram ----
         diag_card = tk.Frame(right, bg=CLR_CARD, bd=0,
@@ -982,6 +1132,7 @@ class App(tk.Tk):
         form2.pack(fill="x", padx=12, pady=4)
         wheel_fields_def = [
             ("mat_name", "w_name", 25), ("mat_nu", "w_nu", 12),
+            ("mat_tensile", "w_Rm", 12), ("mat_walker", "w_walker", 12),
         ]
         self.wheel_fields = {}
         for label_key, field_key, width in wheel_fields_def:
@@ -1099,6 +1250,8 @@ class App(tk.Tk):
         d = self.wheel
         self.wheel_fields["w_name"].set(d.get("name", ""))
         self.wheel_fields["w_nu"].set(str(d.get("nu", 0.4)))
+        self.wheel_fields["w_Rm"].set(str(d.get("Rm_MPa", "")))
+        self.wheel_fields["w_walker"].set(str(d.get("walker_gamma", "")))
 
     # ==================================================================
     # Tab 3: Results
@@ -1155,13 +1308,385 @@ class App(tk.Tk):
         self.wheel_out.column("v", width=220, anchor="w")
         self.wheel_out.pack(fill="both", expand=True, padx=8, pady=(0, 8))
 
-        self.fat_text = tk.Text(top, wrap="word", bd=0, relief="flat", bg=CLR_CARD,
-                                fg=CLR_TEXT, font=("", 10), padx=12, pady=8)
-        self.fat_text.pack(fill="both", expand=True, padx=2, pady=(10, 0))
+        # Measured trace: import controls, min/max overview and range histogram
+        trace_box = tk.Frame(cards, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        trace_box.pack(side="left", fill="both", expand=True, padx=(12, 0))
+        head = tk.Frame(trace_box, bg=CLR_CARD)
+        head.pack(fill="x", padx=8, pady=(6, 2))
+        self._track(
+            tk.Label(head, text=self._t("trace_title"), bg=CLR_CARD, fg=CLR_TEXT,
+                     font=("", 11, "bold")),
+            "trace_title").pack(side="left")
+        self._track(tk.Label(head, text=self._t("trace_kind"), bg=CLR_CARD, fg=CLR_TEXT,
+                             font=("", 9)), "trace_kind").pack(side="left", padx=(10, 2))
+        self.trace_kind = tk.StringVar(value="stress MPa")
+        ttk.Combobox(head, textvariable=self.trace_kind, values=["stress MPa", "torque T1 N*m"],
+                     state="readonly", width=13).pack(side="left")
+        self._track(tk.Label(head, text=self._t("trace_raw"), bg=CLR_CARD, fg=CLR_TEXT,
+                             font=("", 9)), "trace_raw").pack(side="left", padx=(8, 2))
+        self.trace_raw = tk.StringVar(value="float32")
+        ttk.Combobox(head, textvariable=self.trace_raw, values=["float32", "float64"],
+                     state="readonly", width=8).pack(side="left")
+        self._make_btn(head, "btn_trace", self.import_trace, style="link", side="left", padx=6)
+        self.trace_status = tk.StringVar(value=self._t("trace_hint"))
+        tk.Label(trace_box, textvariable=self.trace_status, bg=CLR_CARD, fg=CLR_TEXT2,
+                 font=("", 9), anchor="w").pack(fill="x", padx=8)
+        fig = Figure(figsize=(4.6, 2.6), dpi=100, facecolor=CLR_CARD)
+        self.ax_trace = fig.add_subplot(211)
+        self.ax_hist = fig.add_subplot(212)
+        self.canvas_trace = FigureCanvasTkAgg(fig, master=trace_box)
+        self.canvas_trace.get_tk_widget().pack(fill="both", expand=True, padx=4, pady=(0, 6))
+        self.canvas_trace.mpl_connect("scroll_event", self._zoom_trace)
+        self._trace = None
+        self._trace_job = None
+
+        coll_box = tk.Frame(top, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        coll_box.pack(fill="x", pady=(10, 0))
+        head = tk.Frame(coll_box, bg=CLR_CARD)
+        head.pack(fill="x", padx=8, pady=(6, 2))
+        self._track(
+            tk.Label(head, text=self._t("coll_title"), bg=CLR_CARD, fg=CLR_TEXT,
+                     font=("", 10, "bold")),
+            "coll_title").pack(side="left")
+        self._track(
+            tk.Label(head, text=self._t("coll_hint"), bg=CLR_CARD, fg=CLR_DIM, font=("", 9)),
+            "coll_hint").pack(side="left", padx=10)
+        self.coll_text = tk.Text(coll_box, height=4, wrap="none", bd=1, relief="solid",
+                                 bg=CLR_INPUT_BG, fg=CLR_TEXT, font=("Consolas", 10))
+        self.coll_text.pack(fill="x", padx=8, pady=(0, 8))
+
+        # Wear simulation controls
+        wear_row = tk.Frame(top, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        wear_row.pack(fill="x", pady=(10, 0))
+        self.wear_vars = {}
+        for key, default, unit in (("wear_max", "", self._t("mm")), ("wear_sf_min", "1.0", ""),
+                                   ("wear_chunk", "", "h")):
+            lbl = tk.Label(wear_row, text=self._t(key), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10))
+            lbl.pack(side="left", padx=(12, 4), pady=6)
+            self._track(lbl, key)
+            var = tk.StringVar(value=default)
+            tk.Entry(wear_row, textvariable=var, width=8, font=("", 10), relief="solid", bd=1,
+                     bg=CLR_INPUT_BG, fg=CLR_TEXT).pack(side="left")
+            if unit:
+                tk.Label(wear_row, text=unit, bg=CLR_CARD, fg=CLR_DIM, font=("", 9)).pack(side="left", padx=4)
+            self.wear_vars[key] = var
+        self._make_btn(wear_row, "btn_wear", self.run_wear, style="wheel", side="left", padx=12)
+
+        bottom = tk.Frame(top, bg=CLR_BG)
+        bottom.pack(fill="both", expand=True, pady=(10, 0))
+        self.fat_text = tk.Text(bottom, wrap="word", bd=0, relief="flat", bg=CLR_CARD,
+                                fg=CLR_TEXT, font=("", 10), padx=12, pady=8, width=60)
+        self.fat_text.pack(side="left", fill="both", expand=True, padx=(2, 6))
         self.fat_text.insert("1.0", self._t("fat_wait"))
+        fig = Figure(figsize=(5.5, 3.6), dpi=100, facecolor=CLR_CARD)
+        self.ax_wear = fig.add_subplot(111)
+        self.canvas_fat = FigureCanvasTkAgg(fig, master=bottom)
+        self.canvas_fat.get_tk_widget().pack(side="left", fill="both", expand=True)
+
+    # ==================================================================
+    # Tab 5: Operating Map
+    # ==================================================================
+    def _build_map_tab(self):
+        top = tk.Frame(self.tab_map, bg=CLR_BG)
+        top.pack(fill="both", expand=True, padx=10, pady=10)
+        ctrl = tk.Frame(top, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        ctrl.pack(fill="x")
+        T1 = self._defaults["T1_Nm"]
+        n1 = self._defaults["n1_rpm"]
+        self.map_vars = {}
+        for key, default, unit in (("map_T1", f"{0.1 * float(T1):g}:{2 * float(T1):g}", self._t("N_m")),
+                                   ("map_n1", f"{0.1 * float(n1):g}:{1.5 * float(n1):g}", self._t("rpm")),
+                                   ("map_grid", "200", "")):
+            lbl = tk.Label(ctrl, text=self._t(key), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10))
+            lbl.pack(side="left", padx=(12, 4), pady=8)
+            self._track(lbl, key)
+            var = tk.StringVar(value=default)
+            tk.Entry(ctrl, textvariable=var, width=12, font=("", 10), relief="solid", bd=1,
+                     bg=CLR_INPUT_BG, fg=CLR_TEXT).pack(side="left")
+            if unit:
+                tk.Label(ctrl, text=unit, bg=CLR_CARD, fg=CLR_DIM, font=("", 9)).pack(side="left", padx=4)
+            self.map_vars[key] = var
+        self._make_btn(ctrl, "map_calc", self.run_operating_map, style="accent", side="left", padx=12)
+        self.map_status = tk.StringVar(value="")
+        tk.Label(ctrl, textvariable=self.map_status, bg=CLR_CARD, fg=CLR_TEXT2,
+                 font=("", 9)).pack(side="left", padx=6)
+
+        fig = Figure(figsize=(10, 7), dpi=100, facecolor=CLR_CARD)
+        self.canvas_map = FigureCanvasTkAgg(fig, master=top)
+        self.canvas_map.get_tk_widget().pack(fill="both", expand=True, pady=(8, 0))
+
+    def _parse_range(self, text):
+        lo, hi = (float(v) for v in text.split(":", 1))
+        return lo, hi
+
+    def run_operating_map(self):
+        try:
+            t_lo, t_hi = self._parse_range(self.map_vars["map_T1"].get())
+            n_lo, n_hi = self._parse_range(self.map_vars["map_n1"].get())
+            n_grid = max(int(float(self.map_vars["map_grid"].get())), 2)
+        except ValueError:
+            messagebox.showerror("Error", "Ranges must be 'min:max' numbers.")
+            return
+        self._auto_calc_worm()
+        self._auto_calc_wheel()
+        t0 = time.perf_counter()
+        om = compute_operating_map(self._collect_inputs(), self.steel, self.wheel,
+                                   np.linspace(t_lo, t_hi, n_grid), np.linspace(n_lo, n_hi, n_grid))
+        elapsed = time.perf_counter() - t0
+        self.plot_operating_map(om)
+        self.map_status.set(f"{n_grid}x{n_grid} points in {elapsed * 1000:.1f} ms")
+
+    def plot_operating_map(self, om):
+        fig = self.canvas_map.figure
+        fig.clear()
+        fp = {"fontfamily": _MPL_FONT or "DejaVu Sans"}
+        N1, T1 = np.meshgrid(om["n1_rpm"], om["T1_Nm"])
+        panels = [
+            ("eta0", "Efficiency eta0", om["eta0"], "viridis", None),
+            ("SF_root", "SF_root", om["SF_root"], "RdYlGn", [1.0, 1.5, 2.0]),
+            ("SF_contact", "SF_contact", om["SF_contact"], "RdYlGn", [1.0, 1.5, 2.0]),
+            ("damage_root", "log10 Damage D", np.log10(np.maximum(om["damage_root"], 1e-12)),
+             "inferno", [0.0]),
+            ("T2_Nm", "Output Torque T2 (N*m)", om["T2_Nm"], "cividis", None),
+        ]
+        for idx, (_key, title, Z, cmap, levels) in enumerate(panels):
+            ax = fig.add_subplot(2, 3, idx + 1)
+            Z = np.asarray(Z, dtype=float)
+            finite = np.isfinite(Z)
+            if not finite.any():
+                ax.set_title(f"{title}: no data", fontsize=9, **fp)
+                ax.axis("off")
+                continue
+            mesh = ax.pcolormesh(N1, T1, Z, cmap=cmap, shading="auto")
+            fig.colorbar(mesh, ax=ax, shrink=0.85)
+            lo, hi = float(np.nanmin(Z)), float(np.nanmax(Z))
+            if hi > lo:
+                lv = [v for v in (levels or []) if lo < v < hi] or np.linspace(lo, hi, 7)[1:-1]
+                cs = ax.contour(N1, T1, Z, levels=sorted(lv), colors="k", linewidths=0.7)
+                ax.clabel(cs, fontsize=7, fmt="%.2g")
+            ax.set_title(title, fontsize=10, fontweight="bold", color=CLR_TEXT, **fp)
+            ax.set_xlabel("n1 (rpm)", fontsize=8, color=CLR_TEXT2)
+            ax.set_ylabel("T1 (N*m)", fontsize=8, color=CLR_TEXT2)
+            ax.tick_params(labelsize=7)
+        fig.tight_layout()
+        self.canvas_map.draw()
 
     # ==================================================================
-    # Tab 5: Formula Notes
+    # Tab 6: Design-space explorer
+    # ==================================================================
+    # Columns fetched when the history is loaded (others on first use) and
+    # the ones whose sort indexes are built up front for filtering
+    _EXPLORE_COLUMNS = ("a_mm", "eta0", "SF_root", "SF_contact", "damage_root", "T2_Nm",
+                        "mn", "z1", "z2", "ratio", "q", "x2", "beta_deg", "T1", "n1", "b",
+                        "temp_C")
+    _EXPLORE_INDEXED = ("a_mm", "eta0", "SF_root", "SF_contact", "damage_root")
+
+    def _build_explore_tab(self):
+        top = tk.Frame(self.tab_explore, bg=CLR_BG)
+        top.pack(fill="both", expand=True, padx=10, pady=10)
+        ctrl = tk.Frame(top, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        ctrl.pack(fill="x")
+        self.explore_vars = {}
+        for key, default, width in (("exp_source", "sweep", 8), ("exp_x", "a_mm", 12),
+                                    ("exp_y", "eta0", 12), ("exp_color", "SF_root", 12)):
+            lbl = tk.Label(ctrl, text=self._t(key), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10))
+            lbl.pack(side="left", padx=(12, 4), pady=8)
+            self._track(lbl, key)
+            var = tk.StringVar(value=default)
+            values = ["all", "sweep", "gui"] if key == "exp_source" else list(self._EXPLORE_COLUMNS)
+            box = ttk.Combobox(ctrl, textvariable=var, values=values, width=width,
+                               state="readonly" if key == "exp_source" else "normal")
+            box.pack(side="left")
+            if key != "exp_source":
+                box.bind("<<ComboboxSelected>>", lambda _e: self._explore_reset_view())
+                box.bind("<Return>", lambda _e: self._explore_reset_view())
+            self.explore_vars[key] = var
+        lbl = tk.Label(ctrl, text=self._t("exp_filter"), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10))
+        lbl.pack(side="left", padx=(12, 4))
+        self._track(lbl, "exp_filter")
+        self.explore_vars["exp_filter"] = tk.StringVar(value="")
+        ent = tk.Entry(ctrl, textvariable=self.explore_vars["exp_filter"], width=28, font=("", 10),
+                       relief="solid", bd=1, bg=CLR_INPUT_BG, fg=CLR_TEXT)
+        ent.pack(side="left")
+        ent.bind("<Return>", lambda _e: self.apply_explore_filter())
+        self._make_btn(ctrl, "exp_load", self.load_explorer, style="accent", side="left", padx=(12, 4))
+        self._make_btn(ctrl, "exp_apply", self.apply_explore_filter, side="left", padx=4)
+        self._make_btn(ctrl, "exp_reset", self.reset_explore_brush, side="left", padx=4)
+        self.explore_status = tk.StringVar(value=self._t("exp_hint"))
+        tk.Label(top, textvariable=self.explore_status, bg=CLR_BG, fg=CLR_TEXT2, font=("", 9),
+                 anchor="w").pack(fill="x", pady=(4, 0))
+
+        fig = Figure(figsize=(10, 7), dpi=100, facecolor=CLR_CARD)
+        self.ax_explore = fig.add_subplot(111)
+        self.canvas_explore = FigureCanvasTkAgg(fig, master=top)
+        self.canvas_explore.get_tk_widget().pack(fill="both", expand=True, pady=(4, 0))
+        self.canvas_explore.mpl_connect("scroll_event", self._zoom_explore)
+        self.canvas_explore.mpl_connect("button_press_event", self._explore_press)
+        self.canvas_explore.mpl_connect("button_release_event", self._explore_release)
+        self._explore = None
+        self._explore_job = None
+
+    def load_explorer(self):
+        try:
+            path = self._history_db().path
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        source = self.explore_vars["exp_source"].get()
+        job = {"table": None, "db": None, "error": None}
+        self._explore_job = job
+
+        def _work():
+            try:
+                db = DesignHistory(path)
+                table = ExplorerTable.from_history(db, self._EXPLORE_COLUMNS,
+                                                   source=None if source == "all" else source)
+                table.prepare([c for c in self._EXPLORE_INDEXED if c in table])
+                job["db"], job["table"] = db, table
+            except Exception as e:
+                job["error"] = e
+
+        self.explore_status.set(f"{source}: loading ...")
+        threading.Thread(target=_work, daemon=True).start()
+        self.after(100, self._poll_explorer, job, time.perf_counter())
+
+    def _poll_explorer(self, job, t0):
+        if job is not self._explore_job:
+            return
+        if job["error"] is not None:
+            self.explore_status.set(str(job["error"]))
+            return
+        if job["table"] is None:
+            self.after(100, self._poll_explorer, job, t0)
+            return
+        table = job["table"]
+        self._explore = {"table": table, "db": job["db"], "filter": np.ones(len(table), dtype=bool),
+                         "brush": {}, "mask": None, "view": None, "clim": None, "press": None,
+                         "loaded_s": time.perf_counter() - t0}
+        self.apply_explore_filter()
+
+    def _explore_axes(self):
+        return tuple(self.explore_vars[k].get().strip() for k in ("exp_x", "exp_y", "exp_color"))
+
+    def apply_explore_filter(self):
+        ex = self._explore
+        if ex is None:
+            return
+        try:
+            t0 = time.perf_counter()
+            ranges = self._parse_history_filter(self.explore_vars["exp_filter"].get())
+            ex["filter"] = ex["table"].mask(ranges)
+            ex["mask"] = ex["table"].mask(ex["brush"], base=ex["filter"])
+            ex["filter_ms"] = (time.perf_counter() - t0) * 1000
+        except (ValueError, KeyError) as e:
+            messagebox.showerror("Error", f"Filter: {e}")
+            return
+        self._explore_reset_view()
+
+    def reset_explore_brush(self):
+        ex = self._explore
+        if ex is None:
+            return
+        ex["brush"] = {}
+        ex["mask"] = ex["filter"]
+        self._explore_reset_view()
+
+    def _explore_reset_view(self):
+        ex = self._explore
+        if ex is None or ex["mask"] is None:
+            return
+        x, y, c = self._explore_axes()
+        try:
+            ex["view"] = ex["table"].limits(x, y, ex["mask"])
+            col = ex["table"].column(c)[ex["mask"]]
+        except KeyError as e:
+            messagebox.showerror("Error", f"Unknown column {e}")
+            return
+        col = col[np.isfinite(col)]
+        # Fixed color scale per selection so zooming does not recolor
+        ex["clim"] = tuple(np.percentile(col, (1, 99))) if col.size else None
+        self.plot_explorer()
+
+    def plot_explorer(self):
+        ex = self._explore
+        t0 = time.perf_counter()
+        x, y, c = self._explore_axes()
+        table, mask = ex["table"], ex["mask"]
+        xlim, ylim = ex["view"]
+        fig = self.canvas_explore.figure
+        fig.clear()
+        ax = self.ax_explore = fig.add_subplot(111)
+        vmin, vmax = ex["clim"] or (None, None)
+        idx = table.visible(x, y, mask, xlim, ylim)
+        if idx.size <= MARKER_LIMIT:
+            art = ax.scatter(table.column(x)[idx], table.column(y)[idx], c=table.column(c)[idx],
+                             s=10, cmap="RdYlGn", vmin=vmin, vmax=vmax, linewidths=0)
+            mode = "markers"
+        else:
+            b = table.binned(x, y, mask, xlim, ylim, color=c)
+            art = ax.imshow(b["value"], origin="lower", extent=b["extent"], aspect="auto",
+                            cmap="RdYlGn", vmin=vmin, vmax=vmax, interpolation="nearest")
+            mode = "binned, min per cell"
+        fig.colorbar(art, ax=ax, shrink=0.9).set_label(c, fontsize=9)
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.set_xlabel(x, fontsize=9, color=CLR_TEXT2)
+        ax.set_ylabel(y, fontsize=9, color=CLR_TEXT2)
+        ax.tick_params(labelsize=8)
+        ax.grid(True, alpha=0.2)
+        fig.tight_layout()
+        self.canvas_explore.draw_idle()
+        brush = "  brush: " + ", ".join(ex["brush"]) if ex["brush"] else ""
+        self.explore_status.set(
+            f"{int(np.count_nonzero(mask)):,} / {len(table):,} designs, {idx.size:,} in view "
+            f"({mode}){brush}   load {ex['loaded_s']:.2f} s, filter {ex.get('filter_ms', 0):.0f} ms, "
+            f"draw {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    def _zoom_explore(self, event):
+        ex = self._explore
+        if ex is None or ex["view"] is None or event.inaxes is not self.ax_explore:
+            return
+        f = 0.7 if event.button == "up" else 1.0 / 0.7
+        (x0, x1), (y0, y1) = ex["view"]
+        cx, cy = event.xdata, event.ydata
+        ex["view"] = ((cx - (cx - x0) * f, cx + (x1 - cx) * f),
+                      (cy - (cy - y0) * f, cy + (y1 - cy) * f))
+        self.plot_explorer()
+
+    def _explore_press(self, event):
+        ex = self._explore
+        if ex is None or event.button != 1 or event.inaxes is not self.ax_explore:
+            return
+        ex["press"] = (event.x, event.y, event.xdata, event.ydata)
+
+    def _explore_release(self, event):
+        ex = self._explore
+        if ex is None or ex["press"] is None or event.button != 1:
+            return
+        px, py, x0, y0 = ex["press"]
+        ex["press"] = None
+        if event.inaxes is not self.ax_explore:
+            return
+        x, y, _c = self._explore_axes()
+        if abs(event.x - px) < 5 and abs(event.y - py) < 5:
+            # Click: load the nearest design
+            row = ex["table"].pick(x, y, x0, y0, *ex["view"], mask=ex["mask"])
+            if row is None:
+                return
+            design_id = int(ex["table"].column("id")[row])
+            self._apply_inputs(ex["db"].inputs(design_id))
+            return
+        # Drag: brush the rectangle; brushes on other axes intersect
+        t0 = time.perf_counter()
+        for name, a, b in ((x, x0, event.xdata), (y, y0, event.ydata)):
+            lo, hi = ex["brush"].get(name, (-np.inf, np.inf))
+            ex["brush"][name] = (max(lo, min(a, b)), min(hi, max(a, b)))
+        ex["mask"] = ex["table"].mask(ex["brush"], base=ex["filter"])
+        ex["filter_ms"] = (time.perf_counter() - t0) * 1000
+        self._explore_reset_view()
+
+    # ==================================================================
+    # Tab 7: Formula Notes
     # ==================================================================
     def _build_formula_tab(self):
         top = tk.Frame(self.tab_formula, bg=CLR_BG)
@@ -1374,11 +1899,14 @@ class App(tk.Tk):
         return rows
 
     def _load_sn_table_from_wheel(self):
-        for iid in self.sn_table.get_children():
-            self.sn_table.delete(iid)
         rows = self.wheel.get("SN", {}).get("table")
         if not rows:
             rows = self._build_sn_rows_from_legacy()
+        self._fill_sn_table(rows)
+
+    def _fill_sn_table(self, rows):
+        for iid in self.sn_table.get_children():
+            self.sn_table.delete(iid)
         self.sn_rows = []
         for row in rows:
             one = {
@@ -1472,6 +2000,15 @@ class App(tk.Tk):
             self.wheel["nu"] = float(self.wheel_fields["w_nu"].get() or 0.4)
         except ValueError:
             pass
+        for key, field in (("Rm_MPa", "w_Rm"), ("walker_gamma", "w_walker")):
+            txt = self.wheel_fields[field].get().strip()
+            if not txt:
+                self.wheel.pop(key, None)
+                continue
+            try:
+                self.wheel[key] = float(txt)
+            except ValueError:
+                pass
         table = []
         for row in self.sn_rows:
             table.append({
@@ -1500,6 +2037,7 @@ class App(tk.Tk):
         for k, v in self.inputs.items():
             d[k] = v.get()
         d["b_mm"] = d.get("b2_mm", "18")
+        d["load_collective"] = self.coll_text.get("1.0", "end").strip()
         return d
 
     def run(self):
@@ -1507,15 +2045,110 @@ class App(tk.Tk):
             self._auto_calc_worm()
             self._auto_calc_wheel()
             inp = self._collect_inputs()
-            res = compute_worm_cycle(inp, self.steel, self.wheel)
-            self.res = res
-            self.plot_results(res)
-            self.update_fatigue(res)
-            self.nb.select(self.tab_res)
+            preview = self._surrogate_preview(inp)
+            self._warm_start(inp)
         except Exception as e:
             messagebox.showerror("Error", str(e))
-            import traceback
-            traceback.print_exc()
+            return
+        job = {"result": None, "error": None, "preview": preview, "t0": time.perf_counter()}
+        self._run_job = job
+        steel, wheel, graph = self.steel, self.wheel, self._graph
+
+        def _work():
+            try:
+                res = graph.compute(inp, steel, wheel)
+                job["stats"] = dict(graph.stats)
+                job["result"] = res
+            except Exception as e:
+                job["error"] = e
+
+        threading.Thread(target=_work, daemon=True).start()
+        self.after(20, self._poll_run, job, inp)
+
+    def _poll_run(self, job, inp):
+        if job is not self._run_job:
+            return
+        if job["result"] is None and job["error"] is None:
+            self.after(20, self._poll_run, job, inp)
+            return
+        self._run_job = None
+        if job["error"] is not None:
+            self.preview_var.set("")
+            messagebox.showerror("Error", str(job["error"]))
+            return
+        res = job["result"]
+        elapsed = time.perf_counter() - job["t0"]
+        self._record_history(inp, res)
+        self.res = res
+        self.project = None
+        self.plot_results(res)
+        self.update_fatigue(res)
+        self.nb.select(self.tab_res)
+        meta, pred = res["meta"], job["preview"]
+        parts = []
+        for k in SURROGATE_OUTPUTS:
+            v = meta.get(k)
+            txt = f"{k} {v:.4g}" if v is not None else f"{k} -"
+            if pred is not None and k in pred:
+                txt += f" ({pred[k]['value']:.4g})"
+            parts.append(txt)
+        st = job["stats"]
+        self.preview_var.set(f"{self._t('sur_exact')} ({elapsed * 1000:.0f} ms, {self._t('graph_reused')} "
+                             f"{st['reused']}/{st['reused'] + st['computed']}): " + ", ".join(parts))
+        self._refresh_surrogate()
+
+    # ==================================================================
+    # Surrogate preview
+    # ==================================================================
+    def _surrogate_preview(self, inp):
+        """Show the surrogate prediction now; returns it (or None)."""
+        sur = self._surrogate
+        key = (card_hash(self.steel), card_hash(self.wheel))
+        if sur is None or sur["key"] != key or sur["model"] is None:
+            self.preview_var.set(self._t("sur_running"))
+            self._refresh_surrogate()
+            return None
+        pred = sur["model"].predict_inputs(inp)
+        parts = []
+        for k in SURROGATE_OUTPUTS:
+            if k in pred:
+                v = pred[k]
+                parts.append(f"{k} {v['value']:.4g} [{v['lo']:.3g}, {v['hi']:.3g}]")
+        note = f", {self._t('sur_extrap')}" if pred["extrapolated"] else ""
+        self.preview_var.set(f"{self._t('sur_preview')} (n={sur['model'].n_train}{note}): "
+                             + ", ".join(parts) + f"   {self._t('sur_running')}")
+        self.update_idletasks()
+        return pred
+
+    def _refresh_surrogate(self):
+        """Refit in the background when the cards changed or the history grew by 10 %."""
+        if self._surrogate_job is not None:
+            return
+        try:
+            db = self._history_db()
+            n = len(db)
+        except Exception:
+            return
+        key = (card_hash(self.steel), card_hash(self.wheel))
+        sur = self._surrogate
+        if sur is not None and sur["key"] == key and n < 1.1 * sur["rows"]:
+            return
+        job = {"path": db.path}
+        self._surrogate_job = job
+        steel, wheel = self.steel, self.wheel
+
+        def _work():
+            try:
+                with DesignHistory(job["path"]) as own:
+                    model = fit_from_history(own, steel, wheel)
+                self._surrogate = {"key": key, "rows": n, "model": model}
+            except Exception as e:
+                # Too few sweep rows for these cards: retry once the history grows
+                self._surrogate = {"key": key, "rows": n, "model": None, "failed": str(e)}
+            finally:
+                self._surrogate_job = None
+
+        threading.Thread(target=_work, daemon=True).start()
 
     def plot_results(self, res):
         phi = res["phi"]
@@ -1550,13 +2183,16 @@ class App(tk.Tk):
         _style_ax(self.ax_eta, "Efficiency & Contact No.", "phi (deg)", "-")
         self.ax_eta.legend(fontsize=8, framealpha=0.9)
 
-        # 3D cloud
-        width_pts = np.linspace(-1.0, 1.0, 36)
-        PHI, BW = np.meshgrid(phi, width_pts)
-        base = np.interp(PHI[0], phi, res["sigma_root_MPa"])
-        base2d = np.tile(base, (len(width_pts), 1))
-        spread = 1.0 + 0.22 * (BW ** 2) + 0.10 * np.sin(2.0 * PHI)
-        sigma_3d = base2d * spread
+        # 3D root stress over phase x face width (face-width slice model)
+        if "sigma_root_slices_MPa" in res:
+            x_w = np.asarray(res["x_slices_mm"])
+            sig_w = np.asarray(res["sigma_root_slices_MPa"])
+        else:
+            x_w = np.array([-1.0, 1.0])
+            sig_w = np.repeat(np.asarray(res["sigma_root_MPa"])[:, None], 2, axis=1)
+        stride = max(1, phi.size // 360)
+        PHI, BW = np.meshgrid(phi[::stride], x_w)
+        sigma_3d = sig_w[::stride].T
         norm = Normalize(vmin=float(np.min(sigma_3d)), vmax=float(np.max(sigma_3d)))
         face_colors = matplotlib.cm.inferno(norm(sigma_3d))
         self.ax_cloud.plot_surface(
@@ -1565,7 +2201,7 @@ class App(tk.Tk):
             facecolors=face_colors, shade=False)
         self.ax_cloud.set_title("3D Root Stress", fontsize=10, fontweight="bold", color=CLR_TEXT)
         self.ax_cloud.set_xlabel("phi (deg)", fontsize=8)
-        self.ax_cloud.set_ylabel("Width", fontsize=8)
+        self.ax_cloud.set_ylabel("x (mm)", fontsize=8)
         self.ax_cloud.set_zlabel("sF MPa", fontsize=8)
         self.ax_cloud.view_init(elev=24, azim=-130)
 
@@ -1590,10 +2226,14 @@ class App(tk.Tk):
             f"d2={m['d2_mm']:.2f} mm\n"
             f"a ={m['a_mm']:.2f} mm\n"
             f"eta0={m['eta0']:.3f}\n"
+            f"T={m['temp_C']:.1f} C{' (thermal)' if m.get('thermal') else ''}\n"
+            f"KHb={m['KHb']:.3f}{' (auto)' if m.get('KHb_auto') else ''}\n"
+            f"eps={m['eps_alpha']:.2f}{' (load sharing)' if m.get('load_sharing') else ''}\n"
             f"beta={m.get('beta_deg', m['gamma_deg']):.2f} deg\n"
             f"gamma={m['gamma_deg']:.2f} deg\n"
             f"px={m['px_mm']:.2f} mm\n"
             f"pz={m['pz_mm']:.2f} mm\n"
+            f"steps={m['steps']}{' (auto)' if m.get('steps_auto') else ''}\n"
             f"-------------------\n"
             f"Contact peak: {float(np.max(res['p_contact_MPa'])):.1f} MPa\n"
             f"Root peak: {float(np.max(res['sigma_root_MPa'])):.1f} MPa"
@@ -1642,6 +2282,9 @@ class App(tk.Tk):
         lines = []
         lines.append("Rainflow + Miner Cumulative Damage (root stress proxy)")
         lines.append(f"  D = {m['damage_root']:.3e} (D < 1 = OK)")
+        if m.get("mean_stress", "none") != "none":
+            lines.append(f"  Mean-stress correction: {m['mean_stress']}, "
+                         f"sigma_a,eq = {m['sigma_amp_eq_MPa']:.2f} MPa")
         if m.get("SF_root") is not None:
             lines.append(f"  SF_root = {m['SF_root']:.2f}")
         else:
@@ -1650,6 +2293,30 @@ class App(tk.Tk):
             lines.append(f"  SF_contact = {m['SF_contact']:.2f}")
         else:
             lines.append("  SF_contact: no contact SN data")
+        life = res.get("life")
+        if life is not None:
+            target = float(life["SF_target"])
+            lines.append("")
+            lines.append("Life Curve (damage and SF vs. operating hours)")
+            lines.append(f"  D = 1 at {self._fmt_life(m.get('life_D1_h'))}")
+            lines.append(f"  SF_root = {target:.2f} at {self._fmt_life(m.get('life_SF_root_h'))}")
+            lines.append(f"  SF_contact = {target:.2f} at {self._fmt_life(m.get('life_SF_contact_h'))}")
+        coll = res.get("collective")
+        if coll is not None:
+            lines.append("")
+            lines.append(f"Load Collective ({m['collective_bins']} bins, Miner sum)")
+            lines.append(f"  D = {m['damage_collective']:.3e} (D < 1 = OK)")
+            lines.append(f"  T1_eq = {m['T1_eq_Nm']:.3f} N*m (k = {float(coll['k_sn']):.2f}), "
+                         f"n1_eq = {m['n1_eq_rpm']:.0f} rpm")
+            lines.append(f"  {'T1 N*m':>9} {'n1 rpm':>8} {'hours':>9} {'SF_root':>8} "
+                         f"{'SF_cont':>8} {'D':>10}")
+            cols = [np.asarray(coll[k], dtype=float) for k in
+                    ("T1_Nm", "n1_rpm", "hours", "SF_root", "SF_contact", "damage")]
+            shown = 40
+            for T1, n1, hrs, sf_r, sf_c, dmg in zip(*(c[:shown] for c in cols)):
+                lines.append(f"  {T1:9.3f} {n1:8.0f} {hrs:9.1f} {sf_r:8.2f} {sf_c:8.2f} {dmg:10.3e}")
+            if cols[0].size > shown:
+                lines.append(f"  ... {cols[0].size - shown} more bins")
         lines.append("")
         lines.append("Key Parameters:")
         lines.append(f"  z1={m['z1']}, z2={m['z2']}")
@@ -1660,14 +2327,607 @@ class App(tk.Tk):
         lines.append(f"  q={m.get('q', 0.0):.3f}, beta={m.get('beta_deg', m['gamma_deg']):.2f} deg")
         lines.append(f"  gamma={m['gamma_deg']:.2f} deg, px={m['px_mm']:.2f} mm")
         lines.append(f"  E'={m['Eprime_GPa']:.2f} GPa, eta0={m['eta0']:.3f}")
+        if m.get("thermal"):
+            state = "converged" if m["thermal_converged"] else "NOT converged"
+            lines.append(f"  Thermal balance: T={m['temp_C']:.1f} C, mu={m['mu']:.4f}, "
+                         f"P_loss={m['P_loss_W']:.1f} W ({state}, {m['thermal_iter']} it)")
         lines.append(f"  KA={m['KA']:.3f} KV={m['KV']:.3f} KHb={m['KHb']:.3f} KFb={m['KFb']:.3f}")
         self.fat_text.delete("1.0", "end")
         self.fat_text.insert("1.0", "\n".join(lines))
+        if life is not None:
+            self.plot_life(life)
+
+    @staticmethod
+    def _fmt_life(h):
+        if h is None or np.isnan(float(h)):
+            return "- (no SN data)"
+        h = float(h)
+        if np.isinf(h):
+            return "never"
+        if h <= 0:
+            return "0 h (below target from the start)"
+        return f"{h:.4g} h"
+
+    def plot_life(self, life):
+        """Damage and safety factors vs. hours (log axes) on the fatigue plot."""
+        fig = self.canvas_fat.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        self.ax_wear = ax
+        hours = np.asarray(life["hours"], dtype=float)
+        dmg = np.asarray(life["damage_root"], dtype=float)
+        ax.set_xscale("log")
+        pos = dmg > 0
+        if pos.any():
+            ax.plot(hours[pos], dmg[pos], color=CLR_WHEEL, linewidth=1.6, label="D")
+            ax.axhline(1.0, color=CLR_WHEEL, linestyle=":", linewidth=1)
+            ax.set_yscale("log")
+        ax.set_xlabel("hours", fontsize=8, color=CLR_TEXT2)
+        ax.set_ylabel("Miner damage D", fontsize=8, color=CLR_WHEEL)
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.2)
+        ax2 = ax.twinx()
+        target = float(life["SF_target"])
+        ax2.plot(hours, life["SF_root"], color=CLR_WORM, linewidth=1.4, label="SF_root")
+        ax2.plot(hours, life["SF_contact"], color=CLR_ACCENT2, linewidth=1.4, label="SF_contact")
+        ax2.axhline(target, color=CLR_TEXT2, linestyle=":", linewidth=1)
+        ax2.set_ylabel("SF", fontsize=8, color=CLR_TEXT2)
+        ax2.tick_params(labelsize=7)
+        ax2.legend(fontsize=7, loc="upper right")
+        # Design life and the lives in range
+        life_h = self._safe_float("life_h", 0.0)
+        if life_h > 0:
+            ax.axvline(life_h, color=CLR_DIM, linestyle="--", linewidth=1)
+        for key, color in (("life_D1_h", CLR_WHEEL), ("life_SF_root_h", CLR_WORM),
+                           ("life_SF_contact_h", CLR_ACCENT2)):
+            h = float(life[key])
+            if np.isfinite(h) and hours[0] <= h <= hours[-1]:
+                ax.axvline(h, color=color, linewidth=0.8, alpha=0.6)
+        ax.set_title(f"Life: D=1 at {self._fmt_life(life['life_D1_h'])}, "
+                     f"SF_root={target:g} at {self._fmt_life(life['life_SF_root_h'])}",
+                     fontsize=9, fontweight="bold", color=CLR_TEXT)
+        fig.tight_layout()
+        self.canvas_fat.draw()
+
+    def run_wear(self):
+        try:
+            self._auto_calc_worm()
+            self._auto_calc_wheel()
+            v = {k: var.get().strip() for k, var in self.wear_vars.items()}
+            wr = simulate_wear(self._collect_inputs(), self.steel, self.wheel,
+                               chunk_h=float(v["wear_chunk"]) if v["wear_chunk"] else None,
+                               wear_max_mm=float(v["wear_max"]) if v["wear_max"] else None,
+                               SF_min=float(v["wear_sf_min"] or 0.0))
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.plot_wear(wr)
+
+    def plot_wear(self, wr):
+        fig = self.canvas_fat.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        self.ax_wear = ax
+        ax.plot(wr["hours"], wr["wear_mm"] * 1000.0, color=CLR_WHEEL, linewidth=1.6, label="wear")
+        ax.axhline(wr["wear_max_mm"] * 1000.0, color=CLR_WHEEL, linestyle=":", linewidth=1)
+        ax.set_xlabel("hours", fontsize=8, color=CLR_TEXT2)
+        ax.set_ylabel("wear depth (um)", fontsize=8, color=CLR_WHEEL)
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.2)
+        ax2 = ax.twinx()
+        ax2.plot(wr["hours"], wr["SF_root"], color=CLR_WORM, linewidth=1.4, label="SF_root")
+        ax2.plot(wr["hours"], wr["SF_contact"], color=CLR_ACCENT2, linewidth=1.4, label="SF_contact")
+        ax2.set_ylabel("SF", fontsize=8, color=CLR_TEXT2)
+        ax2.tick_params(labelsize=7)
+        ax2.legend(fontsize=7, loc="upper right")
+        ax.set_title(f"Wear: stop at {wr['stop_h']:.0f} h ({wr['stop_reason']})",
+                     fontsize=9, fontweight="bold", color=CLR_TEXT)
+        fig.tight_layout()
+        self.canvas_fat.draw()
+
+    # ==================================================================
+    # Measured traces
+    # ==================================================================
+    def import_trace(self):
+        path = filedialog.askopenfilename(filetypes=[
+            ("Trace", "*.npy *.csv *.txt *.f32 *.f64 *.bin *.raw"), ("All", "*.*")])
+        if not path:
+            return
+        scale = 1.0
+        if self.trace_kind.get().startswith("torque"):
+            T1 = self._safe_float("T1_Nm", 0.0)
+            if self.res is None or T1 <= 0:
+                messagebox.showerror("Error", self._t("trace_need_run"))
+                return
+            # Linear proxy: peak root stress per unit worm torque of this design
+            scale = float(np.max(self.res["sigma_root_MPa"])) / T1
+        try:
+            x = open_trace(path, dtype=self.trace_raw.get())
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if self._trace_job is not None:
+            self._trace_job["cancel"] = True
+        meta = self.res["meta"] if self.res is not None else {}
+        job = {"cancel": False, "done": 0, "total": int(x.shape[0]), "result": None,
+               "error": None, "overview": None}
+        self._trace = {"x": x, "scale": scale, "name": os.path.basename(path), "view": None}
+        self._trace_job = job
+        sn_list = self.wheel.get("SN", {}).get("root_allow_MPa_vs_N", [])
+        model = meta.get("mean_stress") or self.inputs["mean_stress"].get().strip().lower()
+
+        def _work():
+            try:
+                job["overview"] = overview(x)
+                _, lo, hi = job["overview"]
+                job["result"] = rainflow(
+                    x, scale=scale, hist_max=float(hi.max() - lo.min()) * abs(scale),
+                    sn_list=sn_list, mean_stress=model if model != "none" else 0,
+                    Rm=self.wheel.get("Rm_MPa"), walker_gamma=self.wheel.get("walker_gamma", 0.5),
+                    progress=lambda done, total: job.__setitem__("done", done),
+                    cancel=lambda: job["cancel"])
+            except InterruptedError:
+                pass
+            except Exception as e:
+                job["error"] = e
+
+        threading.Thread(target=_work, daemon=True).start()
+        self.after(100, self._poll_trace, job, False)
+
+    def _poll_trace(self, job, shown):
+        # Tk is single-threaded: the worker only fills ``job``, this draws it
+        if job is not self._trace_job:
+            return
+        if job["error"] is not None:
+            self.trace_status.set(f"{self._trace['name']}: {job['error']}")
+            return
+        if job["overview"] is not None and not shown:
+            self._trace["view"] = (0, job["total"])
+            self.plot_trace_overview(job["overview"])
+            shown = True
+        res = job["result"]
+        if res is None:
+            self.trace_status.set(f"{self._trace['name']}: {job['total']:,} samples, "
+                                  f"rainflow {100.0 * job['done'] / max(job['total'], 1):.0f} %")
+            self.after(150, self._poll_trace, job, shown)
+            return
+        D = res["damage"]
+        passes = f"{1.0 / D:.3g}" if D > 0 else "inf"
+        self.trace_status.set(f"{self._trace['name']}: {res['samples']:,} samples, "
+                              f"{res['cycles']:,.1f} cycles, D = {D:.3g} per pass "
+                              f"(passes to D=1: {passes})")
+        self.plot_trace_hist(res)
+
+    def plot_trace_overview(self, ov):
+        idx, lo, hi = ov
+        ax = self.ax_trace
+        ax.clear()
+        if np.array_equal(lo, hi):
+            # Zoomed in to single samples
+            ax.plot(idx, lo, color=CLR_ACCENT, linewidth=0.8)
+        else:
+            ax.fill_between(idx, lo, hi, color=CLR_ACCENT, alpha=0.6, linewidth=0, step="post")
+        ax.set_xlim(idx[0], max(idx[-1], idx[0] + 1))
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.2)
+        ax.set_title(self._trace["name"], fontsize=8, color=CLR_TEXT)
+        self.canvas_trace.figure.tight_layout()
+        self.canvas_trace.draw_idle()
+
+    def _zoom_trace(self, event):
+        tr = self._trace
+        if tr is None or tr["view"] is None or event.inaxes is not self.ax_trace:
+            return
+        a, b = tr["view"]
+        n = tr["x"].shape[0]
+        f = 0.7 if event.button == "up" else 1.0 / 0.7
+        c = min(max(event.xdata, a), b)
+        span = max(int((b - a) * f), 64)
+        a = int(max(0, min(c - (c - a) * f, n - span)))
+        tr["view"] = (a, min(a + span, n))
+        self.plot_trace_overview(overview(tr["x"], *tr["view"]))
+
+    def plot_trace_hist(self, res):
+        ax = self.ax_hist
+        ax.clear()
+        edges, counts = res["edges"], res["counts"]
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge",
+               color=CLR_WHEEL, alpha=0.8, log=True)
+        ax.set_xlabel("cycle range (MPa)", fontsize=7, color=CLR_TEXT2)
+        ax.set_ylabel("cycles", fontsize=7, color=CLR_TEXT2)
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.2)
+        self.canvas_trace.figure.tight_layout()
+        self.canvas_trace.draw_idle()
+
+    # ==================================================================
+    # Catalog search
+    # ==================================================================
+    def open_catalog_search(self):
+        if getattr(self, "_catalog", None) is None:
+            self._catalog = WormCatalog()
+        win = tk.Toplevel(self, bg=CLR_BG)
+        win.title(self._t("cat_title"))
+        win.geometry("980x520")
+
+        form = tk.Frame(win, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        form.pack(fill="x", padx=10, pady=(10, 6))
+        T1 = self._safe_float("T1_Nm", 6.0)
+        ratio = self._safe_float("ratio", 25)
+        fields = [
+            ("cat_T2", f"{T1 * ratio * 0.7:.1f}", self._t("N_m")),
+            ("cat_ratio", f"{ratio:g}", ""),
+            ("cat_amax", "80", self._t("mm")),
+            ("cat_sfmin", "1.0", ""),
+        ]
+        cvars = {}
+        for key, default, unit in fields:
+            row = tk.Frame(form, bg=CLR_CARD)
+            row.pack(fill="x", padx=12, pady=3)
+            tk.Label(row, text=self._t(key), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10),
+                     anchor="w", width=24).pack(side="left")
+            var = tk.StringVar(value=default)
+            tk.Entry(row, textvariable=var, width=12, font=("", 10), relief="solid", bd=1,
+                     bg=CLR_INPUT_BG, fg=CLR_TEXT).pack(side="left", padx=(4, 0))
+            if unit:
+                tk.Label(row, text=unit, bg=CLR_CARD, fg=CLR_DIM, font=("", 9)).pack(side="left", padx=6)
+            cvars[key] = var
+
+        cols = ("mn", "z1", "q", "x2", "z2", "ratio", "a_mm", "T1_Nm", "eta0", "SF_root", "SF_contact")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=12)
+        for c in cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=84, anchor="center")
+        status = tk.StringVar(value="")
+        hits = []
+
+        def _search():
+            try:
+                T2 = float(cvars["cat_T2"].get())
+                i = float(cvars["cat_ratio"].get())
+                a_max = float(cvars["cat_amax"].get())
+                sf_min = float(cvars["cat_sfmin"].get())
+            except ValueError:
+                messagebox.showerror("Error", "Search values must be numeric.", parent=win)
+                return
+            out = self._catalog.search(self._collect_inputs(), self.steel, self.wheel,
+                                       T2, i, a_max, SF_min=sf_min, top=50)
+            hits[:] = out["results"]
+            for iid in tree.get_children():
+                tree.delete(iid)
+            for h in hits:
+                tree.insert("", "end", values=(
+                    f"{h['mn']:g}", h["z1"], f"{h['q']:g}", f"{h['x2']:+.2f}", h["z2"],
+                    f"{h['ratio']:.2f}", f"{h['a_mm']:.2f}", f"{h['T1_Nm']:.2f}",
+                    f"{h['eta0']:.3f}", f"{h['SF_root']:.2f}", f"{h['SF_contact']:.2f}"))
+            st = out["stats"]
+            status.set(f"{st['catalog']} sets -> module cut {st['module_cut']} -> geometry "
+                       f"{st['geometry_pass']} -> stress {st['stress_pass']}   "
+                       f"({st['elapsed_s'] * 1000:.1f} ms)"
+                       + "".join(f"  {k}: -{n}" for k, n in st["rejected"].items() if n))
+
+        def _apply():
+            sel = tree.selection()
+            if not sel:
+                return
+            inp = result_inputs(self._collect_inputs(), hits[tree.index(sel[0])])
+            for k in ("mn_mm", "z1", "q", "x1", "x2", "z2", "ratio", "beta_deg", "T1_Nm", "a_target_mm"):
+                self.inputs[k].set(inp[k])
+            self._on_refresh_diagram()
+            self.nb.select(self.tab_geom)
+
+        btns = tk.Frame(win, bg=CLR_BG)
+        btns.pack(fill="x", padx=10)
+        self._make_btn(btns, "cat_search", _search, style="accent", side="left")
+        self._make_btn(btns, "cat_apply", _apply, style="green", side="left", padx=8)
+        tk.Label(btns, textvariable=status, bg=CLR_BG, fg=CLR_TEXT2, font=("", 9)).pack(side="left", padx=8)
+        tree.pack(fill="both", expand=True, padx=10, pady=(6, 10))
+
+    # ==================================================================
+    # Design history
+    # ==================================================================
+    def _history_db(self):
+        if self._history is None:
+            self._history = DesignHistory()
+        return self._history
+
+    def _record_history(self, inp, res):
+        # History is a convenience; a locked or unwritable DB must not block runs
+        try:
+            design_id = self._history_db().add(inp, res["meta"], self.steel, self.wheel, source="gui")
+            if self._neighbors is not None:
+                self._neighbors.add(parse_inputs(inp), design_id)
+        except Exception as e:
+            log.warning("design history: %s", e)
+
+    def _apply_inputs(self, inp):
+        """Put stored string inputs into the Geometry tab."""
+        for k, v in inp.items():
+            if k in self.inputs:
+                self.inputs[k].set(v)
+        self.coll_text.delete("1.0", "end")
+        self.coll_text.insert("1.0", inp.get("load_collective", ""))
+        self._on_refresh_diagram()
+        self.nb.select(self.tab_geom)
+
+    @staticmethod
+    def _parse_history_filter(text):
+        """"a_mm<60, SF_root>1.3, ratio=25" -> query ranges (bounds inclusive)."""
+        ranges = {}
+        for part in text.replace(";", ",").split(","):
+            part = part.strip()
+            if not part:
+                continue
+            for op in ("<=", ">=", "<", ">", "="):
+                if op in part:
+                    col, val = (x.strip() for x in part.split(op, 1))
+                    break
+            else:
+                raise ValueError(f"Filter term needs <, > or =: {part!r}")
+            val = float(val)
+            lo, hi = ranges.get(col, (None, None))
+            if op.startswith("<"):
+                ranges[col] = (lo, val)
+            elif op.startswith(">"):
+                ranges[col] = (val, hi)
+            else:
+                ranges[col] = val
+        return ranges
+
+    def open_history(self):
+        try:
+            db = self._history_db()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        win = tk.Toplevel(self, bg=CLR_BG)
+        win.title(self._t("hist_title"))
+        win.geometry("1100x560")
+
+        form = tk.Frame(win, bg=CLR_CARD, highlightbackground=CLR_BORDER, highlightthickness=1)
+        form.pack(fill="x", padx=10, pady=(10, 6))
+        hvars = {}
+        for key, default, width in (("hist_filter", "SF_root>1.0", 48), ("hist_order", "-eta0", 16)):
+            row = tk.Frame(form, bg=CLR_CARD)
+            row.pack(fill="x", padx=12, pady=3)
+            tk.Label(row, text=self._t(key), bg=CLR_CARD, fg=CLR_TEXT, font=("", 10),
+                     anchor="w", width=34).pack(side="left")
+            var = tk.StringVar(value=default)
+            tk.Entry(row, textvariable=var, width=width, font=("", 10), relief="solid", bd=1,
+                     bg=CLR_INPUT_BG, fg=CLR_TEXT).pack(side="left", padx=(4, 0))
+            hvars[key] = var
+
+        cols = ("id", "source", "wheel", "mn", "z1", "z2", "ratio", "T1", "n1", "a_mm",
+                "eta0", "SF_root", "SF_contact", "damage_root")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=14)
+        for c in cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=160 if c == "wheel" else 72, anchor="center")
+        status = tk.StringVar(value=f"{len(db)} designs")
+
+        def _fmt(v):
+            if isinstance(v, (float, np.floating)):
+                return "" if np.isnan(v) else f"{v:.4g}"
+            return str(v)
+
+        def _query():
+            try:
+                ranges = self._parse_history_filter(hvars["hist_filter"].get())
+                order = hvars["hist_order"].get().strip()
+                known = db.columns
+                shown = [c for c in cols if c in known]
+                t0 = time.perf_counter()
+                out = db.query(columns=shown, order_by=order.lstrip("-") or None,
+                               descending=order.startswith("-"), limit=2000, **ranges)
+                dt = time.perf_counter() - t0
+            except ValueError as e:
+                messagebox.showerror("Error", str(e), parent=win)
+                return
+            for iid in tree.get_children():
+                tree.delete(iid)
+            n = out["id"].size
+            for i in range(n):
+                tree.insert("", "end", values=[_fmt(out[c][i]) if c in out else "" for c in cols])
+            status.set(f"{n} / {len(db)} designs   ({dt * 1000:.1f} ms)")
+
+        def _load():
+            sel = tree.selection()
+            if not sel:
+                return
+            self._apply_inputs(db.inputs(int(tree.item(sel[0], "values")[0])))
+
+        btns = tk.Frame(win, bg=CLR_BG)
+        btns.pack(fill="x", padx=10)
+        self._make_btn(btns, "hist_query", _query, style="accent", side="left")
+        self._make_btn(btns, "hist_load", _load, style="green", side="left", padx=8)
+        tk.Label(btns, textvariable=status, bg=CLR_BG, fg=CLR_TEXT2, font=("", 9)).pack(side="left", padx=8)
+        tree.pack(fill="both", expand=True, padx=10, pady=(6, 10))
+
+    # ==================================================================
+    # Similar designs (k-d tree over stored inputs)
+    # ==================================================================
+    def _neighbor_index(self):
+        """DesignIndex of the history, built once in a worker; None until ready.
+
+        A failed build is kept in ``_neighbors_error`` and not retried until
+        the error is cleared (Refresh in the similar-designs window).
+        """
+        if (self._neighbors is not None or self._neighbors_job is not None
+                or self._neighbors_error is not None):
+            return self._neighbors
+        try:
+            path = self._history_db().path
+        except Exception as e:
+            self._neighbors_error = e
+            return None
+        job = {"path": path}
+        self._neighbors_job = job
+
+        def _work():
+            try:
+                with DesignHistory(path) as own:
+                    self._neighbors = DesignIndex.from_history(own)
+            except Exception as e:
+                log.warning("design index: %s", e)
+                self._neighbors_error = e
+            finally:
+                self._neighbors_job = None
+
+        threading.Thread(target=_work, daemon=True).start()
+        return None
+
+    def _warm_start(self, inp):
+        """Thermal runs start from the temperature of the nearest stored design."""
+        if str(inp.get("thermal", "")).strip().lower() not in ("1", "on", "true", "yes"):
+            return
+        index = self._neighbor_index()
+        if index is None or not len(index):
+            return
+        try:
+            ids, _ = index.query_inputs(inp, k=1)
+            temp = self._history_db().query(columns=["temp_C"], id=int(ids[0]), limit=1)["temp_C"]
+        except Exception as e:
+            log.warning("warm start: %s", e)
+            return
+        if temp.size and np.isfinite(temp[0]):
+            inp["T_init_C"] = f"{float(temp[0]):.6g}"
+
+    def open_similar(self):
+        try:
+            db = self._history_db()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        win = tk.Toplevel(self, bg=CLR_BG)
+        win.title(self._t("sim_title"))
+        win.geometry("1100x480")
+        cols = ("dist", "id", "source", "wheel", "mn", "z1", "z2", "T1", "n1", "a_mm",
+                "eta0", "SF_root", "SF_contact")
+        tree = ttk.Treeview(win, columns=cols, show="headings", height=14)
+        for c in cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=160 if c == "wheel" else 72, anchor="center")
+        status = tk.StringVar(value=self._t("sim_indexing"))
+
+        def _fill():
+            index = self._neighbor_index()
+            if index is None:
+                if self._neighbors_error is not None:
+                    status.set(f"{self._t('sim_failed')}: {self._neighbors_error}")
+                elif win.winfo_exists():
+                    win.after(200, _fill)
+                return
+            self._auto_calc_worm()
+            self._auto_calc_wheel()
+            t0 = time.perf_counter()
+            try:
+                ids, dist = index.query_inputs(self._collect_inputs(), k=20)
+            except ValueError as e:
+                status.set(str(e))
+                return
+            dt = time.perf_counter() - t0
+            known = db.columns
+            for iid in tree.get_children():
+                tree.delete(iid)
+            for design_id, d in zip(ids.tolist(), dist.tolist()):
+                row = db.query(columns=[c for c in cols[1:] if c in known], id=design_id, limit=1)
+                vals = [f"{d:.3g}"]
+                for c in cols[1:]:
+                    v = row[c][0] if c in row and row[c].size else ""
+                    if isinstance(v, (float, np.floating)):
+                        v = "" if np.isnan(v) else f"{v:.4g}"
+                    vals.append(str(v))
+                tree.insert("", "end", values=vals)
+            status.set(f"{ids.size} / {len(index)} designs   ({dt * 1000:.2f} ms)")
+
+        def _load():
+            sel = tree.selection()
+            if sel:
+                self._apply_inputs(db.inputs(int(tree.item(sel[0], "values")[1])))
+
+        btns = tk.Frame(win, bg=CLR_BG)
+        btns.pack(fill="x", padx=10, pady=(10, 0))
+        def _refresh():
+            # Retry a failed index build
+            if self._neighbors_error is not None:
+                self._neighbors_error = None
+                status.set(self._t("sim_indexing"))
+            _fill()
+
+        self._make_btn(btns, "sim_refresh", _refresh, style="accent", side="left")
+        self._make_btn(btns, "hist_load", _load, style="green", side="left", padx=8)
+        tk.Label(btns, textvariable=status, bg=CLR_BG, fg=CLR_TEXT2, font=("", 9)).pack(side="left", padx=8)
+        tree.pack(fill="both", expand=True, padx=10, pady=(6, 10))
+        _fill()
+
+    # ==================================================================
+    # Project files
+    # ==================================================================
+    def save_project_file(self):
+        path = filedialog.asksaveasfilename(defaultextension=".wgp",
+                                            filetypes=[("WormGear project", "*.wgp")])
+        if not path:
+            return
+        res = self.res
+        if res is None and self.project is not None:
+            res = self.project.load_results()
+        extra = {"steel_file": self.steel_var.get(), "wheel_file": self.wheel_var.get(),
+                 "Et_text": self.Et_var.get()}
+        save_project(path, self._collect_inputs(), self.steel, self.wheel, res,
+                     sn_rows=self.sn_rows, extra=extra)
+        messagebox.showinfo("OK", f"Saved: {path}")
+
+    def open_project_file(self):
+        path = filedialog.askopenfilename(filetypes=[("WormGear project", "*.wgp")])
+        if not path:
+            return
+        try:
+            proj = open_project(path)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        for k, v in proj.inputs.items():
+            if k in self.inputs:
+                self.inputs[k].set(v)
+        self.coll_text.delete("1.0", "end")
+        self.coll_text.insert("1.0", proj.inputs.get("load_collective", ""))
+        self.steel = proj.steel
+        self.wheel = proj.wheel
+        extra = proj.extra
+        if extra.get("steel_file") in self.steel_db:
+            self.steel_var.set(extra["steel_file"])
+        if extra.get("wheel_file") in self.poly_db:
+            self.wheel_var.set(extra["wheel_file"])
+        self._populate_steel_form()
+        self._populate_wheel_form()
+        self.Et_var.set(extra.get("Et_text", self._format_Et()))
+        if proj.sn_rows:
+            self._fill_sn_table(proj.sn_rows)
+        else:
+            self._load_sn_table_from_wheel()
+        self.refresh_geom_plot()
+
+        # Result arrays stay on disk until the Results/Fatigue tab is viewed
+        self.project = proj
+        self.res = None
+        self.nb.select(self.tab_geom)
+
+    def _on_tab_changed(self, _event=None):
+        proj = self.project
+        if proj is None or self.res is not None or not proj.has_results:
+            return
+        if self.nb.select() not in (str(self.tab_res), str(self.tab_fat)):
+            return
+        self.res = proj.load_results()
+        self.plot_results(self.res)
+        self.update_fatigue(self.res)
 
     # ==================================================================
     # Export
     # ==================================================================
     def export_xlsx(self):
+        if self.res is None and self.project is not None:
+            self.res = self.project.load_results()
         if self.res is None:
             messagebox.showwarning("Info", "Please calculate first.")
             return
@@ -0,0 +1,113 @@
+"""
+asyncio facade for event-loop based callers.
+
+``await compute_async(inp, steel, wheel)`` runs ``compute_worm_cycle`` in
+an executor; ``async for chunk in sweep_async(inputs, steel, wheel)``
+evaluates a (possibly lazy or endless) iterable of designs in batches.
+
+Work runs in a thread pool by default (numpy releases the GIL in the
+vectorized stages) or in a process pool (``make_executor("process")``).
+Sweeps keep at most ``max_pending`` batches submitted ahead of the
+consumer: the next batch is only submitted when one has been consumed, so
+a slow consumer throttles the producer.  Cancelling the consuming task
+(or leaving the ``async for`` early) cancels every batch not yet started;
+batches already running finish in their worker and are discarded.
+"""
+
+import asyncio
+import collections
+import concurrent.futures as cf
+import itertools
+import os
+
+from .batch import compute_worm_batch
+from .worm_model import compute_worm_cycle
+
+
+DEFAULT_CHUNK = 64
+DEFAULT_PENDING = 4
+
+
+def make_executor(kind="thread", workers=None):
+    """Thread or process pool for ``compute_async`` / ``sweep_async``."""
+    workers = workers or os.cpu_count() or 1
+    if kind == "thread":
+        return cf.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wormgear")
+    if kind == "process":
+        return cf.ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor kind {kind!r} (thread or process).")
+
+
+async def compute_async(inp, steel, wheel, dtype=None, executor=None):
+    """``compute_worm_cycle`` without blocking the event loop.
+
+    ``executor`` defaults to the loop's default thread pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, compute_worm_cycle, inp, steel, wheel, dtype)
+
+
+def _evaluate_chunk(inputs, steel, wheel, dtype, curves):
+    """One sweep batch (module level so process pools can pickle it)."""
+    res = compute_worm_batch(inputs, steel, wheel, dtype=dtype)
+    if not curves:
+        res = {"meta": res["meta"]}
+    return res
+
+
+async def sweep_async(inputs, steel, wheel, chunk=DEFAULT_CHUNK, executor=None,
+                      max_pending=DEFAULT_PENDING, dtype=None, curves=False):
+    """
+    Evaluate designs in batches and yield results in input order.
+
+    Parameters
+    ----------
+    inputs : iterable of dict
+        String-valued inputs; consumed lazily, so generators work.
+    steel, wheel : dict
+        Material cards shared by all designs.
+    chunk : int
+        Designs per batch (one ``compute_worm_batch`` call).
+    executor : concurrent.futures.Executor, optional
+        Defaults to the loop's default thread pool.
+    max_pending : int
+        Batches submitted ahead of the consumer (backpressure bound).
+    dtype : optional
+        Precision of the phase arrays.
+    curves : bool
+        Also return the (designs x phase) curves (large across processes).
+
+    Yields
+    ------
+    dict with start, stop (design indices), inputs and the batch result
+    (``meta`` arrays, plus ``phi`` and curves when requested).
+    """
+    loop = asyncio.get_running_loop()
+    source = iter(inputs)
+    pending = collections.deque()
+    start = 0
+
+    def _submit():
+        nonlocal start
+        batch = list(itertools.islice(source, chunk))
+        if not batch:
+            return False
+        fut = loop.run_in_executor(executor, _evaluate_chunk, batch, steel, wheel, dtype, curves)
+        pending.append((start, batch, fut))
+        start += len(batch)
+        return True
+
+    try:
+        while len(pending) < max(int(max_pending), 1) and _submit():
+            pass
+        while pending:
+            first, batch, fut = pending[0]
+            res = await fut
+            pending.popleft()
+            # Refill before handing the batch over so workers stay busy
+            _submit()
+            yield {"start": first, "stop": first + len(batch), "inputs": batch, **res}
+    finally:
+        # Consumer cancelled or stopped early: drop batches not yet started
+        for _, _, fut in pending:
+            fut.cancel()
@@ -0,0 +1,127 @@
+"""
+Batched evaluation of many worm gear designs in one vectorized pass.
+
+Cycle curves come back as (designs x phase) arrays and meta fields as
+1-D arrays over designs.  Missing values (no S-N data, no target center
+distance) are NaN instead of None.
+"""
+
+import numpy as np
+
+from .collective import parse_collective, collective_terms, collective_meta
+from .worm_model import (
+    CURVE_KEYS, resolve_dtype, parse_inputs, design_terms, phase_grid,
+    harmonics, phase_curves, apply_load_sharing, fatigue_terms, build_meta, life_curve,
+    life_meta,
+)
+
+
+_INT_KEYS = ("z1", "z2", "steps", "n_slices", "mean_stress")
+_BOOL_KEYS = ("steps_auto", "thermal", "KHb_auto", "load_sharing")
+
+
+def stack_inputs(inputs):
+    """Parse a list of string-valued input dicts into arrays over designs."""
+    parsed = [parse_inputs(inp) for inp in inputs]
+    if not parsed:
+        raise ValueError("Batch needs at least one design.")
+    p = {}
+    for key in parsed[0]:
+        dtype = np.int64 if key in _INT_KEYS else bool if key in _BOOL_KEYS else np.float64
+        p[key] = np.array([one[key] for one in parsed], dtype=dtype)
+    return p
+
+
+def evaluate_batch(p, steel, wheel, dtype=np.float64, collective=None):
+    """Evaluate already-stacked design arrays (see ``stack_inputs``).
+
+    ``collective`` is an optional parsed load collective shared by all
+    designs (see ``collective.parse_collective``).
+    """
+    dt = resolve_dtype(dtype)
+    steps = np.unique(p["steps"])
+    if steps.size != 1:
+        # Auto resolution only sets a minimum, so the finest grid serves all
+        if not np.all(p["steps_auto"]):
+            raise ValueError("All designs in a batch must use the same 'steps'.")
+        steps = steps[-1:]
+        p = dict(p, steps=np.full_like(p["steps"], steps[0]))
+
+    d = design_terms(p, steel, wheel)
+    phi = phase_grid(int(steps[0]), dt)
+    h = harmonics(phi, p["z1"], dt)
+    curves = phase_curves(d, h, dt)
+    del h
+    apply_load_sharing(p, d, phi, curves)
+
+    sig = curves["sigma_root_MPa"]
+    extremes = (sig.max(axis=-1), sig.min(axis=-1), curves["p_contact_MPa"].max(axis=-1))
+    f = fatigue_terms(p, wheel, *extremes)
+    n = p["z1"].shape[0]
+    meta = build_meta(p, d, f)
+    life = life_curve(p, wheel, *extremes)
+    meta.update(life_meta(life))
+    res = {"phi": phi, **curves, "life": life}
+    if collective is not None:
+        coll = collective_terms(p, steel, wheel, collective)
+        meta.update(collective_meta(coll))
+        res["collective"] = coll
+    res["meta"] = {k: np.broadcast_to(np.asarray(v), (n,)).copy() for k, v in meta.items()}
+    return res
+
+
+def compute_worm_batch(inputs, steel, wheel, dtype=None):
+    """
+    Evaluate a list of designs (same input schema as ``compute_worm_cycle``).
+
+    Parameters
+    ----------
+    inputs : list of dict
+        String-valued input dicts, one per design.  All must share ``steps``
+        (or all use ``steps="auto"``, which takes the finest grid needed).
+        The first design's ``load_collective`` (if any) applies to all.
+    steel, wheel : dict
+        Worm / wheel material JSON data (shared by all designs).
+    dtype : str or numpy dtype, optional
+        "float64" (default) or "float32" for the (designs x phase) arrays.
+        Falls back to the first design's ``precision`` input.
+
+    Returns
+    -------
+    dict with keys phi (steps,), the cycle curves (n, steps), meta (dict
+    of (n,) arrays), life (``life_curve``, (n, points) curves) and, with a
+    load collective, collective ((n, bins) arrays).
+    """
+    if dtype is None and inputs:
+        dtype = inputs[0].get("precision")
+    collective = parse_collective(inputs[0].get("load_collective")) if inputs else None
+    return evaluate_batch(stack_inputs(inputs), steel, wheel, resolve_dtype(dtype), collective)
+
+
+def precision_report(inputs, steel, wheel, dtype="float32"):
+    """
+    Accuracy loss of a reduced-precision batch against float64.
+
+    Returns a dict mapping each curve and the safety/damage meta fields to
+    the maximum relative error over all designs and phases, plus the
+    memory footprint of both runs in bytes.
+    """
+    ref = compute_worm_batch(inputs, steel, wheel, dtype="float64")
+    low = compute_worm_batch(inputs, steel, wheel, dtype=dtype)
+
+    def _rel(a, b):
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        scale = np.maximum(np.abs(a), np.finfo(np.float64).tiny)
+        err = np.abs(a - b) / scale
+        err = err[np.isfinite(err)]
+        return float(err.max()) if err.size else 0.0
+
+    report = {"dtype": str(resolve_dtype(dtype))}
+    for key in CURVE_KEYS:
+        report[key] = _rel(ref[key], low[key])
+    for key in ("SF_root", "SF_contact", "damage_root"):
+        report[key] = _rel(ref["meta"][key], low["meta"][key])
+    report["bytes_float64"] = sum(ref[k].nbytes for k in CURVE_KEYS)
+    report["bytes_" + report["dtype"]] = sum(low[k].nbytes for k in CURVE_KEYS)
+    return report
@@ -0,0 +1,257 @@
+"""
+Content-addressed on-disk cache of ``compute_worm_cycle`` results.
+
+Entries live in one SQLite database in WAL mode, so any number of
+processes can read while one writes.  The key is a SHA-256 over the
+canonicalized inputs (the parsed values, so "6" and "6.0" hit the same
+entry), the precision, the parsed load collective, both material cards
+and the model version.  The model version is a hash of the model sources
+(``src/worm_model.py`` and the modules it evaluates); when it changes,
+the first process to open the cache drops every entry of older versions.
+
+Each entry holds the result as a JSON header plus one packed array block
+(same layout as ``.wgp`` projects).  When the stored bytes exceed
+``max_bytes`` the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import numpy as np
+
+from .project import _json_default, _pack_arrays, _flatten
+from .worm_model import compute_worm_cycle, parse_inputs, resolve_dtype
+from .collective import parse_collective
+
+
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Evict down to this share of max_bytes so eviction does not run on every put
+EVICT_TARGET = 0.9
+
+_SRC = os.path.dirname(os.path.abspath(__file__))
+MODEL_SOURCES = ("worm_model.py", "facewidth.py", "loadshare.py", "collective.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def model_version():
+    """SHA-256 over the model source files."""
+    h = hashlib.sha256(b"wormgear-cache-%d" % CACHE_FORMAT)
+    for name in MODEL_SOURCES:
+        with open(os.path.join(_SRC, name), "rb") as fh:
+            h.update(name.encode("utf-8") + b"\0" + fh.read())
+    return h.hexdigest()
+
+
+def default_path():
+    """``$WORMGEAR_CACHE`` or ``~/.cache/wormgear/results.sqlite``."""
+    return os.environ.get("WORMGEAR_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "wormgear", "results.sqlite")
+
+
+def _canonical(v):
+    if isinstance(v, dict):
+        return {str(k): _canonical(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_canonical(x) for x in v]
+    if isinstance(v, np.ndarray):
+        return _canonical(v.tolist())
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float):
+        # repr round-trips exactly and spells nan/inf
+        return repr(v)
+    return v
+
+
+def cache_key(inp, steel, wheel, dtype=None, version=None):
+    """Stable hex key of one ``compute_worm_cycle`` call."""
+    dt = resolve_dtype(dtype if dtype is not None else inp.get("precision"))
+    doc = {
+        "inputs": parse_inputs(inp),
+        "dtype": dt.str,
+        "collective": parse_collective(inp.get("load_collective")),
+        "steel": steel,
+        "wheel": wheel,
+        "model": version or model_version(),
+    }
+    blob = json.dumps(_canonical(doc), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def encode_result(res):
+    """Result dict -> bytes (length-prefixed JSON header + array block)."""
+    arrays, rest = _flatten(res)
+    directory, chunks = _pack_arrays(arrays)
+    header = json.dumps({"results": rest, "arrays": directory},
+                        default=_json_default).encode("utf-8")
+    return b"".join([struct.pack("<Q", len(header)), header, *chunks])
+
+
+def decode_result(data):
+    """Inverse of ``encode_result``; arrays are writable copies."""
+    n = struct.unpack_from("<Q", data)[0]
+    header = json.loads(bytes(data[8:8 + n]).decode("utf-8"))
+    block = bytearray(data[8 + n:])
+    res = header["results"]
+    for path, info in header["arrays"].items():
+        dt = np.dtype(info["dtype"])
+        count = int(np.prod(info["shape"], dtype=np.int64))
+        arr = np.frombuffer(block, dtype=dt, count=count, offset=info["offset"])
+        node = res
+        *parents, leaf = path.split("/")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = arr.reshape(info["shape"])
+    return res
+
+
+class ResultCache:
+    """
+    Persistent result cache shared across processes.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file (default ``default_path()``).
+    max_bytes : int
+        Size limit of the stored results; least recently used entries are
+        evicted beyond it.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or default_path()
+        self.max_bytes = int(max_bytes)
+        self.version = model_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=60.0, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        for stmt in _SCHEMA.strip().split(";"):
+            if stmt.strip():
+                self._db.execute(stmt)
+        with self._write():
+            row = self._db.execute("SELECT value FROM info WHERE name='model'").fetchone()
+            if row is None or row[0] != self.version:
+                # Model sources changed: results of other versions are stale
+                self._db.execute("DELETE FROM entries WHERE model != ?", (self.version,))
+                self._db.execute("INSERT OR REPLACE INTO info VALUES ('model', ?)",
+                                 (self.version,))
+
+    def _write(self):
+        return _Transaction(self._db, self._lock)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def key(self, inp, steel, wheel, dtype=None):
+        return cache_key(inp, steel, wheel, dtype, self.version)
+
+    def get(self, key):
+        """Stored result for ``key`` or None."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM entries WHERE key=? AND model=?",
+                                   (key, self.version)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._write():
+            self._db.execute("UPDATE entries SET accessed=?, hits=hits+1 WHERE key=?",
+                             (time.time(), key))
+        return decode_result(row[0])
+
+    def put(self, key, res):
+        """Store a result and evict old entries beyond ``max_bytes``."""
+        data = encode_result(res)
+        now = time.time()
+        with self._write():
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, model, size, created, accessed, hits, data) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?)", (key, self.version, len(data), now, now, data))
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(EVICT_TARGET * self.max_bytes)
+        freed = 0
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key=?", victims)
+
+    def compute(self, inp, steel, wheel, dtype=None):
+        """``compute_worm_cycle`` through the cache."""
+        key = self.key(inp, steel, wheel, dtype)
+        res = self.get(key)
+        if res is None:
+            res = compute_worm_cycle(inp, steel, wheel, dtype=dtype)
+            self.put(key, res)
+        return res
+
+    def clear(self):
+        with self._write():
+            self._db.execute("DELETE FROM entries")
+
+    def stats(self):
+        """Entry count, stored bytes and this instance's hits/misses."""
+        with self._lock:
+            n, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": n, "bytes": size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "model": self.version}
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` under the instance lock."""
+
+    def __init__(self, db, lock):
+        self.db = db
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, *exc):
+        try:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
@@ -0,0 +1,182 @@
+"""
+Catalog search over standard worm sets.
+
+Given a required output torque, ratio and maximum center distance, search
+all combinations of standard modules, starts z1, diameter quotients q and
+profile shifts.  Infeasible combinations are pruned with cheap geometry
+bounds (the ``_auto_calc_worm`` / ``_auto_calc_wheel`` diameter formulas)
+and the geometric feasibility checks of ``feasibility.check_geometry``
+before the stress model runs, vectorized, on the survivors.
+"""
+
+import math
+import time
+import numpy as np
+
+from .worm_model import parse_inputs, design_terms, fatigue_terms, ripple_extremes
+from .feasibility import check_geometry
+
+
+# Standard series (DIN 780 modules, DIN 3976 diameter quotients)
+STD_MODULES = (1.0, 1.25, 1.6, 2.0, 2.5, 3.15, 4.0, 5.0, 6.3, 8.0, 10.0, 12.5, 16.0, 20.0)
+STD_Z1 = (1, 2, 3, 4, 6)
+STD_Q = (8.0, 9.0, 10.0, 11.0, 12.0, 13.0, 14.0, 16.0, 17.0, 18.0, 20.0)
+STD_X2 = tuple(round(x, 1) for x in np.arange(-0.5, 0.51, 0.1))
+STD_X1 = (0.0,)
+
+
+class WormCatalog:
+    """All (mn, z1, q, x1, x2) combinations, indexed by module.
+
+    Rows are sorted by module so that a center-distance bound can cut the
+    catalog with one ``searchsorted`` before any per-row work.
+    """
+
+    def __init__(self, modules=STD_MODULES, z1s=STD_Z1, qs=STD_Q, x2s=STD_X2, x1s=STD_X1):
+        grids = np.meshgrid(np.sort(np.asarray(modules, dtype=float)),
+                            np.asarray(z1s, dtype=np.int64),
+                            np.asarray(qs, dtype=float),
+                            np.asarray(x1s, dtype=float),
+                            np.asarray(x2s, dtype=float), indexing="ij")
+        mn, z1, q, x1, x2 = (g.ravel() for g in grids)
+        self.mn, self.z1, self.q, self.x1, self.x2 = mn, z1, q, x1, x2
+        self.size = mn.size
+
+        # Worm geometry does not depend on the requirement: precompute it
+        self.d1 = (q + 2.0 * x1) * mn
+        self.df1 = self.d1 - 2.4 * mn
+        self.beta_deg = np.degrees(np.arctan2(z1 * mn, self.d1))
+
+        # Lower bound on the center distance of each module's cheapest set
+        self._modules = np.unique(mn)
+        self._z1_min = float(np.min(z1s))
+        self._dq_min = float(np.min(qs) + 2.0 * np.min(x1s))
+        self._x2_min = float(np.min(x2s))
+
+    def _module_cut(self, ratio_min, a_max):
+        """Number of leading rows whose module can still fit in a_max."""
+        a_lb = 0.5 * self._modules * (self._dq_min + self._z1_min * ratio_min + 2.0 * self._x2_min)
+        k = int(np.searchsorted(a_lb, a_max, side="right"))
+        if k == 0:
+            return 0
+        return int(np.searchsorted(self.mn, self._modules[k - 1], side="right"))
+
+    def search(self, base_inp, steel, wheel, T2_req, ratio, a_max,
+               ratio_tol=0.03, SF_min=1.0, z2_min=20, top=20, rank_by="a"):
+        """
+        Rank catalog sets that meet a torque / ratio / envelope requirement.
+
+        Parameters
+        ----------
+        base_inp : dict
+            String-valued inputs supplying everything the catalog does not
+            vary (speed, life, factors, face width, temperature ...).
+        steel, wheel : dict
+            Material cards.
+        T2_req : float
+            Required output torque (N*m); T1 is sized from it per set.
+        ratio : float
+            Required ratio; sets within ``ratio_tol`` (relative) pass.
+        a_max : float
+            Maximum center distance (mm).
+        SF_min : float
+            Minimum root and contact safety factor.
+        z2_min : int
+            Minimum number of wheel teeth.
+        top : int
+            Number of ranked sets returned.
+        rank_by : str
+            "a" (smallest center distance first, then highest SF) or "sf"
+            (highest min(SF_root, SF_contact) first).
+
+        Returns
+        -------
+        dict with keys results (list of dicts, best first) and stats
+        (row counts after each pruning stage, the number of ratio /
+        envelope candidates rejected by each geometric constraint and
+        elapsed time).
+        """
+        t0 = time.perf_counter()
+        stats = {"catalog": self.size}
+
+        # Stage 1: module index cut on the center-distance lower bound
+        k = self._module_cut(ratio * (1.0 - ratio_tol), a_max)
+        mn, z1, q, x1, x2 = (arr[:k] for arr in (self.mn, self.z1, self.q, self.x1, self.x2))
+        d1, df1, beta_deg = self.d1[:k], self.df1[:k], self.beta_deg[:k]
+        stats["module_cut"] = k
+
+        # Stage 2: cheap geometry bounds and feasibility checks
+        base = parse_inputs(base_inp)
+        z2 = np.rint(ratio * z1).astype(np.int64)
+        ratio_act = z2 / z1
+        d2 = (z2 + 2.0 * x2) * mn
+        a_calc = 0.5 * (d1 + d2)
+        cand = ((np.abs(ratio_act / ratio - 1.0) <= ratio_tol) & (z2 >= z2_min)
+                & (a_calc <= a_max))
+        viol = check_geometry({"z1": z1, "z2": z2, "mn": mn, "q": q, "x1": x1, "x2": x2,
+                               "beta_deg_in": beta_deg, "alpha_n": base["alpha_n"],
+                               "a_target": np.full(k, math.nan)})
+        keep = cand.copy()
+        stats["rejected"] = {}
+        for name, v in viol.items():
+            stats["rejected"][name] = int(np.count_nonzero(cand & v))
+            keep &= ~v
+        idx = np.flatnonzero(keep)
+        stats["geometry_pass"] = int(idx.size)
+
+        results = []
+        if idx.size:
+            # Stage 3: stress model on the survivors
+            n = idx.size
+            p = {key: np.full(n, val) for key, val in base.items()}
+            p.update(z1=z1[idx], z2=z2[idx], mn=mn[idx], q=q[idx], x1=x1[idx], x2=x2[idx],
+                     ratio=ratio_act[idx], beta_deg_in=beta_deg[idx],
+                     a_target=np.full(n, math.nan), T1=np.ones(n))
+            # Size T1 for the required output torque (T2 = T1 * i * eta0)
+            eta0 = design_terms(p, steel, wheel)["eta0"]
+            p["T1"] = T2_req / (p["ratio"] * eta0)
+            d = design_terms(p, steel, wheel)
+
+            s_hi, s_lo = ripple_extremes("sigma_root_MPa")
+            p_hi, _ = ripple_extremes("p_contact_MPa")
+            f = fatigue_terms(p, wheel, d["sigma_base"] * s_hi, d["sigma_base"] * s_lo,
+                              d["p_base"] * p_hi)
+            sf_r = np.nan_to_num(f["SF_root"], nan=np.inf)
+            sf_c = np.nan_to_num(f["SF_contact"], nan=np.inf)
+            sf = np.minimum(sf_r, sf_c)
+            ok = (sf >= SF_min) & (f["damage_root"] < 1.0)
+            stats["stress_pass"] = int(np.count_nonzero(ok))
+
+            sel = np.flatnonzero(ok)
+            if rank_by == "sf":
+                order = np.lexsort((d["a_calc"][sel], -sf[sel]))
+            else:
+                order = np.lexsort((-sf[sel], d["a_calc"][sel]))
+            for j in sel[order[:top]]:
+                i = idx[j]
+                results.append({
+                    "mn": float(mn[i]), "z1": int(z1[i]), "q": float(q[i]),
+                    "x1": float(x1[i]), "x2": float(x2[i]), "z2": int(z2[i]),
+                    "ratio": float(ratio_act[i]), "a_mm": float(d["a_calc"][j]),
+                    "d1_mm": float(d1[i]), "beta_deg": float(beta_deg[i]),
+                    "eta0": float(d["eta0"][j]), "T1_Nm": float(p["T1"][j]),
+                    "SF_root": float(f["SF_root"][j]), "SF_contact": float(f["SF_contact"][j]),
+                    "damage_root": float(f["damage_root"][j]),
+                })
+        else:
+            stats["stress_pass"] = 0
+
+        stats["elapsed_s"] = time.perf_counter() - t0
+        return {"results": results, "stats": stats}
+
+
+def result_inputs(base_inp, hit):
+    """String inputs for ``compute_worm_cycle`` / the GUI from a search hit."""
+    inp = dict(base_inp)
+    inp.update({
+        "mn_mm": f"{hit['mn']:g}", "z1": str(hit["z1"]), "q": f"{hit['q']:g}",
+        "x1": f"{hit['x1']:g}", "x2": f"{hit['x2']:g}", "z2": str(hit["z2"]),
+        "ratio": f"{hit['ratio']:.4g}", "beta_deg": f"{hit['beta_deg']:.6f}",
+        "T1_Nm": f"{hit['T1_Nm']:.4f}", "a_target_mm": "",
+    })
+    return inp
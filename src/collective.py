@@ -0,0 +1,136 @@
+"""
+Load collectives (duty-cycle histograms).
+
+A collective is a table of bins, one per line (or separated by ";"):
+
+    T1_Nm  n1_rpm  time_share
+
+Values ending in "x" are multiples of the design's own T1 / n1, so
+"2x 1x 10" means 10 % of the time at twice the nominal torque.  Shares
+are normalized to sum to 1.  Every bin runs for its share of ``life_h``;
+the temperature, material and load stages are broadcast over
+(designs, bins) in one pass and the per-bin Miner damages are summed.
+"""
+
+import re
+import numpy as np
+
+from .worm_model import (
+    geometry, operating_temperature, material_terms, load_terms, design_terms,
+    peak_factors, fatigue_terms,
+)
+
+
+# S-N slope used for the equivalent torque when the card has no root S-N
+DEFAULT_SN_EXPONENT = 6.0
+
+
+def parse_collective(text):
+    """
+    Parse a collective table.
+
+    Returns dict with T1, n1 (values), T1_rel, n1_rel (bool: multiple of
+    the design value) and share (normalized), each of shape (bins,).
+    Blank or empty text gives None.
+    """
+    rows = [r for r in re.split(r"[;\n]", str(text or "")) if r.strip()
+            and not r.strip().startswith("#")]
+    if not rows:
+        return None
+    toks = [r.replace(",", " ").split() for r in rows]
+    for r, t in zip(rows, toks):
+        if len(t) != 3:
+            raise ValueError(f"Load collective row needs T1, n1 and share: {r.strip()!r}")
+    cols = np.array(toks, dtype=str).T
+    rel = np.char.endswith(np.char.lower(cols), "x") | np.char.endswith(cols, "*")
+    num = np.where(rel, np.char.rstrip(np.char.rstrip(np.char.lower(cols), "x"), "*"), cols)
+    T1, n1, share = num.astype(float)
+    T1_rel, n1_rel, _ = rel
+    if (share < 0).any() or share.sum() <= 0:
+        raise ValueError("Load collective shares must be >= 0 with a positive sum.")
+    return {"T1": T1, "T1_rel": T1_rel, "n1": n1, "n1_rel": n1_rel,
+            "share": share / share.sum()}
+
+
+def sn_exponent(sn_list, default=DEFAULT_SN_EXPONENT):
+    """Basquin exponent k (N ~ S^-k) from a log-log fit of the S-N points."""
+    pts = np.array([pt for pt in sn_list or [] if pt[0] > 0 and pt[1] > 0], dtype=float)
+    if pts.shape[0] < 2 or np.ptp(pts[:, 1]) == 0:
+        return default
+    slope = np.polyfit(np.log10(pts[:, 1]), np.log10(pts[:, 0]), 1)[0]
+    return float(-slope) if slope < 0 else default
+
+
+def collective_terms(p, steel, wheel, spec):
+    """
+    Per-bin safety factors and Miner damage for a load collective.
+
+    Parameters
+    ----------
+    p : dict
+        Parsed inputs (``parse_inputs``), scalars or 1-D design arrays.
+    steel, wheel : dict
+        Material cards.
+    spec : dict
+        Parsed collective (``parse_collective``), shared by all designs.
+
+    Returns
+    -------
+    dict with the resolved bins T1_Nm, n1_rpm, hours, the per-bin temp_C,
+    sigma_max_MPa, p_max_MPa, SF_root, SF_contact and damage (shape
+    (..., bins)), plus damage_total, T1_eq_Nm and n1_eq_rpm per design and
+    the S-N exponent k_sn used for the equivalent torque.
+    """
+    def ex(v):
+        return np.asarray(v)[..., None] if np.ndim(v) else v
+
+    # KHb ("auto") and the stress peak factors are taken at the design point
+    d0 = design_terms(p, steel, wheel)
+    s_hi, s_lo, p_hi = (ex(v) for v in peak_factors(p, d0))
+
+    T1 = np.where(spec["T1_rel"], spec["T1"] * ex(p["T1"]), spec["T1"])
+    n1 = np.where(spec["n1_rel"], spec["n1"] * ex(p["n1"]), spec["n1"])
+    hours = ex(p["life_h"]) * spec["share"]
+    grid = {k: ex(v) for k, v in p.items()}
+    grid.update(T1=T1, n1=n1, KHb=ex(d0["KHb"]), life_h=hours)
+
+    g = geometry(grid)
+    th = operating_temperature(grid, g, wheel)
+    m = material_terms(grid, steel, wheel, temp_C=th["temp_C"])
+    m["mu"] = th["mu"]
+    t = load_terms(grid, g, m)
+
+    sigma_max = t["sigma_base"] * s_hi
+    p_max = t["p_base"] * p_hi
+    f = fatigue_terms(grid, wheel, sigma_max, t["sigma_base"] * s_lo, p_max)
+
+    # Equivalent torque: cycle-weighted k-th power mean over the bins
+    k = sn_exponent(wheel.get("SN", {}).get("root_allow_MPa_vs_N", []))
+    w = n1 * hours
+    w_sum = np.maximum(w.sum(axis=-1), 1e-300)
+    T1_eq = ((w * np.abs(T1) ** k).sum(axis=-1) / w_sum) ** (1.0 / k)
+    n1_eq = w_sum / np.maximum(hours.sum(axis=-1), 1e-300)
+
+    shape = np.broadcast(T1, n1, sigma_max).shape
+    return {
+        "T1_Nm": np.broadcast_to(T1, shape), "n1_rpm": np.broadcast_to(n1, shape),
+        "share": spec["share"], "hours": np.broadcast_to(hours, shape),
+        "temp_C": np.broadcast_to(th["temp_C"], shape),
+        "sigma_max_MPa": np.broadcast_to(sigma_max, shape),
+        "p_max_MPa": np.broadcast_to(p_max, shape),
+        "SF_root": np.broadcast_to(f["SF_root"], shape),
+        "SF_contact": np.broadcast_to(f["SF_contact"], shape),
+        "damage": np.broadcast_to(f["damage_root"], shape),
+        "damage_total": f["damage_root"].sum(axis=-1),
+        "T1_eq_Nm": T1_eq, "n1_eq_rpm": n1_eq, "k_sn": k,
+    }
+
+
+def collective_meta(coll):
+    """Meta fields summarizing a collective result."""
+    return {
+        "damage_collective": coll["damage_total"],
+        "T1_eq_Nm": coll["T1_eq_Nm"],
+        "n1_eq_rpm": coll["n1_eq_rpm"],
+        "collective_bins": coll["share"].size,
+    }
@@ -0,0 +1,207 @@
+"""
+Design-space explorer backend: columns of stored designs, indexed filters
+and binned rendering for the GUI Explorer tab.
+
+``ExplorerTable`` holds numeric columns (float64, one row per design) of a
+``DesignHistory`` selection or of a sweep result.  Each filtered column
+gets a sort index once (``argsort``), after which a range filter is two
+``searchsorted`` calls and one scatter into a boolean mask, so brushing a
+million rows stays in the tens of milliseconds.
+
+Plots switch between two renderings: ``binned`` reduces the points inside
+the view to a 2-D grid (count and the minimum of the color column per
+cell, so the worst design in a cell sets its color) for ``imshow``; once
+a zoomed view holds at most ``MARKER_LIMIT`` points, ``visible`` returns
+their indices for a real scatter.  ``pick`` finds the design nearest to a
+click in screen-normalized coordinates.
+"""
+
+import numpy as np
+
+
+MARKER_LIMIT = 20000
+BINS = (320, 240)
+
+
+class ExplorerTable:
+    """
+    Numeric design columns with sort indexes for range filters.
+
+    Parameters
+    ----------
+    columns : dict
+        Column name -> 1-D array, all of one length.  Non-numeric columns
+        are dropped.
+    loader : callable, optional
+        ``loader(name)`` -> array for columns requested but not given
+        (e.g. a history query); called once per column.
+    """
+
+    def __init__(self, columns, loader=None):
+        self._cols = {}
+        self._index = {}
+        self._loader = loader
+        self.n = None
+        for name, val in columns.items():
+            self._add(name, val)
+        if self.n is None:
+            self.n = 0
+
+    def _add(self, name, val):
+        arr = np.asarray(val)
+        if arr.ndim != 1 or arr.dtype.kind not in "biuf":
+            return False
+        if self.n is None:
+            self.n = arr.size
+        elif arr.size != self.n:
+            raise ValueError(f"Column {name!r} has {arr.size} rows, expected {self.n}.")
+        self._cols[name] = arr.astype(np.float64, copy=False)
+        return True
+
+    @classmethod
+    def from_history(cls, db, columns, source=None):
+        """
+        Load ``columns`` (plus ``id``) of all stored designs, in id order.
+
+        Further columns are fetched on first use; rows added to the
+        history afterwards are not part of the table.
+        """
+        cols = ["id"] + [c for c in columns if c != "id" and c in db.columns]
+        data = db.query(columns=cols, order_by="id", limit=None, source=source)
+        last = int(data["id"][-1]) if data["id"].size else 0
+
+        def _load(name):
+            if name not in db.columns:
+                raise KeyError(name)
+            return db.query(columns=[name], order_by="id", limit=None, source=source,
+                            id=(None, last))[name]
+
+        return cls(data, loader=_load)
+
+    @property
+    def names(self):
+        return list(self._cols)
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, name):
+        return name in self._cols
+
+    def column(self, name):
+        """Column as float64 (NaN for missing values)."""
+        if name not in self._cols:
+            if self._loader is None or not self._add(name, self._loader(name)):
+                raise KeyError(name)
+        return self._cols[name]
+
+    def _sorted(self, name):
+        """(sorted values, row order) of a column; NaN rows sort last."""
+        if name not in self._index:
+            col = self.column(name)
+            order = np.argsort(col, kind="stable")
+            self._index[name] = (col[order], order)
+        return self._index[name]
+
+    def prepare(self, names):
+        """Build the sort indexes of ``names`` up front (e.g. in a worker)."""
+        for name in names:
+            self._sorted(name)
+
+    def range_mask(self, name, lo=None, hi=None):
+        """Rows with lo <= column <= hi (None = open end)."""
+        vals, order = self._sorted(name)
+        i0 = 0 if lo is None else int(np.searchsorted(vals, lo, side="left"))
+        i1 = int(np.searchsorted(vals, np.inf, side="right")) if hi is None else \
+            int(np.searchsorted(vals, hi, side="right"))
+        mask = np.zeros(self.n, dtype=bool)
+        mask[order[i0:i1]] = True
+        return mask
+
+    def mask(self, ranges=None, base=None):
+        """
+        Rows matching every range (``DesignHistory.query`` syntax).
+
+        ``ranges`` maps column -> (low, high) or an exact value; ``base``
+        is an optional mask to intersect with.
+        """
+        out = np.ones(self.n, dtype=bool) if base is None else base.copy()
+        for name, cond in (ranges or {}).items():
+            lo, hi = cond if isinstance(cond, (tuple, list)) else (cond, cond)
+            out &= self.range_mask(name, lo, hi)
+        return out
+
+    def _in_view(self, x, y, mask, xlim, ylim):
+        xs, ys = self.column(x), self.column(y)
+        sel = np.isfinite(xs) & np.isfinite(ys)
+        if mask is not None:
+            sel &= mask
+        if xlim is not None:
+            sel &= (xs >= min(xlim)) & (xs <= max(xlim))
+        if ylim is not None:
+            sel &= (ys >= min(ylim)) & (ys <= max(ylim))
+        return sel
+
+    def limits(self, x, y, mask=None):
+        """Data limits ((xmin, xmax), (ymin, ymax)) of the masked rows."""
+        idx = np.flatnonzero(self._in_view(x, y, mask, None, None))
+        if idx.size == 0:
+            return (0.0, 1.0), (0.0, 1.0)
+        out = []
+        for name in (x, y):
+            v = self.column(name)[idx]
+            lo, hi = float(v.min()), float(v.max())
+            if hi <= lo:
+                pad = abs(lo) * 0.05 or 0.5
+                lo, hi = lo - pad, hi + pad
+            out.append((lo, hi))
+        return tuple(out)
+
+    def visible(self, x, y, mask=None, xlim=None, ylim=None):
+        """Row indices inside the view."""
+        return np.flatnonzero(self._in_view(x, y, mask, xlim, ylim))
+
+    def binned(self, x, y, mask=None, xlim=None, ylim=None, color=None, bins=BINS):
+        """
+        2-D binning of the rows inside the view.
+
+        Returns
+        -------
+        dict with counts (ny, nx), value (ny, nx: minimum of ``color`` per
+        cell, NaN where empty or no color), extent (xmin, xmax, ymin,
+        ymax) for ``imshow(origin="lower")`` and n (rows binned).
+        """
+        if xlim is None or ylim is None:
+            lx, ly = self.limits(x, y, mask)
+            xlim, ylim = xlim or lx, ylim or ly
+        (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+        nx, ny = bins
+        idx = self.visible(x, y, mask, (x0, x1), (y0, y1))
+        ix = np.minimum(((self.column(x)[idx] - x0) * (nx / (x1 - x0))).astype(np.int64), nx - 1)
+        iy = np.minimum(((self.column(y)[idx] - y0) * (ny / (y1 - y0))).astype(np.int64), ny - 1)
+        cell = iy * nx + ix
+        counts = np.bincount(cell, minlength=nx * ny)
+        value = np.full(nx * ny, np.inf)
+        if color is not None:
+            c = self.column(color)[idx]
+            ok = np.isfinite(c)
+            np.minimum.at(value, cell[ok], c[ok])
+        value[~np.isfinite(value)] = np.nan
+        return {"counts": counts.reshape(ny, nx), "value": value.reshape(ny, nx),
+                "extent": (x0, x1, y0, y1), "n": int(idx.size)}
+
+    def pick(self, x, y, px, py, xlim, ylim, mask=None, radius=0.02):
+        """
+        Row nearest to (px, py) within ``radius`` (share of the view), or None.
+
+        Distances are measured in view-normalized coordinates so both axes
+        weigh equally whatever their units.
+        """
+        (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+        rx, ry = radius * (x1 - x0), radius * (y1 - y0)
+        idx = self.visible(x, y, mask, (px - rx, px + rx), (py - ry, py + ry))
+        if idx.size == 0:
+            return None
+        dx = (self.column(x)[idx] - px) / (x1 - x0)
+        dy = (self.column(y)[idx] - py) / (y1 - y0)
+        return int(idx[np.argmin(dx * dx + dy * dy)])
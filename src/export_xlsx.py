@@ -7,31 +7,27 @@ try:
 except ImportError:
     Workbook = None
 
+from .records import curves_to_records
+
 
 def export_cycle_xlsx(path, inputs, steel, wheel, res):
     if Workbook is None:
         raise ImportError("openpyxl is required for Excel export.")
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Cycle Curves"
+    # Write-only sheets stream rows instead of building a cell grid
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Cycle Curves")
 
     headers = ["phi_rad", "phi_deg", "p_contact_MPa", "sigma_root_MPa",
                "T2_Nm", "eta", "Nc_proxy"]
     ws.append(headers)
 
-    phi = res["phi"]
-    deg = phi * 180.0 / np.pi
-    for i in range(len(phi)):
-        ws.append([
-            float(phi[i]),
-            float(deg[i]),
-            float(res["p_contact_MPa"][i]),
-            float(res["sigma_root_MPa"][i]),
-            float(res["T2_Nm"][i]),
-            float(res["eta"][i]),
-            float(res["Nc_proxy"][i]),
-        ])
+    # One float64 table; tolist() converts all elements to Python floats in C
+    rec = curves_to_records(res)
+    table = np.column_stack([rec["phi"], np.degrees(rec["phi"])]
+                            + [rec[k] for k in headers[2:]]).astype(np.float64)
+    for row in table.tolist():
+        ws.append(row)
 
     # Meta sheet
     ws2 = wb.create_sheet("Meta")
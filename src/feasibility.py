@@ -0,0 +1,138 @@
+"""
+Geometric feasibility pre-screen.
+
+``check_geometry(p)`` evaluates every geometric validity check on parsed
+inputs (scalars or stacked design arrays, see ``batch.stack_inputs``)
+with the diameter formulas of ``geometry`` only, so whole candidate
+batches can be screened before the stress model runs.  Each check returns
+a boolean "violated" array; ``screen`` combines them into a feasibility
+mask and per-design reasons.
+
+Checks (names in ``CONSTRAINTS``):
+
+- ``teeth``: z1 >= 1, z2 >= 1 and mn > 0.
+- ``beta_clamp``: the input lead angle lies inside the 0.5 .. 80 deg
+  clamp of ``geometry`` (outside it the model silently uses another d1).
+- ``worm_root`` / ``wheel_root``: positive root diameters df1, df2.
+- ``undercut``: z2 >= 2 (1 - x2) / sin^2(alpha_n), the limit for a wheel
+  generated by a rack-like worm profile.
+- ``tip_thickness``: wheel tip thickness >= ``TIP_THICKNESS_MIN * mn``
+  (involute tooth of the reference diameter z2 * mn, tip diameter da2).
+- ``tip_clearance``: worm tip / wheel root and wheel tip / worm root
+  clearances at the working center distance >= ``CLEARANCE_MIN * mn``
+  (a target center distance below a_calc eats into both).
+
+``geometry`` carries the wheel shift x2 in d2 = (z2 + 2 x2) mn and again
+in da2 / df2, which would shrink both clearances by x2 * mn and thin the
+tip.  The last two checks therefore take the wheel tip / root diameters
+from the reference diameter z2 * mn (``wheel_diameters``), applying the
+shift once; a_calc already holds the shifted center distance, so the
+clearances at a_calc are 0.2 mn for any x2.
+"""
+
+import math
+import numpy as np
+
+from .worm_model import geometry
+
+
+CONSTRAINTS = ("teeth", "beta_clamp", "worm_root", "wheel_root", "undercut",
+               "tip_thickness", "tip_clearance")
+
+BETA_MIN_DEG, BETA_MAX_DEG = 0.5, 80.0    # clamp of worm_model.geometry
+TIP_THICKNESS_MIN = 0.2                    # wheel tip thickness / mn
+CLEARANCE_MIN = 0.0                        # tip-to-root clearance / mn
+
+
+def _inv(alpha):
+    return np.tan(alpha) - alpha
+
+
+def wheel_tip_thickness(z2, mn, x2, da2, alpha_n):
+    """Wheel tooth thickness on the tip diameter (mm), NaN past the base circle."""
+    d = z2 * mn
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = mn * (0.5 * math.pi + 2.0 * x2 * np.tan(alpha_n))
+        cos_a = d * np.cos(alpha_n) / da2
+        alpha_a = np.arccos(np.where(np.abs(cos_a) <= 1.0, cos_a, np.nan))
+        return da2 * (s / d + _inv(alpha_n) - _inv(alpha_a))
+
+
+def wheel_diameters(z2, mn, x2):
+    """Wheel tip and root diameters (da2, df2) with the shift x2 applied once."""
+    d = z2 * mn
+    return d + 2.0 * mn * (1.0 + x2), d - 2.0 * mn * (1.2 - x2)
+
+
+def check_geometry(p, g=None):
+    """
+    Evaluate every constraint on parsed inputs.
+
+    Parameters
+    ----------
+    p : dict
+        Parsed inputs (``parse_inputs``) or stacked design arrays.
+    g : dict, optional
+        ``geometry(p)`` when the caller already has it.
+
+    Returns
+    -------
+    dict constraint name -> bool array (True where violated), in
+    ``CONSTRAINTS`` order.
+    """
+    if g is None:
+        g = geometry(p)
+    z1, z2, mn, x2 = p["z1"], p["z2"], p["mn"], p["x2"]
+    alpha_n = p["alpha_n"]
+    beta_in = p["beta_deg_in"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z2_undercut = 2.0 * (1.0 - x2) / np.sin(alpha_n) ** 2
+        da2, df2 = wheel_diameters(z2, mn, x2)
+        s_a2 = wheel_tip_thickness(z2, mn, x2, da2, alpha_n)
+        # Clearances at the working center distance (target if given)
+        c_root2 = g["a_mm"] - 0.5 * (g["da1"] + df2)
+        c_root1 = g["a_mm"] - 0.5 * (da2 + g["df1"])
+
+    ok = {
+        "teeth": (np.asarray(z1) >= 1) & (np.asarray(z2) >= 1) & (np.asarray(mn) > 0),
+        "beta_clamp": (beta_in >= BETA_MIN_DEG) & (beta_in <= BETA_MAX_DEG),
+        "worm_root": g["df1"] > 0,
+        "wheel_root": g["df2"] > 0,
+        "undercut": z2 >= z2_undercut,
+        "tip_thickness": s_a2 >= TIP_THICKNESS_MIN * mn,
+        "tip_clearance": np.minimum(c_root1, c_root2) >= CLEARANCE_MIN * mn,
+    }
+    # Comparisons are written as "ok" so NaN geometry counts as violated
+    out = {k: np.logical_not(v) for k, v in ok.items()}
+    shape = np.broadcast(*out.values()).shape
+    return {k: np.broadcast_to(v, shape) for k, v in out.items()}
+
+
+def reasons(violations, i=None):
+    """Names of the violated constraints (of design ``i`` for arrays)."""
+    if i is None:
+        return [k for k, v in violations.items() if bool(v)]
+    return [k for k, v in violations.items() if v[i]]
+
+
+def screen(p, g=None):
+    """
+    Feasibility mask and rejection reasons of parsed designs.
+
+    Returns
+    -------
+    dict with ok (bool array, True = all constraints met), violations
+    (``check_geometry`` output), counts (designs failing each constraint)
+    and reason (str array: comma-joined violated constraints, "" if ok).
+    """
+    viol = check_geometry(p, g)
+    shape = next(iter(viol.values())).shape
+    bad = np.zeros(shape, dtype=bool)
+    reason = np.full(shape, "", dtype=object)
+    for name, v in viol.items():
+        bad |= v
+        reason[v] = np.where(reason[v] == "", name, reason[v] + "," + name)
+    return {"ok": ~bad, "violations": viol,
+            "counts": {k: int(np.count_nonzero(v)) for k, v in viol.items()},
+            "reason": reason.astype(str)}
@@ -0,0 +1,267 @@
+"""
+Incremental recompute of the model as a graph of memoized stages.
+
+``compute_worm_cycle`` runs every stage on every call.  ``ModelGraph``
+runs the same stages (``STAGES``: geometry -> temperature -> materials ->
+loads -> phase curves -> safety factors / damage / life curve, plus the
+face-width slices and the load collective), but each stage declares the sources it
+reads (parsed-input keys, the ``steel`` / ``wheel`` cards, ``dtype``,
+``collective``) and the stages it builds on.  A run compares the sources
+with those of the previous run and recomputes a stage only when one of
+its sources changed or an upstream stage was recomputed; all other stage
+outputs are reused.  Changing ``life_h`` thus reruns the S-N lookups and
+the damage sum only.
+
+Stages only see the sources they declare, so a missing declaration fails
+loudly instead of silently reusing a stale output.  Results are identical
+to ``compute_worm_cycle`` / ``compute_worm_batch``; phase arrays are
+shared with the memo and marked read-only.
+
+``ModelGraph.stats`` reports the reused / recomputed stages of the last
+run, ``totals`` the counts since the graph was created.
+"""
+
+import threading
+import numpy as np
+
+from .batch import stack_inputs
+from .collective import parse_collective, collective_terms, collective_meta
+from .facewidth import slice_loads
+from .history import card_hash
+from .worm_model import (
+    resolve_dtype, parse_inputs, geometry, operating_temperature, material_terms,
+    load_terms, face_load_factor, phase_grid, harmonics, phase_curves, apply_load_sharing,
+    safety_terms, damage_terms, life_curve, life_meta, build_meta, scalar_meta, _py_scalar,
+)
+
+
+# Sources compared by content hash instead of value
+_CARDS = ("steel", "wheel")
+
+
+def _geometry(s, up):
+    return geometry(s)
+
+
+def _temperature(s, up):
+    return operating_temperature(s, up["geometry"], s["wheel"])
+
+
+def _materials(s, up):
+    th = up["temperature"]
+    m = material_terms(s, s["steel"], s["wheel"], temp_C=th["temp_C"])
+    m["mu"] = th["mu"]
+    return m
+
+
+def _loads(s, up):
+    g, m = up["geometry"], up["materials"]
+    t = load_terms(s, g, m)
+    khb = face_load_factor(s, {**m, **t})
+    if np.any(s["KHb_auto"]):
+        t = load_terms(dict(s, KHb=khb), g, m)
+    return {**t, "KHb": khb}
+
+
+def _phase(s, up):
+    d = {**up["geometry"], **up["materials"], **up["loads"]}
+    dt = s["dtype"]
+    phi = phase_grid(int(np.max(s["steps"])), dt)
+    h = harmonics(phi, s["z1"], dt)
+    curves = phase_curves(d, h, dt)
+    del h
+    apply_load_sharing(s, d, phi, curves)
+    for arr in (phi, *curves.values()):
+        arr.flags.writeable = False
+    sig = curves["sigma_root_MPa"]
+    return {"phi": phi, "curves": curves, "sigma_max": sig.max(axis=-1),
+            "sigma_min": sig.min(axis=-1), "p_max": curves["p_contact_MPa"].max(axis=-1)}
+
+
+def _safety(s, up):
+    ph = up["phase"]
+    return safety_terms(s, s["wheel"], ph["sigma_max"], ph["p_max"])
+
+
+def _damage(s, up):
+    ph = up["phase"]
+    return damage_terms(s, s["wheel"], ph["sigma_max"], ph["sigma_min"])
+
+
+def _life(s, up):
+    ph = up["phase"]
+    return life_curve(s, s["wheel"], ph["sigma_max"], ph["sigma_min"], ph["p_max"])
+
+
+def _slices(s, up):
+    """Root stress across the face width (single designs only)."""
+    if np.ndim(s["z1"]) or not (s["n_slices"] > 0 and s["b"] > 0):
+        return {}
+    m, t, ph = up["materials"], up["loads"], up["phase"]
+    sl = slice_loads(s["b"], s["mn"], float(m["Eprime"]), s["n_slices"],
+                     float(t["Fn_base"]) * s["KA"] * s["KV"], ph["phi"], s["z1"],
+                     s["fHb"], s["crown"])
+    # sigma_root already carries KHb; replace it with the local slice ratio
+    sigma = (ph["curves"]["sigma_root_MPa"][:, None] / t["KHb"]
+             * sl["load_ratio"]).astype(s["dtype"], copy=False)
+    return {"x_slices_mm": sl["x_mm"], "sigma_root_slices_MPa": sigma}
+
+
+def _collective(s, up):
+    spec = s["collective"]
+    if spec is None:
+        return None
+    p = {k: v for k, v in s.items() if k not in _CARDS + ("dtype", "collective")}
+    return collective_terms(p, s["steel"], s["wheel"], spec)
+
+
+# name -> (sources read, upstream stages, function(sources, upstream outputs)),
+# in evaluation order.  Sources None = all of them.
+STAGES = {
+    "geometry": (("z1", "z2", "mn", "x1", "x2", "beta_deg_in", "q", "a_target", "alpha_n"),
+                 (), _geometry),
+    "temperature": (("T1", "n1", "alpha_n", "mu", "temp_C", "thermal", "T_init", "T_amb",
+                     "k_heat", "A_housing", "wheel"),
+                    ("geometry",), _temperature),
+    "materials": (("steel", "wheel"), ("temperature",), _materials),
+    "loads": (("alpha_n", "T1", "ratio", "mu", "KA", "KV", "KHb", "KHb_auto", "KFb", "b", "mn",
+               "n_slices", "fHb", "crown"),
+              ("geometry", "materials"), _loads),
+    "phase": (("steps", "z1", "load_sharing", "tip_relief", "KA", "KV", "b", "dtype"),
+              ("geometry", "materials", "loads"), _phase),
+    "safety": (("n1", "life_h", "ratio", "wheel"), ("phase",), _safety),
+    "damage": (("n1", "life_h", "z1", "mean_stress", "wheel"), ("phase",), _damage),
+    "life": (("n1", "life_h", "ratio", "z1", "mean_stress", "SF_target", "wheel"), ("phase",),
+             _life),
+    "slices": (("b", "mn", "n_slices", "KA", "KV", "z1", "fHb", "crown", "dtype"),
+               ("materials", "loads", "phase"), _slices),
+    "collective": (None, (), _collective),
+}
+
+
+def _same(a, b):
+    """Source values equal (NaN equals NaN; dicts compared per key)."""
+    if a is b:
+        return True
+    if isinstance(a, dict) or isinstance(b, dict):
+        return (isinstance(a, dict) and isinstance(b, dict) and a.keys() == b.keys()
+                and all(_same(a[k], b[k]) for k in a))
+    if a is None or b is None:
+        return False
+    try:
+        return bool(np.array_equal(a, b, equal_nan=True))
+    except TypeError:
+        return bool(np.array_equal(a, b))
+
+
+class ModelGraph:
+    """
+    Memoized model stages; keeps the outputs of the last run.
+
+    One graph serves one caller (the GUI, a sweep); runs are serialized
+    by a lock.  Reuse pays off when consecutive runs share sources, e.g.
+    the GUI recomputing after one input changed, or the equal-sized
+    chunks of a sweep over a few inputs.
+    """
+
+    def __init__(self, stages=STAGES):
+        self.stages = stages
+        self._keys = {}
+        self._out = {}
+        self._lock = threading.Lock()
+        self.stats = {"reused": 0, "computed": 0, "stages": ()}
+        self.totals = {"reused": 0, "computed": 0}
+
+    def clear(self):
+        """Forget all memoized outputs."""
+        with self._lock:
+            self._keys, self._out = {}, {}
+
+    def evaluate(self, p, steel, wheel, dtype=np.float64, collective=None):
+        """
+        Run the stages on parsed inputs (scalars or stacked arrays).
+
+        Returns
+        -------
+        dict stage name -> output (see ``STAGES``).
+        """
+        dt = resolve_dtype(dtype)
+        src = dict(p, steel=steel, wheel=wheel, dtype=dt, collective=collective)
+        keys = {k: card_hash(v) if k in _CARDS else str(v) if k == "dtype" else v
+                for k, v in src.items()}
+        with self._lock:
+            changed = {k for k, v in keys.items()
+                       if k not in self._keys or not _same(v, self._keys[k])}
+            changed |= self._keys.keys() - keys.keys()
+            done = []
+            try:
+                for name, (inputs, after, func) in self.stages.items():
+                    names = src if inputs is None else inputs
+                    if (name in self._out and not changed.intersection(names)
+                            and not any(a in done for a in after)):
+                        continue
+                    self._out[name] = func({k: src[k] for k in names},
+                                           {a: self._out[a] for a in after})
+                    done.append(name)
+            except Exception:
+                # Some stages may already hold outputs for the new sources
+                self._keys, self._out = {}, {}
+                raise
+            self._keys = keys
+            reused = len(self.stages) - len(done)
+            self.stats = {"reused": reused, "computed": len(done), "stages": tuple(done)}
+            self.totals["reused"] += reused
+            self.totals["computed"] += len(done)
+            return dict(self._out)
+
+    @staticmethod
+    def _design(out):
+        """Stage outputs merged like ``design_terms`` (and the fatigue terms)."""
+        th = out["temperature"]
+        d = {**out["geometry"], **th, **out["materials"], **out["loads"]}
+        return d, {**out["safety"], **out["damage"]}
+
+    def compute(self, inp, steel, wheel, dtype=None):
+        """``compute_worm_cycle`` through the graph (same arguments and result)."""
+        dt = resolve_dtype(dtype if dtype is not None else inp.get("precision"))
+        p = parse_inputs(inp)
+        out = self.evaluate(p, steel, wheel, dt, parse_collective(inp.get("load_collective")))
+        d, f = self._design(out)
+        ph = out["phase"]
+        meta = scalar_meta(p, d, f)
+        res = {"phi": ph["phi"], **ph["curves"], "meta": meta, "life": out["life"],
+               **out["slices"]}
+        meta.update({k: _py_scalar(v) for k, v in life_meta(out["life"]).items()})
+        if out["collective"] is not None:
+            res["collective"] = out["collective"]
+            meta.update({k: _py_scalar(v) for k, v in collective_meta(out["collective"]).items()})
+        return res
+
+    def evaluate_batch(self, p, steel, wheel, dtype=np.float64, collective=None):
+        """``batch.evaluate_batch`` through the graph."""
+        steps = np.unique(p["steps"])
+        if steps.size != 1:
+            # Auto resolution only sets a minimum, so the finest grid serves all
+            if not np.all(p["steps_auto"]):
+                raise ValueError("All designs in a batch must use the same 'steps'.")
+            p = dict(p, steps=np.full_like(p["steps"], steps[-1]))
+        out = self.evaluate(p, steel, wheel, dtype, collective)
+        d, f = self._design(out)
+        ph = out["phase"]
+        n = p["z1"].shape[0]
+        meta = build_meta(p, d, f)
+        meta.update(life_meta(out["life"]))
+        res = {"phi": ph["phi"], **ph["curves"], "life": out["life"]}
+        if out["collective"] is not None:
+            meta.update(collective_meta(out["collective"]))
+            res["collective"] = out["collective"]
+        res["meta"] = {k: np.broadcast_to(np.asarray(v), (n,)).copy() for k, v in meta.items()}
+        return res
+
+    def compute_batch(self, inputs, steel, wheel, dtype=None):
+        """``compute_worm_batch`` through the graph (same arguments and result)."""
+        if dtype is None and inputs:
+            dtype = inputs[0].get("precision")
+        collective = parse_collective(inputs[0].get("load_collective")) if inputs else None
+        return self.evaluate_batch(stack_inputs(inputs), steel, wheel, resolve_dtype(dtype),
+                                   collective)
@@ -0,0 +1,327 @@
+"""
+Design history: every evaluated design in one indexed SQLite table.
+
+Each row holds the parsed inputs and the scalar ``meta`` fields in typed
+columns (INTEGER / REAL / TEXT), the material names and card hashes, the
+source ("gui", "sweep", ...) and the raw string inputs as JSON so a design
+can be loaded back.  Columns are added on first use, so new meta fields
+need no migration.  Parsed inputs whose name is also a meta field (e.g.
+``temp_C``, ``q``) are stored as ``in_<name>``; the meta column holds the
+evaluated value.
+
+Queries are ranges over indexed columns::
+
+    db.query(a_mm=(None, 60), SF_root=(1.3, None), ratio=25, order_by="eta0")
+
+Bulk inserts run in transactions of ``batch`` rows.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+
+from .batch import stack_inputs
+
+
+# Columns indexed on creation; more via ``DesignHistory.create_index``
+DEFAULT_INDEXES = ("a_mm", "SF_root", "SF_contact", "damage_root", "eta0", "ratio", "mn",
+                   "z1", "T1", "n1", "created")
+INSERT_BATCH = 10000
+# Planner statistics are gathered from this many rows on
+ANALYZE_MIN_ROWS = 1000
+# SQLite page cache per connection
+CACHE_KIB = 256 * 1024
+
+_BASE_COLUMNS = (
+    ("id", "INTEGER PRIMARY KEY"),
+    ("created", "REAL"),
+    ("source", "TEXT"),
+    ("steel", "TEXT"),
+    ("wheel", "TEXT"),
+    ("steel_hash", "TEXT"),
+    ("wheel_hash", "TEXT"),
+    ("inputs_json", "TEXT"),
+)
+
+
+def default_path():
+    """``$WORMGEAR_HISTORY`` or ``~/.cache/wormgear/history.sqlite``."""
+    return os.environ.get("WORMGEAR_HISTORY") or os.path.join(
+        os.path.expanduser("~"), ".cache", "wormgear", "history.sqlite")
+
+
+def card_hash(card):
+    """Short content hash of a material card."""
+    blob = json.dumps(card, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _sql_type(arr):
+    kind = arr.dtype.kind
+    if kind in "biu":
+        return "INTEGER"
+    if kind == "f":
+        return "REAL"
+    return "TEXT"
+
+
+def _meta_array(val):
+    """Meta value -> typed array (None -> NaN)."""
+    arr = np.asarray(val)
+    if arr.dtype == object:
+        try:
+            arr = np.array([np.nan if v is None else v for v in arr.ravel()],
+                           dtype=float).reshape(arr.shape)
+        except (TypeError, ValueError):
+            arr = arr.astype(str)
+    return arr
+
+
+def _column_values(arr):
+    """Array -> list of Python values for sqlite (NaN -> NULL)."""
+    if arr.dtype.kind == "f":
+        return np.where(np.isnan(arr), None, arr.astype(object)).tolist()
+    if arr.dtype.kind == "b":
+        return arr.astype(np.int64).tolist()
+    if arr.dtype.kind in "iu":
+        return arr.tolist()
+    return arr.astype(str).tolist()
+
+
+class DesignHistory:
+    """
+    Local design database.
+
+    Parameters
+    ----------
+    path : str, optional
+        SQLite file (default ``default_path()``); ":memory:" for a
+        throw-away database.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Not tied to the opening thread: the GUI explorer loads in a worker
+        # and fetches further columns from the Tk thread (never concurrently)
+        self._db = sqlite3.connect(self.path, timeout=60.0, isolation_level=None,
+                                   check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Room for the index pages touched by bulk inserts
+        self._db.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        cols = ", ".join(f"{name} {decl}" for name, decl in _BASE_COLUMNS)
+        self._db.execute(f"CREATE TABLE IF NOT EXISTS designs ({cols})")
+        self._db.execute("CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value)")
+        self._columns = self._table_columns()
+        self.create_index("created")
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+
+    def _table_columns(self):
+        return {row[1]: row[2] for row in self._db.execute("PRAGMA table_info(designs)")}
+
+    @property
+    def columns(self):
+        """Column name -> SQL type."""
+        return dict(self._columns)
+
+    def _ensure_columns(self, typed):
+        for name, sql_type in typed.items():
+            if name not in self._columns:
+                self._db.execute(f'ALTER TABLE designs ADD COLUMN "{name}" {sql_type}')
+                self._columns[name] = sql_type
+                if name in DEFAULT_INDEXES:
+                    self.create_index(name)
+
+    def create_index(self, column):
+        self._check_column(column)
+        self._db.execute(f'CREATE INDEX IF NOT EXISTS idx_{column} ON designs ("{column}")')
+
+    def _check_column(self, column):
+        if column not in self._columns:
+            raise ValueError(f"Unknown history column {column!r}.")
+
+    # ------------------------------------------------------------------
+    # Inserts
+    # ------------------------------------------------------------------
+    def add_batch(self, inputs, meta, steel, wheel, source="python", parsed=None,
+                  batch=INSERT_BATCH):
+        """
+        Store many evaluated designs.
+
+        Parameters
+        ----------
+        inputs : list of dict
+            String-valued inputs, one per design.
+        meta : dict
+            Meta fields, scalars or (n,) arrays (``compute_worm_batch`` meta).
+        steel, wheel : dict
+            Material cards used for the evaluation.
+        source : str
+            Origin tag ("gui", "sweep", ...).
+        parsed : dict, optional
+            ``stack_inputs(inputs)`` when the caller already has it.
+        batch : int
+            Rows per transaction.
+
+        Returns
+        -------
+        Number of rows written.
+        """
+        n = len(inputs)
+        if n == 0:
+            return 0
+        data = {}
+        for key, val in meta.items():
+            if isinstance(val, (dict, list, tuple)):
+                continue
+            arr = _meta_array(val)
+            if arr.ndim > 1 or (arr.ndim == 1 and arr.shape[0] != n):
+                continue
+            data[key] = np.broadcast_to(arr, (n,))
+        for key, arr in (stack_inputs(inputs) if parsed is None else parsed).items():
+            data[key if key not in data else "in_" + key] = arr
+
+        typed = {k: _sql_type(v) for k, v in data.items()}
+        self._ensure_columns(typed)
+
+        now = time.time()
+        fixed = {
+            "created": [now] * n, "source": [source] * n,
+            "steel": [steel.get("name", "")] * n, "wheel": [wheel.get("name", "")] * n,
+            "steel_hash": [card_hash(steel)] * n, "wheel_hash": [card_hash(wheel)] * n,
+            "inputs_json": [json.dumps(dict(inp), ensure_ascii=False) for inp in inputs],
+        }
+        names = list(fixed) + list(data)
+        values = list(fixed.values()) + [_column_values(data[k]) for k in data]
+        cols = ", ".join(f'"{c}"' for c in names)
+        sql = f"INSERT INTO designs ({cols}) VALUES ({', '.join('?' * len(names))})"
+        rows = list(zip(*values))
+        for start in range(0, n, batch):
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(sql, rows[start:start + batch])
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        self._maybe_analyze()
+        return n
+
+    def _maybe_analyze(self):
+        """Refresh planner statistics whenever the table has doubled.
+
+        Without them SQLite picks the first equality index (often an
+        unselective one such as ``ratio``) over a selective range index.
+        """
+        row = self._db.execute("SELECT value FROM info WHERE name='analyzed_rows'").fetchone()
+        done = row[0] if row else 0
+        total = len(self)
+        if total >= ANALYZE_MIN_ROWS and total >= 2 * done:
+            self._db.execute("ANALYZE")
+            self._db.execute("INSERT OR REPLACE INTO info VALUES ('analyzed_rows', ?)", (total,))
+
+    def add(self, inp, meta, steel, wheel, source="python"):
+        """Store one design (``compute_worm_cycle`` meta); returns its id."""
+        self.add_batch([inp], meta, steel, wheel, source=source)
+        return self._db.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def query(self, columns=None, order_by=None, descending=False, limit=1000,
+              source=None, **ranges):
+        """
+        Range / equality query.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            Columns to return (default: all).
+        order_by : str, optional
+            Sort column.
+        descending : bool
+            Sort descending.
+        limit : int or None
+            Row limit.
+        source : str, optional
+            Only rows with this source tag.
+        **ranges
+            column=value for equality, column=(low, high) for an inclusive
+            range with None as an open end.
+
+        Returns
+        -------
+        dict of column -> numpy array (object arrays for TEXT columns).
+        """
+        cols = list(columns) if columns else list(self._columns)
+        for c in cols:
+            self._check_column(c)
+        where, args = self._where(source, ranges)
+        names = ", ".join(f'"{c}"' for c in cols)
+        sql = f"SELECT {names} FROM designs{where}"
+        if order_by:
+            self._check_column(order_by)
+            sql += f' ORDER BY "{order_by}"' + (" DESC" if descending else "")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._db.execute(sql, args).fetchall()
+        out = {}
+        for j, c in enumerate(cols):
+            vals = [r[j] for r in rows]
+            if self._columns[c] == "TEXT":
+                out[c] = np.array(vals, dtype=object)
+            elif self._columns[c] == "INTEGER" and None not in vals:
+                out[c] = np.array(vals, dtype=np.int64)
+            else:
+                out[c] = np.array([np.nan if v is None else v for v in vals], dtype=float)
+        return out
+
+    def count(self, source=None, **ranges):
+        """Number of rows matching ``ranges`` (see ``query``)."""
+        where, args = self._where(source, ranges)
+        return self._db.execute(f"SELECT COUNT(*) FROM designs{where}", args).fetchone()[0]
+
+    def _where(self, source, ranges):
+        """WHERE clause and arguments for ``query`` / ``count``."""
+        where, args = [], []
+        if source is not None:
+            where.append("source = ?")
+            args.append(source)
+        for col, cond in ranges.items():
+            self._check_column(col)
+            if isinstance(cond, (tuple, list)):
+                lo, hi = (v.item() if isinstance(v, np.generic) else v for v in cond)
+                if lo is not None:
+                    where.append(f'"{col}" >= ?')
+                    args.append(lo)
+                if hi is not None:
+                    where.append(f'"{col}" <= ?')
+                    args.append(hi)
+            else:
+                where.append(f'"{col}" = ?')
+                args.append(cond.item() if isinstance(cond, np.generic) else cond)
+        return (" WHERE " + " AND ".join(where) if where else ""), args
+
+    def inputs(self, design_id):
+        """String inputs of a stored design."""
+        row = self._db.execute("SELECT inputs_json FROM designs WHERE id = ?",
+                               (int(design_id),)).fetchone()
+        if row is None:
+            raise KeyError(design_id)
+        return json.loads(row[0])
@@ -0,0 +1,167 @@
+"""
+Load sharing between simultaneously engaged wheel teeth.
+
+Along the path of contact (measured in base pitches, 0 <= s < eps) tooth
+k of the mesh sits at s_k = u + k, where u = frac(z1 * phi / 2pi) is the
+mesh position.  Each engaged tooth is a tooth-bending spring (softer near
+the tip and root) in series with a contact spring; neighbouring teeth
+share a small rim compliance.  With the common approach delta the loads
+F_k solve the bordered compatibility system
+
+    C F - delta 1 = -e(s),    sum(F) = F_total
+
+where e is the tip-relief gap.  The pattern repeats every pitch, so the
+system is only built for the distinct mesh positions of a phase grid
+(resolved to 2**-20 of a pitch) and its stacked inverse is cached; the
+loads for any total force are one batched matrix-vector product.  Large
+position sets are inverted in slices without caching, with the same
+arithmetic per position, so the loads at a position do not depend on
+which other positions are evaluated with it (a streamed sweep matches
+the in-memory one).  Teeth that would pull are dropped and those
+positions re-solved.
+"""
+
+import math
+import numpy as np
+
+
+# Single-tooth stiffness per unit face width for steel, N/(mm*um), and the
+# reference moduli the stiffness constants refer to (GPa).
+C_TOOTH_STEEL = 14.0
+C_CONTACT_STEEL = 40.0
+E_STEEL = 206.0
+EPRIME_STEEL = 230.0
+# Rim coupling of neighbouring teeth, as a share of the mean compliance
+RIM_COUPLING = 0.1
+# Length of the tip relief at either end of the path, in pitches
+RELIEF_LENGTH = 0.25
+
+# Mesh positions per pitch
+POSITION_BITS = 20
+
+_INV_CACHE = {}
+# Position sets larger than this are inverted in slices, without caching
+_CACHE_MAX_POSITIONS = 1 << 16
+
+
+def contact_ratio(d2, da2, mn, alpha_n):
+    """Mid-plane contact ratio of the wheel against the worm (rack) profile.
+
+    Works elementwise on design arrays; clamped to >= 1.
+    """
+    r2 = 0.5 * np.asarray(d2, dtype=float)
+    ra2 = 0.5 * np.asarray(da2, dtype=float)
+    rb2 = r2 * np.cos(alpha_n)
+    approach = np.sqrt(np.maximum(ra2 ** 2 - rb2 ** 2, 0.0)) - r2 * np.sin(alpha_n)
+    recess = mn / np.sin(alpha_n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps = (approach + recess) / (math.pi * mn * np.cos(alpha_n))
+    return np.maximum(np.nan_to_num(eps, nan=1.0), 1.0)
+
+
+class LoadSharingModel:
+    """Compatibility system of one mesh (stiffnesses and relief fixed)."""
+
+    def __init__(self, eps, b_mm, E2_GPa, Eprime_GPa, relief_um):
+        self.eps = max(float(eps), 1.0)
+        self.M = int(math.ceil(self.eps))
+        b = max(float(b_mm), 1e-9)
+        self.k_tooth = C_TOOTH_STEEL * b * float(E2_GPa) / E_STEEL          # N/um
+        self.k_contact = C_CONTACT_STEEL * b * float(Eprime_GPa) / EPRIME_STEEL
+        self.relief = float(relief_um)
+        # Exact constants: a cached inverse must equal the one this model builds
+        self.key = np.array([self.eps, self.k_tooth, self.k_contact, self.relief]).tobytes()
+
+    def positions(self, u):
+        """Path positions of the M tooth slots, (n, M), and their engagement."""
+        s = u[:, None] + np.arange(self.M)[None, :]
+        return s, s < self.eps
+
+    def gaps(self, s):
+        """Tip-relief gap (um) at path positions ``s``."""
+        lr = RELIEF_LENGTH
+        entry = np.maximum(lr - s, 0.0) / lr
+        exit_ = np.maximum(s - (self.eps - lr), 0.0) / lr
+        return self.relief * (entry ** 2 + exit_ ** 2)
+
+    def system(self, s, engaged):
+        """Stacked bordered matrices A (n, M+1, M+1) and gap vectors (n, M)."""
+        n, M = s.shape
+        shape = 0.6 + 0.4 * np.sin(np.pi * np.clip(s / self.eps, 0.0, 1.0))
+        comp = 1.0 / (self.k_tooth * shape) + 1.0 / self.k_contact          # um/N
+        comp = np.where(engaged, comp, 1.0)
+
+        A = np.zeros((n, M + 1, M + 1))
+        diag = np.arange(M)
+        A[:, diag, diag] = comp
+        if M > 1:
+            both = engaged[:, 1:] & engaged[:, :-1]
+            rim = RIM_COUPLING * 0.5 * (comp[:, 1:] + comp[:, :-1]) * both
+            A[:, diag[:-1], diag[1:]] = rim
+            A[:, diag[1:], diag[:-1]] = rim
+        A[:, :M, M] = -engaged.astype(float)
+        A[:, M, :M] = engaged
+        e = np.where(engaged, self.gaps(s), 0.0)
+        return A, e
+
+    def _inverse(self, u):
+        s, engaged = self.positions(u)
+        A, e = self.system(s, engaged)
+        return np.linalg.inv(A), e
+
+    def inverse(self, u):
+        """Cached stacked inverse of the system at mesh positions ``u``."""
+        key = (self.key, u.tobytes())
+        hit = _INV_CACHE.get(key)
+        if hit is None:
+            if len(_INV_CACHE) > 64:
+                _INV_CACHE.clear()
+            hit = _INV_CACHE[key] = self._inverse(u)
+        return hit
+
+    def _solve(self, s, engaged, F):
+        A, e = self.system(s, engaged)
+        rhs = np.concatenate([-e, np.full((s.shape[0], 1), F)], axis=1)
+        x = np.linalg.solve(A, rhs[..., None])[..., 0][:, :self.M]
+        return np.where(engaged, x, 0.0)
+
+    def loads(self, u, F):
+        """Per-tooth loads (n, M) at unique mesh positions ``u``."""
+        M = self.M
+        n = _CACHE_MAX_POSITIONS
+        x = np.empty((u.size, M))
+        for i in range(0, u.size, n):
+            # One-off position sets (long sweeps): same inverse, in slices
+            Ainv, e = self.inverse(u) if u.size <= n else self._inverse(u[i:i + n])
+            # Row-wise sum keeps each position's arithmetic independent of the set
+            x[i:i + n] = F * Ainv[:, :M, M] - (Ainv[:, :M, :M] * e[:, None, :]).sum(axis=-1)
+
+        # Drop teeth that would carry tension and re-solve those positions
+        bad = np.flatnonzero((x < 0).any(axis=1))
+        if bad.size:
+            s, engaged = self.positions(u[bad])
+            for _ in range(M):
+                engaged &= x[bad] > 0
+                x[bad] = self._solve(s, engaged, F)
+                if not (x[bad] < 0).any():
+                    break
+        return np.maximum(x, 0.0)
+
+
+def tooth_loads(phi, z1, eps, b_mm, E2_GPa, Eprime_GPa, relief_um, F_N):
+    """
+    Per-tooth loads over a phase grid.
+
+    Returns dict with loads (steps, M) in N, share_max (steps,) = largest
+    tooth load / F and n_eff (steps,) = F / largest tooth load (effective
+    number of teeth carrying the load).
+    """
+    model = LoadSharingModel(eps, b_mm, E2_GPa, Eprime_GPa, relief_um)
+    F = max(float(F_N), 1e-9)
+    scale = float(1 << POSITION_BITS)
+    u = np.asarray(phi, dtype=np.float64) * (int(z1) / (2 * np.pi))
+    q = np.mod(np.rint(u * scale).astype(np.int64), 1 << POSITION_BITS)
+    uniq, inv = np.unique(q, return_inverse=True)
+    loads = model.loads(uniq / scale, F)[inv.ravel()]
+    share = loads.max(axis=1) / F
+    return {"loads": loads, "share_max": share, "n_eff": 1.0 / share}
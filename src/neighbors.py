@@ -0,0 +1,217 @@
+"""
+Nearest stored designs: a k-d tree over normalized input vectors.
+
+``DesignIndex`` maps designs (parsed inputs, see ``NEIGHBOR_INPUTS``) to
+points: scale inputs (torque, speed, module, face width, life) in log
+space, every coordinate divided by its spread in the first batch indexed,
+so one unit is "one typical step" along any input.  k-nearest-neighbour
+queries descend a ``KDTree`` (median splits on the widest dimension,
+leaves of ``LEAF_SIZE`` points scanned with numpy) in O(log n) node
+visits.
+
+Appended designs go to a small buffer that queries scan exhaustively;
+once it exceeds ``REBUILD_SHARE`` of the tree the tree is rebuilt over
+everything, so appends stay cheap and queries logarithmic.
+
+Uses: "similar designs" in the GUI, thermal warm starts (temperature of
+the nearest stored design as ``T_init_C``) and optimizer seeds
+(``run_optimization(..., seeds=...)``).
+"""
+
+import heapq
+import numpy as np
+
+from .history import card_hash
+from .worm_model import parse_inputs
+
+
+NEIGHBOR_INPUTS = ("T1", "n1", "mn", "z1", "z2", "beta_deg_in", "x1", "x2", "b", "mu",
+                   "temp_C", "life_h", "alpha_n")
+_LOG_INPUTS = ("T1", "n1", "mn", "b", "life_h")
+LEAF_SIZE = 32
+REBUILD_SHARE = 0.1
+REBUILD_MIN = 1024
+
+
+class KDTree:
+    """
+    Static k-d tree over the rows of ``points`` (n, d).
+
+    Nodes live in flat arrays: ``start``/``stop`` index the permuted row
+    order, inner nodes hold a split dimension and value plus two children.
+    """
+
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype=float)
+        n = self.points.shape[0]
+        self.order = np.arange(n)
+        self.leaf_size = max(int(leaf_size), 1)
+        self.start, self.stop, self.dim, self.split, self.left, self.right = ([] for _ in range(6))
+        if n:
+            self._build(0, n)
+
+    def _node(self, start, stop):
+        for arr, val in ((self.start, start), (self.stop, stop), (self.dim, -1),
+                         (self.split, 0.0), (self.left, -1), (self.right, -1)):
+            arr.append(val)
+        return len(self.start) - 1
+
+    def _build(self, start, stop):
+        node = self._node(start, stop)
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            a, b = self.start[node], self.stop[node]
+            if b - a <= self.leaf_size:
+                continue
+            rows = self.order[a:b]
+            pts = self.points[rows]
+            spread = pts.max(axis=0) - pts.min(axis=0)
+            dim = int(np.argmax(spread))
+            if spread[dim] <= 0.0:
+                continue                       # all points equal: keep as leaf
+            mid = (b - a) // 2
+            part = np.argpartition(pts[:, dim], mid)
+            self.order[a:b] = rows[part]
+            self.dim[node] = dim
+            self.split[node] = float(self.points[self.order[a + mid], dim])
+            self.left[node] = self._node(a, a + mid)
+            self.right[node] = self._node(a + mid, b)
+            stack.extend((self.left[node], self.right[node]))
+
+    def __len__(self):
+        return self.points.shape[0]
+
+    def query(self, x, k=1):
+        """(distances, rows) of the k nearest points to x, nearest first."""
+        x = np.asarray(x, dtype=float)
+        k = min(int(k), len(self))
+        if k <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        best = []                              # max-heap of (-d2, row)
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            dim = self.dim[node]
+            if dim < 0:
+                rows = self.order[self.start[node]:self.stop[node]]
+                diff = self.points[rows] - x
+                d2 = np.einsum("ij,ij->i", diff, diff)
+                for dd, r in zip(d2.tolist(), rows.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-dd, r))
+                    elif dd < -best[0][0]:
+                        heapq.heapreplace(best, (-dd, r))
+                continue
+            delta = x[dim] - self.split[node]
+            near, far = (self.left[node], self.right[node]) if delta < 0 else \
+                (self.right[node], self.left[node])
+            # Far side is pushed first so the near side is searched first
+            stack.append((far, max(bound, delta * delta)))
+            stack.append((near, bound))
+        best.sort(reverse=True)
+        return (np.sqrt([-d for d, _ in best]), np.array([r for _, r in best], dtype=np.int64))
+
+
+class DesignIndex:
+    """
+    Appendable k-nearest-neighbour index of designs.
+
+    Parameters
+    ----------
+    inputs : tuple of str
+        Parsed-input names spanning the space.
+    """
+
+    def __init__(self, inputs=NEIGHBOR_INPUTS, leaf_size=LEAF_SIZE):
+        self.inputs = tuple(inputs)
+        self.leaf_size = leaf_size
+        self.scale = None
+        self._points = np.empty((0, len(self.inputs)))
+        self._ids = np.empty(0, dtype=np.int64)
+        self._tree = KDTree(self._points, leaf_size)
+
+    def __len__(self):
+        return self._ids.size
+
+    def _vectors(self, p):
+        cols = [np.atleast_1d(np.asarray(p[k], dtype=float)) for k in self.inputs]
+        n = max(c.size for c in cols)
+        X = np.column_stack([np.broadcast_to(c, (n,)) for c in cols])
+        for j, name in enumerate(self.inputs):
+            if name in _LOG_INPUTS:
+                X[:, j] = np.log(np.maximum(X[:, j], 1e-300))
+        return X
+
+    def add(self, p, ids):
+        """
+        Append designs: parsed inputs ``p`` (scalars or (n,) arrays) and
+        their ids (e.g. design-history ids).
+        """
+        X = self._vectors(p)
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        ok = np.all(np.isfinite(X), axis=1)
+        X, ids = X[ok], ids[ok]
+        if self.scale is None:
+            if not len(X):
+                return
+            # Metric fixed by the first batch so appends do not move points
+            spread = X.std(axis=0)
+            self.scale = np.where(spread > 0, spread, 1.0)
+        self._points = np.vstack([self._points, X / self.scale])
+        self._ids = np.concatenate([self._ids, ids])
+        if len(self) - len(self._tree) > max(REBUILD_MIN, REBUILD_SHARE * len(self._tree)):
+            self._tree = KDTree(self._points, self.leaf_size)
+
+    def query(self, p, k=5, exclude=()):
+        """
+        The ``k`` stored designs nearest to parsed inputs ``p`` (one design).
+
+        Returns
+        -------
+        (ids, distances), nearest first; distances are in spread units.
+        """
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        x = self._vectors(p)[0] / self.scale
+        kk = k + len(exclude)
+        d, rows = self._tree.query(x, kk)
+        # Buffer of appended points not yet in the tree
+        tail = np.arange(len(self._tree), len(self))
+        if tail.size:
+            diff = self._points[tail] - x
+            d = np.concatenate([d, np.sqrt(np.einsum("ij,ij->i", diff, diff))])
+            rows = np.concatenate([rows, tail])
+        keep = ~np.isin(self._ids[rows], np.asarray(exclude, dtype=np.int64))
+        d, rows = d[keep], rows[keep]
+        top = np.argsort(d, kind="stable")[:k]
+        return self._ids[rows[top]], d[top]
+
+    def query_inputs(self, inp, k=5, exclude=()):
+        """``query`` for one string-valued input dict."""
+        return self.query(parse_inputs(inp), k, exclude)
+
+    @classmethod
+    def from_history(cls, db, steel=None, wheel=None, source=None, inputs=NEIGHBOR_INPUTS):
+        """
+        Index stored designs (optionally only those evaluated with these
+        material cards, by card hash).
+        """
+        cols = db.columns
+        names = {k: "in_" + k if "in_" + k in cols else k for k in inputs}
+        ranges = {}
+        if steel is not None:
+            ranges["steel_hash"] = card_hash(steel)
+        if wheel is not None:
+            ranges["wheel_hash"] = card_hash(wheel)
+        index = cls(inputs)
+        if any(c not in cols for c in names.values()):
+            return index
+        data = db.query(columns=["id"] + list(names.values()), order_by="id", limit=None,
+                        source=source, **ranges)
+        if data["id"].size:
+            index.add({k: data[c] for k, c in names.items()}, data["id"])
+            index._tree = KDTree(index._points, index.leaf_size)
+        return index
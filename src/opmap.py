@@ -0,0 +1,68 @@
+"""
+Operating maps: efficiency, safety factors, damage and output torque over
+a (T1, n1) load/speed grid.
+
+Geometry is evaluated once; the temperature, material and load stages
+are broadcast over the grid in one pass (materials only vary across the
+grid in thermal mode), and the peak stresses come from the ripple
+extremes (or the tooth load-sharing extremes at the design's own load
+point) instead of per-point phase arrays.
+"""
+
+import numpy as np
+
+from .worm_model import (
+    parse_inputs, geometry, operating_temperature, material_terms, load_terms,
+    fatigue_terms, peak_factors, design_terms,
+)
+
+
+MAP_KEYS = ("eta0", "SF_root", "SF_contact", "damage_root", "T2_Nm")
+
+
+def compute_operating_map(inp, steel, wheel, T1_values, n1_values):
+    """
+    Evaluate the model over every (T1, n1) combination.
+
+    Parameters
+    ----------
+    inp : dict
+        String-valued inputs of the design (T1_Nm / n1_rpm are replaced by
+        the grid).
+    steel, wheel : dict
+        Material cards.
+    T1_values, n1_values : array_like
+        Input torque (N*m) and worm speed (rpm) axes.
+
+    Returns
+    -------
+    dict with T1_Nm (nT,), n1_rpm (nn,) and each of MAP_KEYS as an
+    (nT, nn) array, plus temp_C (scalar, or (nT, nn) in thermal mode).
+    """
+    T1 = np.asarray(T1_values, dtype=float)
+    n1 = np.asarray(n1_values, dtype=float)
+    p = parse_inputs(inp)
+    g = geometry(p)
+    d0 = design_terms(p, steel, wheel)
+    if p["KHb_auto"]:
+        # Face load factor from the slice model at the design's own load point
+        p = dict(p, KHb=float(d0["KHb"]))
+    # Peak factors (ripple, or tooth load sharing) at the design's load point
+    s_hi, s_lo, p_hi = peak_factors(p, d0)
+
+    grid = dict(p, T1=T1[:, None], n1=n1[None, :])
+    shape = (T1.size, n1.size)
+    th = operating_temperature(grid, g, wheel)
+    m = material_terms(grid, steel, wheel, temp_C=th["temp_C"])
+    m["mu"] = th["mu"]
+    t = load_terms(grid, g, m)
+
+    f = fatigue_terms(grid, wheel, t["sigma_base"] * s_hi, t["sigma_base"] * s_lo,
+                      t["p_base"] * p_hi)
+
+    out = {"T1_Nm": T1, "n1_rpm": n1, "temp_C": th["temp_C"]}
+    for key, val in (("eta0", t["eta0"]), ("SF_root", f["SF_root"]),
+                     ("SF_contact", f["SF_contact"]), ("damage_root", f["damage_root"]),
+                     ("T2_Nm", t["T2_base"])):
+        out[key] = np.broadcast_to(val, shape)
+    return out
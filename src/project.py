@@ -0,0 +1,188 @@
+"""
+Session project files (*.wgp).
+
+A project is a ZIP container with two members:
+
+- ``project.json``: inputs, both material cards, the S-N table rows and the
+  scalar result meta, plus a directory of the stored arrays.
+- ``results.bin``: every result array packed back to back in one stored
+  (uncompressed) binary block.
+
+Opening a project only parses ``project.json``; the binary block is read
+when the arrays are first requested, so inputs show up immediately even
+for projects holding large sweeps.
+"""
+
+import json
+import os
+import zipfile
+import numpy as np
+
+
+PROJECT_FORMAT = "wormgear-project"
+PROJECT_VERSION = 1
+
+_HEADER = "project.json"
+_BLOCK = "results.bin"
+_ALIGN = 64
+
+
+def _json_default(v):
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    raise TypeError(f"Not JSON serializable: {type(v).__name__}")
+
+
+def _pack_arrays(arrays):
+    """Pack arrays into one aligned byte block and its directory."""
+    directory = {}
+    chunks = []
+    offset = 0
+    for name, arr in arrays.items():
+        shape = np.shape(arr)
+        arr = np.ascontiguousarray(arr)     # (0-d arrays come back as (1,))
+        pad = (-offset) % _ALIGN
+        if pad:
+            chunks.append(b"\0" * pad)
+            offset += pad
+        directory[name] = {"dtype": arr.dtype.str, "shape": list(shape), "offset": offset}
+        chunks.append(arr.tobytes())
+        offset += arr.nbytes
+    return directory, chunks
+
+
+def _flatten(res, prefix=""):
+    """Split a result dict into arrays ("a/b" paths for nested dicts) and the JSON rest."""
+    arrays, rest = {}, {}
+    for key, val in res.items():
+        if isinstance(val, np.ndarray):
+            arrays[prefix + key] = val
+        elif isinstance(val, dict):
+            sub_arrays, sub_rest = _flatten(val, prefix + key + "/")
+            arrays.update(sub_arrays)
+            rest[key] = sub_rest
+        else:
+            rest[key] = val
+    return arrays, rest
+
+
+def _copy_tree(d):
+    return {k: _copy_tree(v) if isinstance(v, dict) else v for k, v in d.items()}
+
+
+def save_project(path, inputs, steel, wheel, res=None, sn_rows=None, extra=None):
+    """
+    Write a project file.
+
+    Parameters
+    ----------
+    path : str
+        Target ``.wgp`` path (written atomically).
+    inputs : dict
+        String-valued model inputs.
+    steel, wheel : dict
+        Worm / wheel material cards as currently edited.
+    res : dict, optional
+        Result dict; ndarray values (also inside nested dicts such as
+        ``life`` or ``collective``) go to the binary block, ``meta`` and
+        other JSON-compatible values to the header.
+    sn_rows : list of dict, optional
+        S-N table rows as shown in the material tab.
+    extra : dict, optional
+        Further JSON-compatible session state (e.g. material selections).
+    """
+    arrays, res_json = _flatten(res or {})
+    directory, chunks = _pack_arrays(arrays)
+
+    header = {
+        "format": PROJECT_FORMAT,
+        "version": PROJECT_VERSION,
+        "inputs": dict(inputs),
+        "steel": steel,
+        "wheel": wheel,
+        "sn_rows": sn_rows or [],
+        "extra": extra or {},
+        "has_results": res is not None,
+        "results": res_json,
+        "arrays": directory,
+    }
+
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w") as zf:
+        zf.writestr(_HEADER, json.dumps(header, ensure_ascii=False, default=_json_default),
+                    compress_type=zipfile.ZIP_DEFLATED)
+        with zf.open(_BLOCK, "w", force_zip64=True) as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+    os.replace(tmp, path)
+
+
+class Project:
+    """An opened project; result arrays are loaded on first access."""
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = header
+        self._res = None
+
+    @property
+    def inputs(self):
+        return self.header["inputs"]
+
+    @property
+    def steel(self):
+        return self.header["steel"]
+
+    @property
+    def wheel(self):
+        return self.header["wheel"]
+
+    @property
+    def sn_rows(self):
+        return self.header.get("sn_rows", [])
+
+    @property
+    def extra(self):
+        return self.header.get("extra", {})
+
+    @property
+    def has_results(self):
+        return bool(self.header.get("has_results"))
+
+    @property
+    def results_loaded(self):
+        return self._res is not None
+
+    def load_results(self):
+        """Read the binary block and return the result dict (cached)."""
+        if not self.has_results:
+            return None
+        if self._res is None:
+            with zipfile.ZipFile(self.path, "r") as zf:
+                block = zf.read(_BLOCK)
+            res = _copy_tree(self.header.get("results", {}))
+            for name, info in self.header.get("arrays", {}).items():
+                dt = np.dtype(info["dtype"])
+                count = int(np.prod(info["shape"], dtype=np.int64))
+                arr = np.frombuffer(block, dtype=dt, count=count, offset=info["offset"])
+                node = res
+                *parents, leaf = name.split("/")
+                for part in parents:
+                    node = node.setdefault(part, {})
+                node[leaf] = arr.reshape(info["shape"])
+            self._res = res
+        return self._res
+
+
+def open_project(path):
+    """Open a project file, reading only its JSON header."""
+    with zipfile.ZipFile(path, "r") as zf:
+        header = json.loads(zf.read(_HEADER).decode("utf-8"))
+    if header.get("format") != PROJECT_FORMAT:
+        raise ValueError(f"Not a worm gear project file: {path}")
+    if header.get("version", 0) > PROJECT_VERSION:
+        raise ValueError(f"Project file version {header['version']} is newer than supported "
+                         f"({PROJECT_VERSION}).")
+    return Project(path, header)
@@ -0,0 +1,113 @@
+"""
+Structured-array (record) view of results.
+
+``to_records(res)`` packs the phase curves into one structured array
+(fields ``phi`` + ``CURVE_KEYS``; shape (steps,) for a single design,
+(designs, steps) for a batch) and the meta fields into another (shape
+(designs,); one row for a single design).  Every field of a record array
+is a view, so pandas or other columnar tools can wrap it without copying
+(``to_dataframe``); ``from_records`` restores the dict shape the GUI and
+exporters use.  Other result entries (slices, collective) pass through.
+"""
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from .worm_model import CURVE_KEYS
+
+
+CURVE_FIELDS = ("phi",) + CURVE_KEYS
+
+
+def curve_dtype(dtype=np.float64):
+    """Record dtype of the phase curves."""
+    return np.dtype([(name, dtype) for name in CURVE_FIELDS])
+
+
+def _meta_column(val, n):
+    """Meta value -> (n,) typed column (None -> NaN)."""
+    arr = np.asarray(val)
+    if arr.dtype == object:
+        try:
+            arr = np.array([np.nan if v is None else v for v in arr.ravel()],
+                           dtype=float).reshape(arr.shape)
+        except (TypeError, ValueError):
+            arr = arr.astype(str)
+    return np.broadcast_to(arr, (n,))
+
+
+def meta_to_records(meta):
+    """Meta dict (scalars or (n,) arrays) -> structured array (n,)."""
+    n = max((np.shape(v)[0] for v in meta.values() if np.ndim(v) == 1), default=1)
+    cols = {k: _meta_column(v, n) for k, v in meta.items() if np.ndim(v) <= 1}
+    rec = np.empty(n, dtype=[(k, c.dtype) for k, c in cols.items()])
+    for k, c in cols.items():
+        rec[k] = c
+    return rec
+
+
+def records_to_meta(rec, scalar=None):
+    """
+    Structured meta array -> dict.
+
+    ``scalar`` (default: one row) returns Python scalars with NaN as None,
+    the shape of ``compute_worm_cycle`` meta; otherwise (n,) field views.
+    """
+    if scalar is None:
+        scalar = rec.shape == (1,)
+    if not scalar:
+        return {k: rec[k] for k in rec.dtype.names}
+    out = {}
+    for k in rec.dtype.names:
+        v = rec[k][0].item()
+        out[k] = None if isinstance(v, float) and v != v else v
+    return out
+
+
+def curves_to_records(res):
+    """Phase curves of a result -> structured array (.., steps)."""
+    shape = np.shape(res[CURVE_KEYS[0]])
+    rec = np.empty(shape, dtype=curve_dtype(np.result_type(*(res[k] for k in CURVE_FIELDS))))
+    for name in CURVE_FIELDS:
+        rec[name] = res[name]
+    return rec
+
+
+def records_to_curves(rec):
+    """Structured curves -> {"phi": (steps,), curve: (.., steps)} views."""
+    phi = rec["phi"]
+    return {"phi": phi if phi.ndim == 1 else phi[0], **{name: rec[name] for name in CURVE_KEYS}}
+
+
+def to_records(res):
+    """Result dict -> {"curves": record array, "meta": record array, ...rest}."""
+    out = {k: v for k, v in res.items() if k not in CURVE_FIELDS and k != "meta"}
+    out["curves"] = curves_to_records(res)
+    out["meta"] = meta_to_records(res["meta"])
+    return out
+
+
+def from_records(rec_res, scalar_meta=None):
+    """Inverse of ``to_records``: the plain result dict."""
+    out = records_to_curves(rec_res["curves"])
+    out.update({k: v for k, v in rec_res.items() if k not in ("curves", "meta")})
+    out["meta"] = records_to_meta(rec_res["meta"], scalar_meta)
+    return out
+
+
+def to_dataframe(rec):
+    """
+    pandas DataFrame over a 1-D record array, one column per field.
+
+    Columns wrap the field views (``copy=False``), so no data is copied;
+    pass ``rec.reshape(-1)`` for batch curves.
+    """
+    if pd is None:
+        raise ImportError("pandas is required for to_dataframe.")
+    if rec.ndim != 1:
+        raise ValueError("to_dataframe needs a 1-D record array (use rec.reshape(-1)).")
+    return pd.DataFrame({k: rec[k] for k in rec.dtype.names}, copy=False)
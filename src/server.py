@@ -0,0 +1,429 @@
+"""
+Local JSON-RPC calculation server.
+
+    python -m src.server --port 8765 --workers 4
+
+Workers stay warm: numpy and the model are imported once and every card
+under ``materials/metals`` and ``materials/polymers`` is loaded at start
+(process workers load them in their initializer).  Requests are JSON-RPC
+2.0 over HTTP POST (``/rpc``), single calls or batch arrays:
+
+- ``compute``  {inputs, steel, wheel, dtype?, curves?}: one design
+  (``compute_worm_cycle`` schema).
+- ``batch``    {inputs: [...], steel, wheel, dtype?, curves?}: many
+  designs in one vectorized pass (meta as columns).
+- ``materials``: preloaded card file names; ``metrics``: latency and
+  queue statistics; ``ping``.
+
+``steel`` / ``wheel`` are preloaded file names (e.g. "37CrS4.json") or
+inline cards.  With ``Accept: application/octet-stream`` a single call
+returns the result as binary columns (``cache.encode_result`` layout:
+length-prefixed JSON header + packed arrays, decode with
+``cache.decode_result``).  In JSON results NaN is null and +/-inf the
+strings "inf" / "-inf" (``ServerClient`` turns them back into floats).  At most ``workers`` calls run at once and
+``max_queue`` more wait; further calls are rejected with error -32001
+(HTTP 503).  ``ServerClient`` is a stdlib client for local tools.
+"""
+
+import argparse
+import collections
+import concurrent.futures as cf
+import glob
+import json
+import math
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+from .batch import compute_worm_batch
+from .cache import decode_result, encode_result
+from .utils import load_json
+from .worm_model import compute_worm_cycle
+
+
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE = 64
+REQUEST_TIMEOUT_S = 300.0
+# Latencies kept per method for the percentiles
+LATENCY_WINDOW = 2048
+
+BINARY_TYPE = "application/octet-stream"
+_MATERIAL_DIRS = ("metals", "polymers")
+_MATERIALS = {}
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_BUSY = -32001
+MODEL_ERROR = -32002
+
+
+def load_materials(root=None):
+    """Preload every material card: file name -> card."""
+    root = root or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "materials")
+    cards = {}
+    for sub in _MATERIAL_DIRS:
+        for path in sorted(glob.glob(os.path.join(root, sub, "*.json"))):
+            cards[os.path.basename(path)] = load_json(path)
+    _MATERIALS.clear()
+    _MATERIALS.update(cards)
+    return cards
+
+
+def _card(ref):
+    if isinstance(ref, dict):
+        return ref
+    if ref not in _MATERIALS:
+        raise KeyError(f"Unknown material {ref!r}.")
+    return _MATERIALS[ref]
+
+
+def _run(method, params):
+    """Evaluate one call (module level so process workers can run it)."""
+    steel, wheel = _card(params["steel"]), _card(params["wheel"])
+    dtype = params.get("dtype")
+    if method == "compute":
+        res = compute_worm_cycle(params["inputs"], steel, wheel, dtype=dtype)
+    else:
+        res = compute_worm_batch(params["inputs"], steel, wheel, dtype=dtype)
+    if not params.get("curves", True):
+        res = {"meta": res["meta"]}
+    return res
+
+
+def _jsonable(v):
+    """Result values -> JSON (arrays as lists, NaN -> null, +/-inf -> "inf" / "-inf")."""
+    if isinstance(v, dict):
+        return {k: _jsonable(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_jsonable(x) for x in v]
+    if isinstance(v, np.ndarray):
+        if v.dtype.kind == "f":
+            out = v.astype(object)
+            out[np.isnan(v)] = None
+            out[np.isposinf(v)] = "inf"
+            out[np.isneginf(v)] = "-inf"
+            return out.tolist()
+        return v.tolist()
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float) and not math.isfinite(v):
+        return None if math.isnan(v) else "inf" if v > 0 else "-inf"
+    return v
+
+
+def _unjson(v):
+    """Undo the infinity encoding of ``_jsonable`` ("inf" / "-inf" -> float)."""
+    if isinstance(v, dict):
+        return {k: _unjson(x) for k, x in v.items()}
+    if isinstance(v, list):
+        return [_unjson(x) for x in v]
+    if isinstance(v, str) and v in ("inf", "-inf"):
+        return float(v)
+    return v
+
+
+class _Metrics:
+    """Per-method counters and a rolling latency window."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.calls = collections.Counter()
+        self.errors = collections.Counter()
+        self.rejected = 0
+        self.latency = collections.defaultdict(lambda: collections.deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, method, seconds, ok):
+        with self.lock:
+            self.calls[method] += 1
+            if not ok:
+                self.errors[method] += 1
+            self.latency[method].append(seconds)
+
+    def reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def snapshot(self, in_flight, queued):
+        with self.lock:
+            methods = {}
+            for name, lat in self.latency.items():
+                ms = np.array(lat) * 1000.0
+                methods[name] = {
+                    "calls": self.calls[name], "errors": self.errors[name],
+                    "p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95)),
+                    "p99_ms": float(np.percentile(ms, 99)), "max_ms": float(ms.max()),
+                }
+            return {"uptime_s": time.time() - self.started, "in_flight": in_flight,
+                    "queued": queued, "rejected": self.rejected, "methods": methods}
+
+
+class CalcServer:
+    """
+    Warm calculation service behind a threaded HTTP server.
+
+    Parameters
+    ----------
+    host, port : str, int
+        Bind address (port 0 picks a free port).
+    workers : int
+        Concurrent evaluations.
+    kind : str
+        "thread" (default) or "process" workers.
+    max_queue : int
+        Calls allowed to wait for a worker before new ones are rejected.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, workers=None, kind="thread",
+                 max_queue=DEFAULT_QUEUE):
+        self.workers = int(workers or os.cpu_count() or 1)
+        self.max_queue = int(max_queue)
+        load_materials()
+        if kind == "process":
+            self.pool = cf.ProcessPoolExecutor(max_workers=self.workers, initializer=load_materials)
+        elif kind == "thread":
+            self.pool = cf.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="calc")
+        else:
+            raise ValueError(f"Unknown worker kind {kind!r} (thread or process).")
+        self.metrics = _Metrics()
+        self._outstanding = 0
+        self._lock = threading.Lock()
+        handler = type("Handler", (_Handler,), {"service": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/rpc"
+
+    def start(self):
+        """Serve in a background thread (returns self)."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    def _submit(self, method, params):
+        with self._lock:
+            busy = self._outstanding >= self.workers + self.max_queue
+            if not busy:
+                self._outstanding += 1
+        if busy:
+            self.metrics.reject()
+            raise _RpcError(SERVER_BUSY, "Server busy: request queue is full.")
+        try:
+            fut = self.pool.submit(_run, method, params)
+        except BaseException:
+            self._release()
+            raise
+        fut.add_done_callback(lambda _f: self._release())
+        return fut
+
+    def _release(self):
+        with self._lock:
+            self._outstanding -= 1
+
+    def _status(self):
+        with self._lock:
+            out = self._outstanding
+        return min(out, self.workers), max(out - self.workers, 0)
+
+    def call(self, method, params):
+        """Run one method; returns the raw (numpy) result or raises _RpcError."""
+        if method == "ping":
+            return "pong"
+        if method == "materials":
+            return sorted(_MATERIALS)
+        if method == "metrics":
+            return self.metrics.snapshot(*self._status())
+        if method not in ("compute", "batch"):
+            raise _RpcError(METHOD_NOT_FOUND, f"Unknown method {method!r}.")
+        if not isinstance(params, dict) or not {"inputs", "steel", "wheel"} <= params.keys():
+            raise _RpcError(INVALID_PARAMS, "compute/batch need inputs, steel and wheel.")
+        if method == "batch" and not isinstance(params["inputs"], list):
+            raise _RpcError(INVALID_PARAMS, "batch needs a list of inputs.")
+        for ref in (params["steel"], params["wheel"]):
+            if not isinstance(ref, dict) and ref not in _MATERIALS:
+                raise _RpcError(INVALID_PARAMS, f"Unknown material {ref!r}.")
+
+        t0 = time.perf_counter()
+        fut = self._submit(method, params)
+        try:
+            res = fut.result(timeout=REQUEST_TIMEOUT_S)
+        except cf.TimeoutError:
+            fut.cancel()
+            self.metrics.record(method, time.perf_counter() - t0, False)
+            raise _RpcError(MODEL_ERROR, "Calculation timed out.")
+        except Exception as e:
+            self.metrics.record(method, time.perf_counter() - t0, False)
+            raise _RpcError(MODEL_ERROR, f"{type(e).__name__}: {e}")
+        self.metrics.record(method, time.perf_counter() - t0, True)
+        return res
+
+
+class _RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _error(req_id, code, message):
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, ctype="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        # Health / metrics without a JSON-RPC envelope
+        if self.path.rstrip("/") in ("/metrics", "/health"):
+            body = self.service.call("metrics", {})
+            self._send(200, json.dumps(body).encode("utf-8"))
+        else:
+            self._send(404, b"{}")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            req = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send(200, json.dumps(_error(None, PARSE_ERROR, str(e))).encode("utf-8"))
+            return
+        binary = BINARY_TYPE in (self.headers.get("Accept") or "")
+
+        if isinstance(req, list):
+            if not req:
+                out = _error(None, INVALID_REQUEST, "Empty batch.")
+            else:
+                # Calls of a batch are queued together and run concurrently
+                with cf.ThreadPoolExecutor(max_workers=min(len(req), 32)) as ex:
+                    out = [r for r in ex.map(self._dispatch, req) if r is not None]
+            self._send(200, json.dumps(out).encode("utf-8"))
+            return
+
+        if binary and isinstance(req, dict):
+            try:
+                res = self.service.call(req.get("method"), req.get("params", {}))
+            except _RpcError as e:
+                status = 503 if e.code == SERVER_BUSY else 200
+                self._send(status, json.dumps(_error(req.get("id"), e.code, str(e))).encode("utf-8"))
+                return
+            self._send(200, encode_result(res if isinstance(res, dict) else {"value": res}),
+                       BINARY_TYPE)
+            return
+
+        out = self._dispatch(req)
+        busy = out is not None and out.get("error", {}).get("code") == SERVER_BUSY
+        self._send(503 if busy else 200, json.dumps(out).encode("utf-8"))
+
+    def _dispatch(self, req):
+        if not isinstance(req, dict) or req.get("jsonrpc") != "2.0" or "method" not in req:
+            return _error(None, INVALID_REQUEST, "Not a JSON-RPC 2.0 request.")
+        req_id = req.get("id")
+        try:
+            res = self.service.call(req["method"], req.get("params", {}))
+        except _RpcError as e:
+            return _error(req_id, e.code, str(e))
+        if "id" not in req:
+            return None                     # notification
+        return {"jsonrpc": "2.0", "id": req_id, "result": _jsonable(res)}
+
+
+class ServerClient:
+    """Minimal stdlib client: ``ServerClient(url).compute(inputs, steel, wheel)``."""
+
+    def __init__(self, url=f"http://127.0.0.1:{DEFAULT_PORT}/rpc", timeout=REQUEST_TIMEOUT_S):
+        self.url = url
+        self.timeout = timeout
+        self._id = 0
+
+    def _post(self, payload, binary=False):
+        data = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if binary:
+            headers["Accept"] = BINARY_TYPE
+        req = urllib.request.Request(self.url, data=data, headers=headers)
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            body = resp.read()
+            if resp.headers.get("Content-Type") == BINARY_TYPE:
+                return decode_result(body)
+        return _unjson(json.loads(body))
+
+    def call(self, method, binary=False, **params):
+        self._id += 1
+        out = self._post({"jsonrpc": "2.0", "id": self._id, "method": method, "params": params},
+                         binary)
+        if isinstance(out, dict) and "error" in out:
+            raise RuntimeError(f"{out['error']['code']}: {out['error']['message']}")
+        return out if binary else out["result"]
+
+    def compute(self, inputs, steel, wheel, binary=False, **kw):
+        return self.call("compute", binary, inputs=inputs, steel=steel, wheel=wheel, **kw)
+
+    def batch(self, inputs, steel, wheel, binary=False, **kw):
+        return self.call("batch", binary, inputs=inputs, steel=steel, wheel=wheel, **kw)
+
+    def calls(self, requests):
+        """JSON-RPC batch: list of (method, params) -> list of responses."""
+        payload = []
+        for method, params in requests:
+            self._id += 1
+            payload.append({"jsonrpc": "2.0", "id": self._id, "method": method, "params": params})
+        return self._post(payload)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Worm gear calculation server (JSON-RPC over HTTP).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--kind", choices=("thread", "process"), default="thread")
+    ap.add_argument("--max-queue", type=int, default=DEFAULT_QUEUE)
+    args = ap.parse_args(argv)
+    srv = CalcServer(args.host, args.port, args.workers, args.kind, args.max_queue)
+    print(f"Serving on {srv.url} ({srv.workers} {args.kind} workers, "
+          f"{len(_MATERIALS)} materials)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Chunked (streaming) evaluation of very long phase sweeps.
+
+``compute_worm_cycle`` holds every curve in memory, which stops working
+around steps ~ 10^7.  The streaming evaluator walks phi in fixed-size
+blocks, keeps running reductions per curve and optionally hands each
+block to a writer, so memory is bounded by the block size.  The phase
+samples, curve extremes and meta are bit-identical to the in-memory path.
+"""
+
+import math
+import os
+import numpy as np
+
+from .worm_model import (
+    CURVE_KEYS, resolve_dtype, parse_inputs, design_terms, harmonics,
+    phase_curves, apply_load_sharing, fatigue_terms, life_curve, life_meta, scalar_meta,
+    _py_scalar,
+)
+from .collective import parse_collective, collective_terms, collective_meta
+
+
+class _RunningStats:
+    """Running max/min/mean/RMS and argmax phase of one curve."""
+
+    def __init__(self):
+        self.max = -math.inf
+        self.min = math.inf
+        self.argmax_phi = None
+        self.argmax_index = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._n = 0
+
+    def update(self, start, phi, y):
+        i = int(np.argmax(y))
+        y_max = float(y[i])
+        if y_max > self.max:  # strict: keep the first occurrence, like np.argmax
+            self.max = y_max
+            self.argmax_index = start + i
+            self.argmax_phi = float(phi[i])
+        self.min = min(self.min, float(y.min()))
+        y64 = y.astype(np.float64, copy=False)
+        self._sum += float(np.sum(y64))
+        self._sumsq += float(np.dot(y64, y64))
+        self._n += y.size
+
+    def result(self):
+        n = max(self._n, 1)
+        return {
+            "max": self.max,
+            "min": self.min,
+            "mean": self._sum / n,
+            "rms": math.sqrt(self._sumsq / n),
+            "argmax_phi": self.argmax_phi,
+            "argmax_index": self.argmax_index,
+        }
+
+
+class NpyBlockWriter:
+    """Write streamed blocks into one ``<curve>.npy`` file per curve.
+
+    Files are memory-mapped (``np.lib.format.open_memmap``), so only the
+    current block is touched in RAM.
+    """
+
+    def __init__(self, folder, keys=("phi",) + CURVE_KEYS):
+        self.folder = folder
+        self.keys = keys
+        self._maps = None
+        os.makedirs(folder, exist_ok=True)
+
+    def open(self, steps, dtype):
+        self._maps = {
+            k: np.lib.format.open_memmap(os.path.join(self.folder, f"{k}.npy"),
+                                         mode="w+", dtype=dtype, shape=(steps,))
+            for k in self.keys
+        }
+
+    def __call__(self, start, phi, curves):
+        stop = start + phi.size
+        for k, mm in self._maps.items():
+            mm[start:stop] = phi if k == "phi" else curves[k]
+
+    def close(self):
+        for mm in (self._maps or {}).values():
+            mm.flush()
+        self._maps = None
+
+
+def iter_phase_blocks(steps, block, dtype=np.float64):
+    """Yield (start, phi_block) covering phi = 0..2*pi in ``block`` chunks.
+
+    Samples are computed exactly like ``np.linspace(0, 2*pi, steps,
+    endpoint=False)`` so blocks concatenate to the in-memory grid.
+    """
+    step = (2 * np.pi) / steps
+    for start in range(0, steps, block):
+        stop = min(start + block, steps)
+        phi = np.arange(start, stop, dtype=np.float64) * step
+        yield start, phi.astype(dtype, copy=False)
+
+
+def compute_worm_cycle_chunked(inp, steel, wheel, block=1 << 20, writer=None, dtype=None):
+    """
+    Evaluate one design block by block.
+
+    Parameters
+    ----------
+    inp, steel, wheel :
+        Same as ``compute_worm_cycle``.
+    block : int
+        Number of phase samples per block (bounds peak memory).
+    writer : callable, optional
+        Called as ``writer(start, phi_block, curves_block)`` for every
+        block.  Objects with ``open(steps, dtype)`` / ``close()`` (e.g.
+        ``NpyBlockWriter``) are opened and closed around the sweep.
+    dtype : str or numpy dtype, optional
+        Phase-array precision, as in ``compute_worm_cycle``.
+
+    Returns
+    -------
+    dict with keys:
+        stats: {curve: {max, min, mean, rms, argmax_phi, argmax_index}}
+        meta: same dict as ``compute_worm_cycle`` plus steps and block
+        life: ``life_curve`` of the design
+        collective: ``collective_terms`` (only when ``load_collective`` is given)
+    """
+    dt = resolve_dtype(dtype if dtype is not None else inp.get("precision"))
+    block = int(block)
+    if block <= 0:
+        raise ValueError("block must be a positive number of samples.")
+    p = parse_inputs(inp)
+    d = design_terms(p, steel, wheel)
+    steps = p["steps"]
+    block = min(block, max(steps, 1))
+
+    # Buffers sized once and reused for every block
+    hbuf = np.empty((4, block), dtype=dt)
+    cbuf = {k: np.empty(block, dtype=dt) for k in CURVE_KEYS}
+    stats = {k: _RunningStats() for k in CURVE_KEYS}
+
+    if writer is not None and hasattr(writer, "open"):
+        writer.open(steps, dt)
+    try:
+        for start, phi in iter_phase_blocks(steps, block, dt):
+            n = phi.size
+            h = harmonics(phi, p["z1"], dt, out=hbuf[:, :n])
+            curves = phase_curves(d, h, dt, out={k: v[:n] for k, v in cbuf.items()})
+            apply_load_sharing(p, d, phi, curves)
+            for k in CURVE_KEYS:
+                stats[k].update(start, phi, curves[k])
+            if writer is not None:
+                writer(start, phi, curves)
+    finally:
+        if writer is not None and hasattr(writer, "close"):
+            writer.close()
+
+    st = {k: s.result() for k, s in stats.items()}
+    extremes = (st["sigma_root_MPa"]["max"], st["sigma_root_MPa"]["min"],
+                st["p_contact_MPa"]["max"])
+    f = fatigue_terms(p, wheel, *extremes)
+    meta = scalar_meta(p, d, f)
+    res = {"stats": st, "meta": meta}
+
+    # Lives and load collective from the running extremes, as in compute_worm_cycle
+    life = life_curve(p, wheel, *extremes)
+    res["life"] = life
+    meta.update({k: _py_scalar(v) for k, v in life_meta(life).items()})
+    spec = parse_collective(inp.get("load_collective"))
+    if spec is not None:
+        coll = collective_terms(p, steel, wheel, spec)
+        res["collective"] = coll
+        meta.update({k: _py_scalar(v) for k, v in collective_meta(coll).items()})
+
+    meta["steps"] = steps
+    meta["block"] = block
+    return res
@@ -0,0 +1,403 @@
+"""
+Long-running studies with checkpoint / resume.
+
+Three drivers built on the staged model:
+
+- ``run_sweep``: a list of designs evaluated in batches (full phase model),
+  optionally skipping geometrically infeasible designs.
+- ``run_monte_carlo``: scatter of parsed inputs around a base design,
+  reduced to running aggregates (mean, std, min, max, failure share).
+- ``run_optimization``: differential evolution over parsed inputs.
+
+Each driver periodically writes a checkpoint (completed count, RNG state,
+partial aggregates or population) and, given the same arguments and
+checkpoint path, resumes from it.  Work is done in fixed chunks /
+generations and RNG draws happen in the same order, so a resumed run
+returns bit-identical results.  Checkpoints are written to a temporary
+file and renamed into place, so a crash mid-write leaves the previous
+checkpoint intact.
+"""
+
+import hashlib
+import json
+import os
+import time
+import numpy as np
+
+from .batch import stack_inputs
+from .feasibility import screen as screen_geometry
+from .graph import ModelGraph
+from .history import card_hash
+from .worm_model import parse_inputs, design_terms, peak_factors, fatigue_terms
+
+
+CHECKPOINT_FORMAT = "wormgear-checkpoint"
+CHECKPOINT_VERSION = 1
+
+# Outputs reduced by the Monte Carlo / optimizer evaluator
+PEAK_KEYS = ("eta0", "SF_root", "SF_contact", "damage_root", "a_mm", "T2_Nm", "temp_C")
+
+
+def fingerprint(*parts):
+    """Stable hash of JSON-compatible study arguments."""
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    """Atomic ``.npz`` checkpoint: JSON state plus named arrays.
+
+    ``save`` writes at most every ``every_s`` seconds unless forced.  A
+    checkpoint whose fingerprint differs from the study's is refused.
+    """
+
+    def __init__(self, path, every_s=30.0):
+        self.path = path
+        self.every_s = float(every_s)
+        self._last = time.monotonic()
+
+    def load(self, fp):
+        """(state, arrays) of an existing checkpoint, or None."""
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path, allow_pickle=False) as z:
+            state = json.loads(str(z["__state__"]))
+            arrays = {k: z[k] for k in z.files if k != "__state__"}
+        if state.get("format") != CHECKPOINT_FORMAT:
+            raise ValueError(f"Not a study checkpoint: {self.path}")
+        if state.get("fingerprint") != fp:
+            raise ValueError(f"Checkpoint {self.path} belongs to a different study.")
+        return state, arrays
+
+    def save(self, fp, state, arrays, force=False):
+        """Write the checkpoint if due (or forced); returns True if written."""
+        now = time.monotonic()
+        if not force and now - self._last < self.every_s:
+            return False
+        header = dict(state, format=CHECKPOINT_FORMAT, version=CHECKPOINT_VERSION,
+                      fingerprint=fp)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, __state__=np.array(json.dumps(header)), **arrays)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._last = now
+        return True
+
+    def clear(self):
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _as_checkpoint(checkpoint):
+    if checkpoint is None or isinstance(checkpoint, Checkpoint):
+        return checkpoint
+    return Checkpoint(checkpoint)
+
+
+def evaluate_peaks(p, steel, wheel):
+    """PEAK_KEYS for parsed (array) designs without phase arrays."""
+    d = design_terms(p, steel, wheel)
+    s_hi, s_lo, p_hi = peak_factors(p, d)
+    f = fatigue_terms(p, wheel, d["sigma_base"] * s_hi, d["sigma_base"] * s_lo,
+                      d["p_base"] * p_hi)
+    shape = np.shape(d["sigma_base"])
+    out = {"eta0": d["eta0"], "SF_root": f["SF_root"], "SF_contact": f["SF_contact"],
+           "damage_root": f["damage_root"], "a_mm": d["a_mm"], "T2_Nm": d["T2_base"],
+           "temp_C": d["temp_C"]}
+    return {k: np.broadcast_to(np.asarray(v, dtype=float), shape) for k, v in out.items()}
+
+
+def _stack(p0, n):
+    return {k: np.full(n, v) for k, v in p0.items()}
+
+
+# ----------------------------------------------------------------------
+# Sweep
+# ----------------------------------------------------------------------
+def run_sweep(inputs, steel, wheel, chunk=256, checkpoint=None, progress=None, history=None,
+              screen=False, graph=None):
+    """
+    Evaluate a list of designs in batches of ``chunk``.
+
+    Returns dict of meta arrays over all designs (as ``compute_worm_batch``).
+    ``progress(done, total)`` is called after every chunk; each chunk is
+    also stored in ``history`` (a ``DesignHistory``) when given.  On resume,
+    designs recorded after the last checkpoint (rows of source "sweep"
+    with these cards added since the sweep started) are not stored again.
+
+    With ``screen=True`` designs failing a geometric feasibility check
+    (``feasibility.screen``) skip the stress model: the meta arrays then
+    cover the evaluated designs only, ``index`` holds their positions in
+    ``inputs`` and ``rejected`` = {"index", "reason"} lists the others
+    with their violated constraints.
+
+    Chunks are evaluated through ``graph`` (a ``ModelGraph``, a new one by
+    default), so stages whose inputs repeat from the previous chunk are
+    reused; ``graph.totals`` counts reused and recomputed stages.
+    """
+    ck = _as_checkpoint(checkpoint)
+    graph = ModelGraph() if graph is None else graph
+    fp = fingerprint("sweep", inputs, steel, wheel, chunk, screen)
+    total = len(inputs)
+    done, parts, state = 0, {}, {}
+    if ck is not None:
+        loaded = ck.load(fp)
+        if loaded is not None:
+            state, arrays = loaded
+            done = state["done"]
+            parts = {k: [v] for k, v in arrays.items()}
+
+    # Designs evaluated so far, and those of them already in the history
+    evaluated = state.get("evaluated", 0)
+    recorded = 0
+    hist_id = state.get("history_id")
+    if history is not None:
+        rows = {"source": "sweep", "steel_hash": card_hash(steel), "wheel_hash": card_hash(wheel)}
+        if hist_id is None:
+            last = history.query(columns=["id"], order_by="id", descending=True, limit=1)["id"]
+            hist_id = int(last[0]) if last.size else 0
+            if ck is not None and not state:
+                # Mark where this sweep's rows start before the first chunk
+                ck.save(fp, {"kind": "sweep", "done": 0, "evaluated": 0, "history_id": hist_id},
+                        {}, force=True)
+        else:
+            recorded = history.count(id=(hist_id + 1, None), **rows)
+
+    while done < total:
+        end = min(done + chunk, total)
+        batch = inputs[done:end]
+        meta = None
+        if screen:
+            sc = screen_geometry(stack_inputs(batch))
+            ok = np.flatnonzero(sc["ok"])
+            bad = np.flatnonzero(~sc["ok"])
+            parts.setdefault("index", []).append(done + ok)
+            parts.setdefault("rejected_index", []).append(done + bad)
+            parts.setdefault("rejected_reason", []).append(sc["reason"][bad])
+            batch = [batch[i] for i in ok]
+        if batch:
+            meta = graph.compute_batch(batch, steel, wheel)["meta"]
+            skip = min(max(recorded - evaluated, 0), len(batch))
+            if history is not None and skip < len(batch):
+                history.add_batch(batch[skip:], {k: v[skip:] for k, v in meta.items()},
+                                  steel, wheel, source="sweep")
+            evaluated += len(batch)
+            for k, v in meta.items():
+                parts.setdefault(k, []).append(v)
+        done = end
+        if ck is not None:
+            ck.save(fp, {"kind": "sweep", "done": done, "evaluated": evaluated,
+                         "history_id": hist_id},
+                    {k: np.concatenate(v) for k, v in parts.items()}, force=done == total)
+        if progress is not None:
+            progress(done, total)
+
+    out = {k: np.concatenate(v) for k, v in parts.items()}
+    if screen:
+        out["rejected"] = {"index": out.pop("rejected_index"),
+                           "reason": out.pop("rejected_reason")}
+    return out
+
+
+# ----------------------------------------------------------------------
+# Monte Carlo
+# ----------------------------------------------------------------------
+def _draw(rng, scatter, m):
+    """Samples for each scattered key, drawn in sorted key order."""
+    out = {}
+    for key in sorted(scatter):
+        kind, a, b = scatter[key]
+        if kind == "normal":
+            out[key] = rng.normal(a, b, m)
+        elif kind == "uniform":
+            out[key] = rng.uniform(a, b, m)
+        else:
+            raise ValueError(f"Unknown distribution {kind!r} for {key!r}.")
+    return out
+
+
+def run_monte_carlo(base_inp, steel, wheel, scatter, n_samples, seed=0, chunk=4096,
+                    SF_min=1.0, checkpoint=None, progress=None):
+    """
+    Monte Carlo scatter of a design.
+
+    Parameters
+    ----------
+    base_inp : dict
+        String-valued inputs of the nominal design.
+    scatter : dict
+        Parsed-input key (e.g. "T1", "mu", "temp_C", "b") ->
+        ("normal", mean, std) or ("uniform", low, high).
+    n_samples : int
+        Number of samples.
+    seed : int
+        Seed of the PCG64 generator.
+    SF_min : float
+        A sample fails when SF_root or SF_contact < SF_min or damage >= 1.
+
+    Returns
+    -------
+    dict with n, p_fail and per PEAK_KEYS output mean, std, min, max.
+    """
+    ck = _as_checkpoint(checkpoint)
+    fp = fingerprint("mc", base_inp, steel, wheel, scatter, n_samples, seed, chunk, SF_min)
+    p0 = parse_inputs(base_inp)
+    rng = np.random.Generator(np.random.PCG64(seed))
+    nk = len(PEAK_KEYS)
+    agg = {"count": np.zeros(nk), "sum": np.zeros(nk), "sumsq": np.zeros(nk),
+           "min": np.full(nk, np.inf), "max": np.full(nk, -np.inf), "fail": np.zeros(1)}
+    done = 0
+    if ck is not None:
+        loaded = ck.load(fp)
+        if loaded is not None:
+            state, arrays = loaded
+            done = state["done"]
+            rng.bit_generator.state = state["rng"]
+            agg = {k: arrays[k].copy() for k in agg}
+
+    while done < n_samples:
+        m = min(chunk, n_samples - done)
+        p = _stack(p0, m)
+        p.update(_draw(rng, scatter, m))
+        out = evaluate_peaks(p, steel, wheel)
+        vals = np.stack([out[k] for k in PEAK_KEYS])          # (keys, m)
+        finite = np.isfinite(vals)
+        v0 = np.where(finite, vals, 0.0)
+        agg["count"] += finite.sum(axis=1)
+        agg["sum"] += v0.sum(axis=1)
+        agg["sumsq"] += (v0 * v0).sum(axis=1)
+        agg["min"] = np.minimum(agg["min"], np.where(finite, vals, np.inf).min(axis=1))
+        agg["max"] = np.maximum(agg["max"], np.where(finite, vals, -np.inf).max(axis=1))
+        fail = ((np.nan_to_num(out["SF_root"], nan=np.inf) < SF_min)
+                | (np.nan_to_num(out["SF_contact"], nan=np.inf) < SF_min)
+                | (out["damage_root"] >= 1.0))
+        agg["fail"] += np.count_nonzero(fail)
+        done += m
+        if ck is not None:
+            ck.save(fp, {"kind": "mc", "done": done, "rng": rng.bit_generator.state}, agg,
+                    force=done == n_samples)
+        if progress is not None:
+            progress(done, n_samples)
+
+    res = {"n": done, "p_fail": float(agg["fail"][0] / max(done, 1))}
+    for i, key in enumerate(PEAK_KEYS):
+        c = agg["count"][i]
+        mean = agg["sum"][i] / c if c else np.nan
+        var = max(agg["sumsq"][i] / c - mean * mean, 0.0) if c else np.nan
+        res[key] = {"mean": float(mean), "std": float(np.sqrt(var)),
+                    "min": float(agg["min"][i]), "max": float(agg["max"][i])}
+    return res
+
+
+# ----------------------------------------------------------------------
+# Optimization
+# ----------------------------------------------------------------------
+_INT_PARAMS = ("z1", "z2")
+_INFEASIBLE = 1e31      # fitness per violated geometric constraint
+
+
+def _fitness(p0, keys, X, steel, wheel, objective, SF_min):
+    p = _stack(p0, X.shape[0])
+    for j, key in enumerate(keys):
+        p[key] = np.rint(X[:, j]).astype(np.int64) if key in _INT_PARAMS else X[:, j]
+    if "z2" in keys or "z1" in keys:
+        p["ratio"] = p["z2"] / np.maximum(p["z1"], 1)
+    # Geometrically infeasible members skip the stress model and rank
+    # behind every feasible one, fewer violations first
+    viol = screen_geometry(p)["violations"]
+    n_viol = np.sum([v for v in viol.values()], axis=0)
+    fit = _INFEASIBLE * n_viol.astype(float)
+    ok = np.flatnonzero(n_viol == 0)
+    if ok.size == 0:
+        return fit
+    out = evaluate_peaks({k: v[ok] for k, v in p.items()}, steel, wheel)
+    sign, name = (-1.0, objective[1:]) if objective.startswith("-") else (1.0, objective)
+    obj = sign * out[name]
+    sf = np.minimum(np.nan_to_num(out["SF_root"], nan=np.inf),
+                    np.nan_to_num(out["SF_contact"], nan=np.inf))
+    penalty = np.maximum(SF_min - sf, 0.0) + np.maximum(out["damage_root"] - 1.0, 0.0)
+    fit[ok] = np.where(np.isfinite(obj), obj, 1e30) + 1e6 * penalty
+    return fit
+
+
+def run_optimization(base_inp, steel, wheel, bounds, objective="a_mm", SF_min=1.0,
+                     pop_size=32, generations=100, seed=0, F=0.7, CR=0.9,
+                     checkpoint=None, progress=None, seeds=None):
+    """
+    Differential evolution (rand/1/bin) over parsed inputs.
+
+    Parameters
+    ----------
+    bounds : dict
+        Parsed-input key (e.g. "mn", "q", "x2", "b", "z1") -> (low, high).
+    objective : str
+        PEAK_KEYS name to minimize; a leading "-" maximizes (e.g. "-eta0").
+    SF_min : float
+        Constraint on min(SF_root, SF_contact); damage must stay < 1.
+        Designs must also pass the geometric feasibility checks.
+    seeds : dict, optional
+        Parsed-input key -> values of known good designs (e.g. the nearest
+        stored designs from ``neighbors.DesignIndex``); they replace the
+        first members of the random initial population (clipped to
+        ``bounds``, keys not given stay random).
+
+    Returns
+    -------
+    dict with best (parsed-key values), best_fitness, history (best
+    fitness per generation), population and fitness.
+    """
+    ck = _as_checkpoint(checkpoint)
+    keys = sorted(bounds)
+    fp = fingerprint("de", base_inp, steel, wheel, {k: list(bounds[k]) for k in keys}, objective,
+                     SF_min, pop_size, generations, seed, F, CR,
+                     {k: list(map(float, v)) for k, v in (seeds or {}).items()})
+    p0 = parse_inputs(base_inp)
+    lo = np.array([bounds[k][0] for k in keys], dtype=float)
+    hi = np.array([bounds[k][1] for k in keys], dtype=float)
+    rng = np.random.Generator(np.random.PCG64(seed))
+
+    gen, history = 0, []
+    loaded = ck.load(fp) if ck is not None else None
+    if loaded is not None:
+        state, arrays = loaded
+        gen = state["generation"]
+        rng.bit_generator.state = state["rng"]
+        X, fit, history = arrays["population"], arrays["fitness"], list(arrays["history"])
+    else:
+        X = lo + rng.random((pop_size, len(keys))) * (hi - lo)
+        for key, vals in (seeds or {}).items():
+            if key in keys:
+                vals = np.asarray(vals, dtype=float)[:pop_size]
+                j = keys.index(key)
+                X[:vals.size, j] = np.clip(vals, lo[j], hi[j])
+        fit = _fitness(p0, keys, X, steel, wheel, objective, SF_min)
+
+    idx = np.arange(pop_size)
+    while gen < generations:
+        # Three distinct partners per member, all different from the member
+        r = np.argsort(rng.random((pop_size, pop_size)) + (idx[:, None] == idx[None, :]), axis=1)[:, :3]
+        mutant = np.clip(X[r[:, 0]] + F * (X[r[:, 1]] - X[r[:, 2]]), lo, hi)
+        cross = rng.random(X.shape) < CR
+        cross[idx, rng.integers(0, len(keys), pop_size)] = True
+        trial = np.where(cross, mutant, X)
+        f_trial = _fitness(p0, keys, trial, steel, wheel, objective, SF_min)
+        better = f_trial <= fit
+        X = np.where(better[:, None], trial, X)
+        fit = np.where(better, f_trial, fit)
+        gen += 1
+        history.append(float(fit.min()))
+        if ck is not None:
+            ck.save(fp, {"kind": "de", "generation": gen, "rng": rng.bit_generator.state},
+                    {"population": X, "fitness": fit, "history": np.array(history)},
+                    force=gen == generations)
+        if progress is not None:
+            progress(gen, generations)
+
+    best = int(np.argmin(fit))
+    vals = {k: (int(np.rint(X[best, j])) if k in _INT_PARAMS else float(X[best, j]))
+            for j, k in enumerate(keys)}
+    return {"best": vals, "best_fitness": float(fit[best]), "history": np.array(history),
+            "population": X, "fitness": fit}
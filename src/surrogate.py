@@ -0,0 +1,251 @@
+"""
+Surrogate of the model for instant previews.
+
+A ``Surrogate`` maps the main parsed inputs (``SURROGATE_INPUTS``) to
+``SURROGATE_OUTPUTS`` and is fitted from stored designs, typically sweep
+rows of the design history evaluated with the same material cards
+(``fit_from_history``).  Positive scale inputs (torque, speed, module,
+face width, life) enter in log space, SF and damage are fitted in log
+space, and all inputs are scaled to [-1, 1] over the training box.
+
+For every output two models are fitted and the one with the lower
+k-fold cross-validation RMSE is kept:
+
+- ``poly``: quadratic response surface (least squares).
+- ``rbf``: cubic radial basis functions with a linear tail on at most
+  ``MAX_CENTERS`` training points, lightly smoothed.
+
+The cross-validation RMSE is the error estimate: ``predict`` returns the
+value with a lo / hi band of one RMSE (in the fitted space) and flags
+designs outside the training box, where the estimate does not hold.
+Log-space outputs with an RMSE above ``MAX_LOG_RMSE`` decades are not
+predicted at all (damage near the endurance limit typically is).
+"""
+
+import numpy as np
+
+from .history import card_hash
+from .worm_model import parse_inputs
+
+
+SURROGATE_INPUTS = ("T1", "n1", "mn", "z1", "z2", "beta_deg_in", "x2", "b", "mu",
+                    "temp_C", "life_h")
+SURROGATE_OUTPUTS = ("SF_root", "SF_contact", "eta0", "damage_root")
+
+_LOG_INPUTS = ("T1", "n1", "mn", "b", "life_h")
+_LOG_OUTPUTS = ("SF_root", "SF_contact", "damage_root")
+# Damage below the endurance limit is 0; fit log10 of a floored value
+DAMAGE_FLOOR = 1e-12
+
+MAX_ROWS = 20000
+MAX_CENTERS = 1500
+RBF_SMOOTHING = 1e-8
+CV_FOLDS = 5
+# Log-space outputs less accurate than this (decades) are left out of predictions
+MAX_LOG_RMSE = 1.0
+
+
+def _forward(name, y):
+    if name == "damage_root":
+        return np.log10(np.maximum(y, DAMAGE_FLOOR))
+    if name in _LOG_OUTPUTS:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.log(y)
+    return y
+
+
+def _inverse(name, v):
+    if name == "damage_root":
+        return np.where(v <= np.log10(DAMAGE_FLOOR), 0.0, 10.0 ** v)
+    if name in _LOG_OUTPUTS:
+        return np.exp(v)
+    return v
+
+
+class _PolyModel:
+    """Quadratic response surface."""
+
+    kind = "poly"
+
+    @staticmethod
+    def _features(Z):
+        n, d = Z.shape
+        iu, ju = np.triu_indices(d)
+        return np.hstack([np.ones((n, 1)), Z, Z[:, iu] * Z[:, ju]])
+
+    def fit(self, Z, y):
+        F = self._features(Z)
+        self.coef = np.linalg.lstsq(F, y, rcond=None)[0]
+        return self
+
+    def predict(self, Z):
+        return self._features(Z) @ self.coef
+
+
+def _dist(A, B):
+    """Euclidean distances between the rows of A and B."""
+    sq = (A * A).sum(axis=1)[:, None] + (B * B).sum(axis=1)[None, :] - 2.0 * (A @ B.T)
+    return np.sqrt(np.maximum(sq, 0.0))
+
+
+class _RbfModel:
+    """Cubic RBF interpolant with a linear polynomial tail."""
+
+    kind = "rbf"
+
+    def fit(self, Z, y):
+        n, d = Z.shape
+        A = _dist(Z, Z) ** 3
+        A[np.diag_indices(n)] += RBF_SMOOTHING * max(float(np.abs(A).max()), 1.0)
+        P = np.hstack([np.ones((n, 1)), Z])
+        K = np.block([[A, P], [P.T, np.zeros((d + 1, d + 1))]])
+        rhs = np.concatenate([y, np.zeros(d + 1)])
+        try:
+            sol = np.linalg.solve(K, rhs)
+        except np.linalg.LinAlgError:
+            sol = np.linalg.lstsq(K, rhs, rcond=None)[0]
+        self.centers, self.w, self.c = Z, sol[:n], sol[n:]
+        return self
+
+    def predict(self, Z):
+        return (_dist(Z, self.centers) ** 3) @ self.w + np.hstack([np.ones((Z.shape[0], 1)), Z]) @ self.c
+
+
+_MODELS = (_PolyModel, _RbfModel)
+
+
+def _cv_rmse(model_cls, Z, y, folds, rng):
+    """k-fold cross-validation RMSE."""
+    fold = rng.permutation(Z.shape[0]) % folds
+    sq = 0.0
+    for k in range(folds):
+        test = fold == k
+        pred = model_cls().fit(Z[~test], y[~test]).predict(Z[test])
+        sq += float(((pred - y[test]) ** 2).sum())
+    return float(np.sqrt(sq / Z.shape[0]))
+
+
+class Surrogate:
+    """
+    Fitted surrogate over ``inputs`` (parsed-input names).
+
+    Use ``Surrogate.fit`` or ``fit_from_history``; ``models`` maps each
+    output to (model, cv_rmse).
+    """
+
+    def __init__(self, inputs, lo, hi, models, n_train):
+        self.inputs = tuple(inputs)
+        self.lo, self.hi = lo, hi
+        self.models = models
+        self.n_train = n_train
+
+    @staticmethod
+    def _transform(inputs, X):
+        X = np.array(X, dtype=float)
+        for j, name in enumerate(inputs):
+            if name in _LOG_INPUTS:
+                X[:, j] = np.log(np.maximum(X[:, j], 1e-300))
+        return X
+
+    @classmethod
+    def fit(cls, X, Y, inputs=SURROGATE_INPUTS, folds=CV_FOLDS, seed=0):
+        """
+        Fit every output in ``Y`` from the input columns in ``X``.
+
+        Parameters
+        ----------
+        X : dict
+            Parsed-input name -> (n,) array for each of ``inputs``.
+        Y : dict
+            Output name -> (n,) array; rows with non-finite values are
+            left out of that output's fit.
+        """
+        rng = np.random.Generator(np.random.PCG64(seed))
+        T = cls._transform(inputs, np.column_stack([X[k] for k in inputs]))
+        ok = np.all(np.isfinite(T), axis=1)
+        lo, hi = T[ok].min(axis=0), T[ok].max(axis=0)
+        # Inputs constant over the training set drop out
+        keep = hi > lo
+        inputs = tuple(k for k, kp in zip(inputs, keep) if kp)
+        T, lo, hi = T[:, keep], lo[keep], hi[keep]
+        Z = 2.0 * (T - lo) / (hi - lo) - 1.0
+
+        models = {}
+        for name, y in Y.items():
+            v = _forward(name, np.asarray(y, dtype=float))
+            rows = np.flatnonzero(ok & np.isfinite(v))
+            n_poly = 1 + len(inputs) + len(inputs) * (len(inputs) + 1) // 2
+            if rows.size < max(2 * n_poly, 4 * folds):
+                continue
+            best = None
+            for model_cls in _MODELS:
+                sub = rows
+                if model_cls is _RbfModel and rows.size > MAX_CENTERS:
+                    sub = np.sort(rng.choice(rows, MAX_CENTERS, replace=False))
+                err = _cv_rmse(model_cls, Z[sub], v[sub], folds, rng)
+                if best is None or err < best[1]:
+                    best = (model_cls().fit(Z[sub], v[sub]), err)
+            models[name] = best
+        if not models:
+            raise ValueError("Too few stored designs to fit a surrogate.")
+        return cls(inputs, lo, hi, models, int(np.count_nonzero(ok)))
+
+    def predict(self, p):
+        """
+        Predict parsed inputs (scalars or (n,) arrays).
+
+        Returns
+        -------
+        dict output -> {"value", "lo", "hi"} (arrays, or floats for one
+        design) and "extrapolated" (True outside the training box).
+        Outputs beyond ``MAX_LOG_RMSE`` are missing.
+        """
+        cols = [np.atleast_1d(np.asarray(p[k], dtype=float)) for k in self.inputs]
+        n = max(c.size for c in cols)
+        T = self._transform(self.inputs, np.column_stack([np.broadcast_to(c, (n,)) for c in cols]))
+        Z = 2.0 * (T - self.lo) / (self.hi - self.lo) - 1.0
+        scalar = all(np.ndim(p[k]) == 0 for k in self.inputs)
+        out = {"extrapolated": np.any(np.abs(Z) > 1.0 + 1e-9, axis=1)}
+        for name, (model, err) in self.models.items():
+            if name in _LOG_OUTPUTS and err > MAX_LOG_RMSE:
+                continue
+            v = model.predict(Z)
+            out[name] = {"value": _inverse(name, v), "lo": _inverse(name, v - err),
+                         "hi": _inverse(name, v + err)}
+        if scalar:
+            out = {k: bool(v[0]) if k == "extrapolated" else {kk: float(vv[0]) for kk, vv in v.items()}
+                   for k, v in out.items()}
+        return out
+
+    def predict_inputs(self, inp):
+        """``predict`` for one string-valued input dict."""
+        return self.predict(parse_inputs(inp))
+
+    def summary(self):
+        """Output -> (model kind, cross-validation RMSE in the fitted space)."""
+        return {name: (model.kind, err) for name, (model, err) in self.models.items()}
+
+
+def _stored_column(name, columns):
+    """History column of a parsed input (``in_<name>`` where meta has the name)."""
+    return "in_" + name if "in_" + name in columns else name
+
+
+def fit_from_history(db, steel, wheel, source="sweep", max_rows=MAX_ROWS, seed=0):
+    """
+    Fit a ``Surrogate`` from the most recent stored designs.
+
+    Only rows evaluated with these material cards (by card hash) and, when
+    given, of ``source`` are used.
+    """
+    cols = db.columns
+    names = {k: _stored_column(k, cols) for k in SURROGATE_INPUTS}
+    missing = [c for c in list(names.values()) + list(SURROGATE_OUTPUTS) if c not in cols]
+    if missing:
+        raise ValueError(f"Design history lacks columns: {', '.join(missing)}")
+    data = db.query(columns=list(names.values()) + list(SURROGATE_OUTPUTS), order_by="id",
+                    descending=True, limit=max_rows, source=source,
+                    steel_hash=card_hash(steel), wheel_hash=card_hash(wheel))
+    X = {k: data[c] for k, c in names.items()}
+    Y = {k: data[k] for k in SURROGATE_OUTPUTS}
+    return Surrogate.fit(X, Y, seed=seed)
@@ -0,0 +1,267 @@
+"""
+Measured load traces: memory-mapped import, min/max overview, rainflow.
+
+Traces of 10^8 samples stay on disk: ``.npy`` files and raw float32 /
+float64 files are memory-mapped; CSV is converted once (in blocks) into a
+raw float64 file in the temporary directory and mapped from there.
+
+``overview`` reduces any sample range to a fixed number of min/max bins
+for plotting.  ``rainflow`` walks the trace in blocks: turning points of
+each block are appended to the open residue, closed cycles are removed by
+the four-point rule (vectorized passes, then a short stack loop), and the
+residue carries over to the next block.  Cycles are reduced on the fly to
+a range histogram and a Miner damage sum, so memory stays bounded by the
+block size.
+"""
+
+import hashlib
+import itertools
+import os
+import tempfile
+import numpy as np
+
+from .worm_model import sn_cycles, mean_stress_amplitude
+
+
+BLOCK = 1 << 22
+OVERVIEW_BINS = 2000
+HIST_BINS = 64
+RAW_DTYPES = {".f32": np.float32, ".f64": np.float64, ".bin": np.float64, ".raw": np.float64}
+# Stop the vectorized passes once a pass closes fewer than this share of points
+_PASS_MIN_SHARE = 0.01
+
+
+def _csv_column(path, column, block_lines=1 << 20):
+    """Convert one CSV column to a raw float64 file; returns its path.
+
+    Fields are split at ';' or ',' (tabs count as either), or at runs of
+    whitespace when a line has neither.
+    """
+    st = os.stat(path)
+    tag = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{column}"
+    out = os.path.join(tempfile.gettempdir(),
+                       "wormgear_trace_" + hashlib.sha1(tag.encode()).hexdigest()[:16] + ".f64")
+    # An empty conversion cannot be mapped; redo it instead of reusing it
+    if os.path.exists(out) and os.path.getsize(out) > 0:
+        return out
+    tmp = out + ".tmp"
+    n = 0
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as src, open(tmp, "wb") as dst:
+            lines = (ln for ln in src if ln.strip() and not ln.lstrip().startswith("#"))
+            first = True
+            while True:
+                chunk = list(itertools.islice(lines, block_lines))
+                if not chunk:
+                    break
+                # The last line of a block is data even when the first is a header
+                delim = ";" if ";" in chunk[-1] else "," if "," in chunk[-1] else None
+                if delim is None:
+                    rows = [ln.split() for ln in chunk]
+                else:
+                    rows = [ln.replace("\t", delim).split(delim) for ln in chunk]
+                if first:
+                    # Header line(s): drop leading rows that do not parse
+                    while rows:
+                        try:
+                            float(rows[0][column])
+                            break
+                        except (ValueError, IndexError):
+                            rows.pop(0)
+                    first = False
+                vals = np.array([r[column] for r in rows], dtype=np.float64)
+                vals.tofile(dst)
+                n += vals.size
+        if n == 0:
+            raise ValueError(f"No numeric samples in column {column} of {path!r}.")
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, out)
+    return out
+
+
+def open_trace(path, dtype=None, column=-1):
+    """
+    Memory-map a trace file as a 1-D array.
+
+    Parameters
+    ----------
+    path : str
+        ``.npy``, ``.csv`` / ``.txt``, or raw binary (``.f32``, ``.f64``,
+        ``.bin``, ``.raw``).
+    dtype : str or numpy dtype, optional
+        Raw file dtype (default from the extension, float64 otherwise).
+    column : int
+        Column of a CSV file or a 2-D ``.npy`` (default: last).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        x = np.load(path, mmap_mode="r")
+        return x[:, column] if x.ndim == 2 else x.reshape(-1)
+    if ext in (".csv", ".txt"):
+        return np.memmap(_csv_column(path, column), dtype=np.float64, mode="r")
+    dt = np.dtype(dtype) if dtype is not None else np.dtype(RAW_DTYPES.get(ext, np.float64))
+    return np.memmap(path, dtype=dt, mode="r")
+
+
+def overview(x, start=0, stop=None, bins=OVERVIEW_BINS):
+    """
+    Min/max envelope of ``x[start:stop]`` in ``bins`` bins.
+
+    Returns (index, lo, hi): bin start indices and the per-bin extremes.
+    Reads the range in blocks, so a zoomed view only touches its slice.
+    """
+    n = x.shape[0]
+    stop = n if stop is None else min(int(stop), n)
+    start = max(int(start), 0)
+    span = max(stop - start, 1)
+    step = max(span // bins, 1)
+    m = (span + step - 1) // step
+    lo = np.empty(m)
+    hi = np.empty(m)
+    per = max(BLOCK // step, 1)
+    for b0 in range(0, m, per):
+        b1 = min(b0 + per, m)
+        seg = np.asarray(x[start + b0 * step:min(start + b1 * step, stop)], dtype=np.float64)
+        full = (seg.size // step) * step
+        if full:
+            v = seg[:full].reshape(-1, step)
+            lo[b0:b0 + v.shape[0]] = v.min(axis=1)
+            hi[b0:b0 + v.shape[0]] = v.max(axis=1)
+        if full < seg.size:
+            lo[b1 - 1] = seg[full:].min()
+            hi[b1 - 1] = seg[full:].max()
+    return start + np.arange(m) * step, lo, hi
+
+
+def _turning(v):
+    """Indices of the interior turning points of a duplicate-free series."""
+    d = np.diff(v)
+    return np.flatnonzero(np.sign(d[1:]) != np.sign(d[:-1])) + 1
+
+
+def _close_cycles(v):
+    """
+    Four-point rainflow on turning points ``v``.
+
+    Returns (ranges, means, residue) of the closed full cycles and the
+    open residue.
+    """
+    rngs, means = [], []
+    # Vectorized passes: every range no larger than both neighbours closes
+    while v.size >= 4:
+        r = np.abs(np.diff(v))
+        ok = np.zeros(r.size, dtype=bool)
+        ok[1:-1] = (r[1:-1] <= r[:-2]) & (r[1:-1] <= r[2:])
+        # Equal adjacent ranges share a point; take the first of each run
+        ok[1:] &= ~ok[:-1]
+        i = np.flatnonzero(ok)
+        if i.size == 0:
+            break
+        rngs.append(r[i])
+        means.append(0.5 * (v[i] + v[i + 1]))
+        keep = np.ones(v.size, dtype=bool)
+        keep[i] = False
+        keep[i + 1] = False
+        v = v[keep]
+        if i.size < _PASS_MIN_SHARE * v.size:
+            break
+    # Stack pass for what the vectorized passes left behind
+    stack, r_s, m_s = [], [], []
+    for val in v.tolist():
+        stack.append(val)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4:]
+            rbc = abs(b - c)
+            if rbc <= abs(a - b) and rbc <= abs(c - d):
+                r_s.append(rbc)
+                m_s.append(0.5 * (b + c))
+                del stack[-3:-1]
+            else:
+                break
+    rngs.append(np.array(r_s))
+    means.append(np.array(m_s))
+    return np.concatenate(rngs), np.concatenate(means), np.array(stack)
+
+
+def rainflow(x, scale=1.0, hist_max=None, bins=HIST_BINS, sn_list=None, mean_stress=0,
+             Rm=None, walker_gamma=0.5, progress=None, cancel=None):
+    """
+    Rainflow count and Miner damage of a (memory-mapped) trace.
+
+    Parameters
+    ----------
+    x : array_like
+        Trace samples (any length; read in blocks of ``BLOCK``).
+    scale : float
+        Factor to root stress (MPa per trace unit; 1 for stress traces).
+    hist_max : float, optional
+        Upper edge of the range histogram in MPa (default: trace span).
+    bins : int
+        Histogram bins.
+    sn_list : list, optional
+        Root S-N points ``[[N, MPa], ...]``; without them damage is NaN.
+    mean_stress, Rm, walker_gamma
+        Mean-stress correction (see ``mean_stress_amplitude``).
+    progress : callable, optional
+        ``progress(done, total)`` after every block.
+    cancel : callable, optional
+        Returns True to abort (raises InterruptedError).
+
+    Returns
+    -------
+    dict with edges / counts (range histogram, MPa, half cycles as 0.5),
+    cycles (full + half), damage (per trace pass), max_range, samples.
+    """
+    n = x.shape[0]
+    if hist_max is None:
+        _, lo, hi = overview(x, bins=1)
+        hist_max = float(hi.max() - lo.min()) * abs(scale)
+    edges = np.linspace(0.0, max(hist_max, 1e-12), bins + 1)
+    counts = np.zeros(bins)
+    damage = 0.0
+    cycles = 0.0
+    max_range = 0.0
+
+    def _account(r, m, weight):
+        nonlocal damage, cycles, max_range
+        if r.size == 0:
+            return
+        r = r * abs(scale)
+        m = m * scale
+        counts[:] += np.histogram(np.minimum(r, edges[-1]), bins=edges)[0] * weight
+        cycles += weight * r.size
+        max_range = max(max_range, float(r.max()))
+        if sn_list:
+            amp = 0.5 * r
+            if np.any(mean_stress):
+                amp = mean_stress_amplitude(amp, m, mean_stress, Rm, walker_gamma)
+            N = sn_cycles(sn_list, amp)
+            with np.errstate(divide="ignore"):
+                damage += weight * float(np.sum(np.where(amp > 0, 1.0 / N, 0.0)))
+
+    residue = np.empty(0)
+    for b0 in range(0, n, BLOCK):
+        if cancel is not None and cancel():
+            raise InterruptedError("Rainflow cancelled.")
+        seg = np.asarray(x[b0:b0 + BLOCK], dtype=np.float64)
+        # The residue alternates, so its points stay turning points; only its
+        # last point (the previous block's final sample) is re-evaluated
+        v = np.concatenate([residue, seg])
+        v = v[np.r_[True, np.diff(v) != 0]]
+        if v.size > 2:
+            v = v[np.r_[0, _turning(v), v.size - 1]]
+        r, m, residue = _close_cycles(v)
+        _account(r, m, 1.0)
+        if progress is not None:
+            progress(min(b0 + BLOCK, n), n)
+
+    # Open residue: half cycles between consecutive turning points
+    if residue.size > 1:
+        _account(np.abs(np.diff(residue)), 0.5 * (residue[1:] + residue[:-1]), 0.5)
+    if not sn_list:
+        damage = float("nan")
+    return {"edges": edges, "counts": counts, "cycles": cycles, "damage": damage,
+            "max_range": max_range, "samples": int(n)}
@@ -0,0 +1,134 @@
+"""
+Archard wear of the polymer wheel flank over service life.
+
+The wear depth h grows as
+
+    dh/dt = k * p * ds/dt
+
+with the specific wear rate k (mm^3/(N*m), wheel card ``wear_k_mm3_Nm``),
+the contact pressure p (MPa) and the sliding distance a wheel flank sees
+per hour, 3600 * v_s * eps / z2 (each tooth is engaged for eps/z2 of a
+wheel revolution while the worm slides over it at v_s).
+
+Wear thins the tooth, s = s0 - h, so the root stress rises with
+(s0/s)^2, while the worn flank conforms to the worm and the contact
+pressure falls with (1 + h/h_ref)^-1/2.  Geometry, materials and loads
+are evaluated once; each time chunk only rescales the stress levels,
+accumulates Miner damage and advances h.
+"""
+
+import math
+import numpy as np
+
+from .worm_model import (
+    parse_inputs, design_terms, peak_factors, sn_allow, sn_cycles, mean_stress_amplitude,
+)
+
+
+# Flank conformity depth, as a share of the module
+H_REF_MN = 0.1
+# Default wear limit, as a share of the module
+WEAR_MAX_MN = 0.25
+
+
+def sliding_speed(d1_mm, n1_rpm, gamma):
+    """Worm/wheel sliding speed (m/s)."""
+    return math.pi * d1_mm * n1_rpm / 60000.0 / np.maximum(np.cos(gamma), 1e-6)
+
+
+def simulate_wear(inp, steel, wheel, chunk_h=None, wear_max_mm=None, SF_min=1.0):
+    """
+    Integrate flank wear over ``life_h`` in time chunks.
+
+    Parameters
+    ----------
+    inp : dict
+        String-valued model inputs (as for ``compute_worm_cycle``).
+    steel, wheel : dict
+        Material cards; the wheel card must carry ``wear_k_mm3_Nm``.
+    chunk_h : float, optional
+        Chunk length in hours (default life_h / 200, at least 1 h).
+    wear_max_mm : float, optional
+        Wear limit (default 0.25 * mn).
+    SF_min : float
+        Stop once SF_root or SF_contact falls below this.
+
+    Returns
+    -------
+    dict with hours, wear_mm, s_tooth_mm, sigma_root_MPa, p_contact_MPa,
+    SF_root, SF_contact and damage_root (cumulative Miner sum) per chunk
+    boundary, plus stop_h, stop_reason ("life", "wear", "SF_root",
+    "SF_contact") and wear_rate_mm_h (initial).
+    """
+    k_wear = wheel.get("wear_k_mm3_Nm")
+    if k_wear is None:
+        raise ValueError("Wear simulation needs wear_k_mm3_Nm on the wheel card.")
+
+    p = parse_inputs(inp)
+    d = design_terms(p, steel, wheel)
+    s_hi, s_lo, p_hi = peak_factors(p, d)
+
+    life_h = float(p["life_h"])
+    chunk_h = float(chunk_h) if chunk_h else max(life_h / 200.0, 1.0)
+    wear_max = float(wear_max_mm) if wear_max_mm else WEAR_MAX_MN * p["mn"]
+
+    # Constant per design: sliding distance per hour, tooth thickness, allowables
+    v_s = sliding_speed(float(d["d1"]), p["n1"], float(d["gamma"]))
+    slide_m_h = 3600.0 * v_s * float(d["eps_alpha"]) / max(p["z2"], 1)
+    s0 = 0.5 * math.pi * p["mn"]
+    h_ref = H_REF_MN * p["mn"]
+    sn = wheel.get("SN", {})
+    root_sn = sn.get("root_allow_MPa_vs_N", [])
+    contact_sn = sn.get("contact_allow_MPa_vs_N", [])
+    N_life = p["n1"] * 60 * life_h / p["ratio"]
+    allow_root = float(sn_allow(root_sn, N_life)) if root_sn else math.nan
+    allow_contact = float(sn_allow(contact_sn, N_life)) if contact_sn else math.nan
+    cycles_h = p["n1"] * 60 * p["z1"]
+    sigma_base, p_base = float(d["sigma_base"]), float(d["p_base"])
+
+    def levels(h):
+        thin = (s0 / max(s0 - h, 1e-3 * s0)) ** 2
+        conform = 1.0 / math.sqrt(1.0 + h / h_ref)
+        return sigma_base * thin, p_base * conform
+
+    n_chunks = int(math.ceil(life_h / chunk_h))
+    rows = []
+    t, h, D = 0.0, 0.0, 0.0
+    reason = "life"
+    rate0 = None
+    for i in range(n_chunks + 1):
+        sig, pc = levels(h)
+        sf_r = allow_root / (sig * s_hi) if sig > 0 else math.nan
+        sf_c = allow_contact / (pc * p_hi) if pc > 0 else math.nan
+        rows.append((t, h, s0 - h, sig * s_hi, pc * p_hi, sf_r, sf_c, D))
+        if h >= wear_max:
+            reason = "wear"
+        elif sf_r < SF_min:
+            reason = "SF_root"
+        elif sf_c < SF_min:
+            reason = "SF_contact"
+        if reason != "life" or i == n_chunks:
+            break
+
+        dt = min(chunk_h, life_h - t)
+        rate = k_wear * pc * slide_m_h                     # mm/h
+        if rate0 is None:
+            rate0 = rate
+        # Miner damage of this chunk at the current stress levels
+        if root_sn:
+            amp = 0.5 * sig * (s_hi - s_lo)
+            if p["mean_stress"]:
+                amp = mean_stress_amplitude(amp, 0.5 * sig * (s_hi + s_lo), p["mean_stress"],
+                                            wheel.get("Rm_MPa"), wheel.get("walker_gamma", 0.5))
+            N_allow = float(sn_cycles(root_sn, amp))
+            D += cycles_h * dt / N_allow if N_allow > 0 else math.inf
+        h += rate * dt
+        t += dt
+
+    cols = np.array(rows, dtype=float).T
+    keys = ("hours", "wear_mm", "s_tooth_mm", "sigma_root_MPa", "p_contact_MPa",
+            "SF_root", "SF_contact", "damage_root")
+    out = dict(zip(keys, cols))
+    out.update(stop_h=float(t), stop_reason=reason, wear_max_mm=wear_max,
+               wear_rate_mm_h=float(rate0 or 0.0), chunk_h=chunk_h)
+    return out
@@ -5,11 +5,63 @@ Computes contact stress, root stress, torque, efficiency and fatigue
 across one full mesh cycle (phi = 0..2*pi).
 
 This is a lightweight proxy model for trend analysis, not a full FEM solver.
+
+The model is split into stages (inputs -> geometry -> materials -> loads ->
+phase curves -> safety factors / damage).  Every stage works on plain
+scalars as well as on 1-D arrays of designs, which is what the batch,
+catalog and sweep tools build on.
 """
 
 import math
+from functools import lru_cache
 import numpy as np
 
+from .facewidth import slice_loads, khb_from_slices, khb_batch
+from .loadshare import contact_ratio, tooth_loads
+
+
+# Cycle curves returned by the model, in export order.
+CURVE_KEYS = ("p_contact_MPa", "sigma_root_MPa", "T2_Nm", "eta", "Nc_proxy")
+
+# Phase ripple of each curve relative to its base value:
+#   curve = base * (c0 + s1*sin(z1 phi) + c1*cos(z1 phi)
+#                      + s2*sin(2 z1 phi) + c2*cos(2 z1 phi))
+# base = None means the curve is dimensionless (base 1).
+RIPPLE = {
+    "p_contact_MPa": ("p_base", 1.0, (0.06, 0.0, 0.0, 0.03)),
+    "sigma_root_MPa": ("sigma_base", 1.0, (0.08, 0.0, 0.0, 0.04)),
+    "T2_Nm": ("T2_base", 1.0, (0.04, 0.0, 0.02, 0.0)),
+    "eta": ("eta0", 0.985, (0.0, 0.015, 0.0, 0.0)),
+    "Nc_proxy": (None, 1.0, (0.15, 0.0, 0.0, 0.08)),
+}
+
+# Mean-stress correction models (index stored in p["mean_stress"])
+MEAN_STRESS_MODELS = ("none", "goodman", "gerber", "walker")
+
+# Default relative peak-error tolerance for steps="auto"
+PHASE_TOL = 1e-4
+
+# Life curve: points per curve, spanning +/- LIFE_DECADES around life_h
+LIFE_POINTS = 121
+LIFE_DECADES = 3.0
+
+_DTYPES = {"float64": np.float64, "float32": np.float32}
+
+
+def resolve_dtype(precision=None):
+    """Map a precision option ("float64"/"float32" or a dtype) to a numpy dtype."""
+    if precision is None or precision == "":
+        return np.dtype(np.float64)
+    if isinstance(precision, str):
+        key = precision.strip().lower()
+        if key not in _DTYPES:
+            raise ValueError(f"Unsupported precision: {precision!r} (use float64 or float32)")
+        return np.dtype(_DTYPES[key])
+    dt = np.dtype(precision)
+    if dt not in (np.dtype(np.float64), np.dtype(np.float32)):
+        raise ValueError(f"Unsupported precision: {dt} (use float64 or float32)")
+    return dt
+
 
 def _interp_Et(wheel, temp_C):
     """Interpolate elastic modulus E(T) from material card."""
@@ -19,6 +71,8 @@ def _interp_Et(wheel, temp_C):
     pts = sorted(pts, key=lambda p: p[0])
     temps = [p[0] for p in pts]
     vals = [p[1] for p in pts]
+    if np.ndim(temp_C):
+        return np.interp(temp_C, temps, vals)
     return float(np.interp(temp_C, temps, vals))
 
 
@@ -33,65 +87,213 @@ def _interp_sn(sn_list, N):
     return float(np.interp(logN, ns, ss))
 
 
-def compute_worm_cycle(inp, steel, wheel):
+def sn_allow(sn_list, N):
+    """Vectorized allowable stress at N cycles (log10 interpolation on N)."""
+    pts = sorted(sn_list, key=lambda p: p[0])
+    ns = np.log10([p[0] for p in pts])
+    ss = np.array([p[1] for p in pts], dtype=float)
+    return np.interp(np.log10(np.maximum(N, 1)), ns, ss)
+
+
+def sn_cycles(sn_list, amp):
+    """Vectorized inverse S-N lookup: cycles to failure at stress amplitude.
+
+    Amplitudes below the lowest S-N stress return ``inf`` (no damage); an
+    infinite amplitude (mean stress at the strength limit) returns 0.
     """
-    Main computation entry point.
+    pts = sorted(sn_list, key=lambda p: p[1])
+    stresses = np.array([p[1] for p in pts], dtype=float)
+    log_ns = np.log10([p[0] for p in pts])
+    amp = np.asarray(amp, dtype=float)
+    n_allow = 10.0 ** np.interp(amp, stresses, log_ns)
+    n_allow = np.where(np.isposinf(amp), 0.0, n_allow)
+    return np.where(amp >= stresses[0], n_allow, np.inf)
+
+
+def sn_life(sn_list, stress):
+    """Vectorized cycles at which the allowable stress falls to ``stress``.
+
+    Inverse of ``sn_allow`` for a falling S-N curve: stresses above the
+    curve return 0, stresses at or below its lowest point ``inf``.
+    """
+    pts = sorted(sn_list, key=lambda p: p[1])
+    stresses = np.array([p[1] for p in pts], dtype=float)
+    log_ns = np.log10([p[0] for p in pts])
+    stress = np.asarray(stress, dtype=float)
+    n = np.where(stress > stresses[-1], 0.0, 10.0 ** np.interp(stress, stresses, log_ns))
+    return np.where(stress > stresses[0], n, np.inf)
+
+
+def mean_stress_amplitude(amp, mean, model, Rm=None, walker_gamma=0.5):
+    """
+    Equivalent fully reversed amplitude of counted cycles.
 
     Parameters
     ----------
-    inp : dict
-        All input parameters as string values.
-    steel : dict
-        Worm material JSON data.
-    wheel : dict
-        Wheel material JSON data.
+    amp, mean : array_like
+        Stress amplitude and mean of each cycle (MPa), any matching shape.
+    model : str or int
+        One of MEAN_STRESS_MODELS (or its index); array of indices for
+        mixed designs.
+    Rm : float or array_like
+        Ultimate strength (MPa), required by Goodman and Gerber.
+    walker_gamma : float or array_like
+        Walker exponent (0.5 is Smith-Watson-Topper).
+
+    Compressive means get no credit (amplitude unchanged).  Cycles whose
+    mean reaches Rm return ``inf``.
+    """
+    amp = np.asarray(amp, dtype=float)
+    mean = np.asarray(mean, dtype=float)
+    code = np.asarray(MEAN_STRESS_MODELS.index(model) if isinstance(model, str) else model)
+    if code.dtype.kind not in "iu":
+        code = code.astype(np.int64)
+    pos = np.maximum(mean, 0.0)
+    out = np.broadcast_to(amp, np.broadcast(amp, mean, code).shape).copy()
+
+    if np.any((code == 1) | (code == 2)):
+        if Rm is None or not np.all(np.asarray(Rm, dtype=float) > 0):
+            raise ValueError("Goodman/Gerber mean-stress correction needs Rm_MPa on the wheel card.")
+        r = pos / np.asarray(Rm, dtype=float)
+        with np.errstate(divide="ignore"):
+            good = np.where(r < 1.0, amp / (1.0 - r), np.inf)
+            gerb = np.where(r < 1.0, amp / (1.0 - r ** 2), np.inf)
+        out = np.where(code == 1, good, out)
+        out = np.where(code == 2, gerb, out)
+    if np.any(code == 3):
+        g = np.asarray(walker_gamma, dtype=float)
+        walk = np.maximum(amp + pos, 0.0) ** (1.0 - g) * np.maximum(amp, 0.0) ** g
+        out = np.where(code == 3, walk, out)
+    return out
+
+
+def _ripple_curvature(z1):
+    """Per-curve bound on |f''| / c0 for the RIPPLE harmonics at z1."""
+    z1 = np.asarray(z1, dtype=float)
+    out = {}
+    for key, (_, c0, (s1, c1, s2, c2)) in RIPPLE.items():
+        m2 = z1**2 * (abs(s1) + abs(c1)) + (2 * z1)**2 * (abs(s2) + abs(c2))
+        out[key] = m2 / c0
+    return out
+
+
+def phase_error_bound(z1, steps):
+    """Worst-case relative error of the sampled curve peaks.
+
+    Near a peak f' = 0, so the nearest of N uniform samples is within
+    |f''| * (pi/N)^2 / 2 of the true extreme.
+    """
+    m2 = np.max(np.stack(list(_ripple_curvature(z1).values())), axis=0)
+    return m2 * (np.pi / np.maximum(steps, 1)) ** 2 / 2.0
 
-    Returns
-    -------
-    dict with keys:
-        phi, p_contact_MPa, sigma_root_MPa, T2_Nm, eta, Nc_proxy, meta
+
+def auto_steps(z1, tol=PHASE_TOL):
+    """Smallest phase count that bounds peak error below ``tol``.
+
+    Uses the harmonics actually in the model (z1*phi and 2*z1*phi), keeps
+    at least 4 samples per period of the 2*z1 harmonic and rounds up to
+    a whole number of samples per mesh period (multiple of z1).
     """
-    # Parse inputs
-    T1 = float(inp.get("T1_Nm", 6.0))
-    n1 = float(inp.get("n1_rpm", 3000))
-    ratio = float(inp.get("ratio", 25))
-    z1 = int(float(inp.get("z1", 2)))
+    if tol <= 0:
+        raise ValueError("phase_tol must be positive.")
+    z1 = np.maximum(np.asarray(z1), 1)
+    m2 = np.max(np.stack(list(_ripple_curvature(z1).values())), axis=0)
+    n = np.ceil(np.pi * np.sqrt(m2 / (2.0 * tol)))
+    n = np.maximum(n, 8 * z1)
+    n = np.ceil(n / z1) * z1
+    return n.astype(int) if np.ndim(n) else int(n)
+
+
+# ======================================================================
+# Stages
+# ======================================================================
+def parse_inputs(inp):
+    """Convert the string-valued input dict to numbers (one design)."""
+    p = {
+        "T1": float(inp.get("T1_Nm", 6.0)),
+        "n1": float(inp.get("n1_rpm", 3000)),
+        "ratio": float(inp.get("ratio", 25)),
+        "z1": int(float(inp.get("z1", 2))),
+        "mn": float(inp.get("mn_mm", 2.5)),
+        "q": float(inp.get("q", 10)),
+        "x1": float(inp.get("x1", 0.0)),
+        "x2": float(inp.get("x2", 0.0)),
+        "b": float(inp.get("b_mm", 18)),
+        "alpha_n": math.radians(float(inp.get("alpha_n_deg", 20))),
+        "mu": float(inp.get("mu", 0.06)),
+        "KA": float(inp.get("KA", 1.1)),
+        "KV": float(inp.get("KV", 1.05)),
+        "KFb": float(inp.get("KFb", 1.0)),
+        "temp_C": float(inp.get("temp_C", 80)),
+        "life_h": float(inp.get("life_h", 3000)),
+        "rho_f": float(inp.get("rho_f_mm", 0.6)),
+        "beta_deg_in": float(inp.get("beta_deg", inp.get("gamma_deg", 0.0))),
+    }
+
     z2_txt = str(inp.get("z2", "")).strip()
-    mn = float(inp.get("mn_mm", 2.5))
-    q = float(inp.get("q", 10))
-    x1 = float(inp.get("x1", 0.0))
-    x2 = float(inp.get("x2", 0.0))
-    a_target_txt = inp.get("a_target_mm", "").strip()
-    b = float(inp.get("b_mm", 18))
-    alpha_n = math.radians(float(inp.get("alpha_n_deg", 20)))
-    mu = float(inp.get("mu", 0.06))
-    KA = float(inp.get("KA", 1.1))
-    KV = float(inp.get("KV", 1.05))
-    KHb = float(inp.get("KHb", 1.0))
-    KFb = float(inp.get("KFb", 1.0))
-    temp_C = float(inp.get("temp_C", 80))
-    life_h = float(inp.get("life_h", 3000))
-    steps = int(float(inp.get("steps", 720)))
-    rho_f = float(inp.get("rho_f_mm", 0.6))
-    beta_deg_in = float(inp.get("beta_deg", inp.get("gamma_deg", 0.0)))
-
-    # Worm geometry
+    z1 = p["z1"]
     if z2_txt:
-        z2 = int(float(z2_txt))
-        ratio = z2 / z1 if z1 > 0 else ratio
+        p["z2"] = int(float(z2_txt))
+        p["ratio"] = p["z2"] / z1 if z1 > 0 else p["ratio"]
     else:
-        z2 = int(round(ratio * z1))
-
-    beta_deg = max(0.5, min(beta_deg_in, 80.0))
-    beta = math.radians(beta_deg)
-    if abs(math.tan(beta)) > 1e-6:
-        d1 = z1 * mn / math.tan(beta)
+        p["z2"] = int(round(p["ratio"] * z1))
+
+    a_target_txt = str(inp.get("a_target_mm", "")).strip()
+    p["a_target"] = float(a_target_txt) if a_target_txt else math.nan
+
+    # Face load factor: fixed value, or "auto" from the face-width slices
+    khb_txt = str(inp.get("KHb", 1.0)).strip().lower()
+    p["KHb_auto"] = khb_txt == "auto"
+    p["KHb"] = 1.0 if p["KHb_auto"] else float(khb_txt)
+    p["n_slices"] = int(float(inp.get("n_slices", 15) or 0))
+    p["fHb"] = float(inp.get("fHb_um", 10) or 0)
+    p["crown"] = float(inp.get("crown_um", 5) or 0)
+
+    # Mean-stress correction of the root damage
+    ms_txt = str(inp.get("mean_stress", "none") or "none").strip().lower()
+    if ms_txt not in MEAN_STRESS_MODELS:
+        raise ValueError(f"Unknown mean-stress model {ms_txt!r}; "
+                         f"use one of {', '.join(MEAN_STRESS_MODELS)}.")
+    p["mean_stress"] = MEAN_STRESS_MODELS.index(ms_txt)
+    # Safety factor whose life the life curve reports
+    p["SF_target"] = float(inp.get("SF_target", 1.0) or 1.0)
+
+    # Multi-tooth load sharing instead of the contact-number proxy
+    p["load_sharing"] = str(inp.get("load_sharing", "")).strip().lower() in ("1", "on", "true", "yes")
+    p["tip_relief"] = float(inp.get("tip_relief_um", 5) or 0)
+
+    # Thermal balance mode (temp_C becomes an output)
+    p["thermal"] = str(inp.get("thermal", "")).strip().lower() in ("1", "on", "true", "yes")
+    p["T_amb"] = float(inp.get("T_amb_C", 40) or 40)
+    p["k_heat"] = float(inp.get("k_heat_W_m2K", 15) or 15)
+    p["A_housing"] = float(inp.get("A_housing_m2", 0.25) or 0.25)
+    # Warm start of the thermal iteration (e.g. a nearby stored design)
+    p["T_init"] = float(inp.get("T_init_C", "") or math.nan)
+
+    # Phase resolution: fixed count or "auto" from the harmonic content
+    steps_txt = str(inp.get("steps", 720)).strip().lower()
+    p["phase_tol"] = float(inp.get("phase_tol", PHASE_TOL) or PHASE_TOL)
+    p["steps_auto"] = steps_txt == "auto"
+    if p["steps_auto"]:
+        p["steps"] = auto_steps(z1, p["phase_tol"])
     else:
-        d1 = (q + 2.0 * x1) * mn
-        beta = math.atan2(z1 * mn, d1) if d1 > 0 else math.radians(5.0)
-        beta_deg = math.degrees(beta)
+        p["steps"] = int(float(steps_txt))
+    return p
+
+
+def geometry(p):
+    """Worm and wheel diameters, center distance, lead angle and pitches."""
+    z1, z2, mn = p["z1"], p["z2"], p["mn"]
+    x1, x2 = p["x1"], p["x2"]
+
+    # beta is clamped to >= 0.5 deg, so tan(beta) > 0 and d1 follows
+    # directly from the helix angle.
+    beta_deg = np.clip(p["beta_deg_in"], 0.5, 80.0)
+    beta = np.radians(beta_deg)
+    d1 = z1 * mn / np.tan(beta)
 
-    q = d1 / mn - 2.0 * x1 if mn > 0 else q
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.where(mn > 0, d1 / mn - 2.0 * x1, p["q"])
     da1 = d1 + 2.0 * mn                # worm tip diameter
     df1 = d1 - 2.4 * mn                # worm root diameter
     d2 = (z2 + 2.0 * x2) * mn          # wheel pitch diameter
@@ -99,20 +301,38 @@ def compute_worm_cycle(inp, steel, wheel):
     df2 = d2 - 2.0 * mn * (1.2 - x2)   # wheel root diameter
     a_calc = 0.5 * (d1 + d2)
 
-    a_target = float(a_target_txt) if a_target_txt else None
-    a_mm = a_target if a_target is not None else a_calc
-    delta_a = (a_target - a_calc) if a_target is not None else None
+    a_target = p["a_target"]
+    has_target = ~np.isnan(a_target)
+    a_mm = np.where(has_target, a_target, a_calc)
+    delta_a = np.where(has_target, a_target - a_calc, np.nan)
 
     # Lead angle, axial pitch, lead, worm length
-    gamma = beta if d1 > 0 else math.radians(5)
-    gamma_deg = math.degrees(gamma)
+    gamma = np.where(d1 > 0, beta, math.radians(5))
     px = mn * math.pi                   # axial pitch
     pz = px * z1                        # lead (= axial pitch * z1)
     L_worm = pz * 3.0 + 2.0 * mn       # typical worm length (approx)
-    # Wheel throat radius
-    r_throat = 0.5 * d2                 # throat radius for enveloping
 
-    # Material properties
+    return {
+        "d1": d1, "da1": da1, "df1": df1, "d2": d2, "da2": da2, "df2": df2,
+        "a_calc": a_calc, "a_mm": a_mm, "a_target": a_target, "delta_a": delta_a,
+        "q": q, "beta_deg": beta_deg, "gamma": gamma, "gamma_deg": np.degrees(gamma),
+        "px": px, "pz": pz, "L_worm": L_worm,
+        # Wheel throat radius for enveloping
+        "r_throat": 0.5 * d2,
+        "eps_alpha": contact_ratio(d2, da2, mn, p["alpha_n"]),
+    }
+
+
+def _interp_mu(wheel, temp_C, mu_default):
+    """Friction coefficient mu(T) from the card's friction_T, else the input mu."""
+    pts = wheel.get("friction_T", {}).get("points_C_mu", [])
+    if not pts:
+        return mu_default
+    pts = sorted(pts, key=lambda p: p[0])
+    return np.interp(temp_C, [p[0] for p in pts], [p[1] for p in pts])
+
+
+def _modulus(steel, wheel, temp_C):
     E1 = steel.get("elastic", {}).get("E_GPa", 210.0)
     nu1 = steel.get("elastic", {}).get("nu", 0.3)
     E2 = _interp_Et(wheel, temp_C)
@@ -120,125 +340,551 @@ def compute_worm_cycle(inp, steel, wheel):
 
     # Equivalent elastic modulus (Hertz)
     Eprime = 2.0 / ((1 - nu1**2) / E1 + (1 - nu2**2) / E2)  # GPa
+    return E1, E2, Eprime
 
-    # Efficiency (simplified friction model)
-    eta0 = math.cos(alpha_n) - mu / math.tan(gamma)
-    eta0 /= (math.cos(alpha_n) + mu * math.tan(gamma)) if math.cos(alpha_n) + mu * math.tan(gamma) != 0 else 1
-    eta0 = max(0.3, min(eta0, 0.98))
 
-    # Output torque
-    T2_base = T1 * ratio * eta0  # N*m
+def thermal_balance(p, g, wheel, tol=0.01, max_iter=100, T_init=None):
+    """
+    Steady-state oil/housing temperature from the loss-heat balance.
 
-    # Phase sweep
-    phi = np.linspace(0, 2 * np.pi, steps, endpoint=False)
-
-    # Mesh stiffness variation proxy (sinusoidal)
-    Nc_proxy = 1.0 + 0.15 * np.sin(z1 * phi) + 0.08 * np.cos(2 * z1 * phi)
-    eta = eta0 * (1.0 - 0.015 * (1.0 - np.cos(z1 * phi)))
-
-    # T2 ripple
-    T2_Nm = T2_base * (1.0 + 0.04 * np.sin(z1 * phi) + 0.02 * np.sin(2 * z1 * phi))
-
-    # Contact stress proxy (Hertz-like)
-    # p ~ sqrt(Fn * E' / (rho * b))
-    Ft_base = (2.0 * T1 * 1000.0 / d1) if d1 > 0 else 0.0
-    denom_fn = math.cos(alpha_n) * max(math.sin(gamma), 1e-5)
-    Fn_base = Ft_base / denom_fn if denom_fn > 0 else 0.0
-    rho_eq = 0.5 * d1 * math.sin(alpha_n) * max(math.cos(gamma), 0.05) if d1 > 0 else 1.0
-
-    K_total_H = KA * KV * KHb
-    p_base = 0.418 * math.sqrt(Fn_base * K_total_H * Eprime * 1000 / (rho_eq * b)) if (rho_eq * b) > 0 else 0
-    # Phase variation
-    p_contact_MPa = p_base * (1.0 + 0.06 * np.sin(z1 * phi) + 0.03 * np.cos(2 * z1 * phi))
-
-    # Root stress proxy (Lewis-like)
-    # sigma_F ~ Fn / (b * mn * Y)
-    Y_F = 2.2  # form factor proxy
-    K_total_F = KA * KV * KFb
-    sigma_base = (Fn_base * K_total_F * Y_F) / (b * mn) if (b * mn) > 0 else 0
-    sigma_root_MPa = sigma_base * (1.0 + 0.08 * np.sin(z1 * phi) + 0.04 * np.cos(2 * z1 * phi))
-
-    # S-N lookup for safety factors
+        P_loss = P_in * (1 - eta0(mu(T)))  =  k_heat * A_housing * (T - T_amb)
+
+    Solved by fixed-point iteration for all designs at once, starting from
+    ``T_init`` (NaN or None: T_amb); each design stops updating once its
+    step is below ``tol`` (K).  mu(T) comes from
+    the wheel card's ``friction_T.points_C_mu`` when present.
+
+    Returns dict with temp_C, mu, eta0, P_loss_W, converged (bool mask)
+    and iterations (per design).
+    """
+    P_in = p["T1"] * 2.0 * np.pi * p["n1"] / 60.0          # W
+    kA = np.maximum(p["k_heat"] * p["A_housing"], 1e-9)     # W/K
+    T_amb = p["T_amb"]
+    shape = np.broadcast(P_in, kA, T_amb, g["gamma"]).shape
+
+    if T_init is None:
+        T_init = T_amb
+    T = np.broadcast_to(np.where(np.isnan(T_init), T_amb, T_init), shape).astype(float)
+    converged = np.zeros(shape, dtype=bool)
+    iterations = np.zeros(shape, dtype=np.int64)
+    for _ in range(max_iter):
+        mu = _interp_mu(wheel, T, p["mu"])
+        eta0 = efficiency(p["alpha_n"], mu, g["gamma"])
+        T_new = T_amb + P_in * (1.0 - eta0) / kA
+        step = np.abs(T_new - T)
+        active = ~converged
+        T = np.where(active, T_new, T)
+        iterations = iterations + active
+        converged = converged | (step <= tol)
+        if converged.all():
+            break
+
+    mu = _interp_mu(wheel, T, p["mu"])
+    eta0 = efficiency(p["alpha_n"], mu, g["gamma"])
+    return {
+        "temp_C": T, "mu": mu, "eta0": eta0,
+        "P_loss_W": P_in * (1.0 - eta0), "converged": converged, "iterations": iterations,
+    }
+
+
+def material_terms(p, steel, wheel, temp_C=None):
+    """Elastic constants and equivalent Hertz modulus at temp_C."""
+    E1, E2, Eprime = _modulus(steel, wheel, p["temp_C"] if temp_C is None else temp_C)
+    return {"E1": E1, "E2": E2, "Eprime": Eprime}
+
+
+def efficiency(alpha_n, mu, gamma):
+    """Mesh efficiency eta0 (simplified friction model, clipped 0.3..0.98)."""
+    cos_an = np.cos(alpha_n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta0 = cos_an - mu / np.tan(gamma)
+        den = cos_an + mu * np.tan(gamma)
+        eta0 = np.where(den != 0, eta0 / np.where(den != 0, den, 1.0), eta0)
+    return np.clip(eta0, 0.3, 0.98)
+
+
+def load_terms(p, g, m):
+    """Efficiency, output torque, mesh forces and base stresses."""
+    alpha_n, gamma = p["alpha_n"], g["gamma"]
+    d1, b, mn = g["d1"], p["b"], p["mn"]
+    cos_an = np.cos(alpha_n)
+    eta0 = efficiency(alpha_n, m.get("mu", p["mu"]), gamma)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Output torque
+        T2_base = p["T1"] * p["ratio"] * eta0  # N*m
+
+        # Contact stress proxy (Hertz-like)
+        # p ~ sqrt(Fn * E' / (rho * b))
+        Ft_base = np.where(d1 > 0, 2.0 * p["T1"] * 1000.0 / d1, 0.0)
+        denom_fn = cos_an * np.maximum(np.sin(gamma), 1e-5)
+        Fn_base = np.where(denom_fn > 0, Ft_base / denom_fn, 0.0)
+        rho_eq = np.where(d1 > 0, 0.5 * d1 * np.sin(alpha_n) * np.maximum(np.cos(gamma), 0.05), 1.0)
+
+        K_total_H = p["KA"] * p["KV"] * p["KHb"]
+        rb = rho_eq * b
+        p_base = np.where(rb > 0, 0.418 * np.sqrt(Fn_base * K_total_H * m["Eprime"] * 1000 / rb), 0.0)
+
+        # Root stress proxy (Lewis-like)
+        # sigma_F ~ Fn / (b * mn * Y)
+        Y_F = 2.2  # form factor proxy
+        K_total_F = p["KA"] * p["KV"] * p["KFb"]
+        bm = b * mn
+        sigma_base = np.where(bm > 0, (Fn_base * K_total_F * Y_F) / bm, 0.0)
+
+    return {
+        "eta0": eta0, "T2_base": T2_base, "Ft_base": Ft_base, "Fn_base": Fn_base,
+        "rho_eq": rho_eq, "p_base": p_base, "sigma_base": sigma_base,
+    }
+
+
+def phase_grid(steps, dtype=np.float64):
+    """Phase sweep phi = 0..2*pi (endpoint excluded)."""
+    return np.linspace(0, 2 * np.pi, steps, endpoint=False, dtype=dtype)
+
+
+def harmonics(phi, z1, dtype=np.float64, out=None):
+    """sin/cos of z1*phi and 2*z1*phi, stacked as (4, ..., steps).
+
+    ``z1`` may be a scalar or a 1-D array of designs; the terms are written
+    into one preallocated buffer (``out`` if given) through ``out=``
+    arguments.
+    """
+    z1 = np.asarray(z1)[..., None] if np.ndim(z1) else z1
+    shape = np.broadcast_shapes(np.shape(phi), np.shape(z1))
+    h = np.empty((4,) + shape, dtype=dtype) if out is None else out
+    arg = np.empty(shape, dtype=dtype)
+    np.multiply(z1, phi, out=arg)
+    np.sin(arg, out=h[0])
+    np.cos(arg, out=h[1])
+    np.multiply(arg, 2, out=arg)
+    np.sin(arg, out=h[2])
+    np.cos(arg, out=h[3])
+    return h
+
+
+def phase_curves(terms, h, dtype=np.float64, out=None):
+    """Evaluate all RIPPLE curves from precomputed harmonics ``h``.
+
+    ``out`` may hold preallocated arrays for some or all curves.
+    """
+    shape = h.shape[1:]
+    scratch = np.empty(shape, dtype=dtype)
+    curves = {}
+    for key in CURVE_KEYS:
+        base_key, c0, coefs = RIPPLE[key]
+        buf = out.get(key) if out else None
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype)
+        buf[...] = c0
+        for coef, hk in zip(coefs, h):
+            if coef:
+                np.multiply(hk, coef, out=scratch)
+                np.add(buf, scratch, out=buf)
+        if base_key is not None:
+            base = terms[base_key]
+            if np.ndim(base):
+                base = np.asarray(base)[..., None]
+            np.multiply(buf, base, out=buf, casting="same_kind")
+        curves[key] = buf
+    return curves
+
+
+@lru_cache(maxsize=None)
+def ripple_extremes(key, samples=4096):
+    """(max, min) of a RIPPLE factor over one mesh period.
+
+    The ripple is periodic in z1*phi, so the extremes do not depend on z1;
+    tools that only need peak stresses use these instead of phase arrays.
+    """
+    phi = phase_grid(samples)
+    h = harmonics(phi, 1)
+    _, c0, coefs = RIPPLE[key]
+    f = c0 + sum(c * hk for c, hk in zip(coefs, h))
+    return float(f.max()), float(f.min())
+
+
+def apply_load_sharing(p, d, phi, curves):
+    """Replace the contact-number proxy by multi-tooth load sharing.
+
+    For designs with ``load_sharing`` on, root stress follows the load share
+    of the most loaded tooth, contact pressure its square root, and
+    ``Nc_proxy`` becomes the effective number of teeth carrying the load.
+    Curves are (steps,) or (designs, steps) and are updated in place.
+    """
+    on = np.broadcast_to(p.get("load_sharing", False), np.shape(p["z1"]))
+    if not on.any():
+        return curves
+    F = d["Fn_base"] * p["KA"] * p["KV"]
+    cols = [np.broadcast_to(np.asarray(a, dtype=float), on.shape) for a in
+            (p["z1"], d["eps_alpha"], p["b"], d["E2"], d["Eprime"], p["tip_relief"], F,
+             d["sigma_base"], d["p_base"])]
+    rows = [()] if on.ndim == 0 else [(i,) for i in np.flatnonzero(on)]
+    for i in rows:
+        z1, eps, b, E2, Eprime, relief, F_i, s_base, p_base = (c[i] for c in cols)
+        ls = tooth_loads(phi, int(z1), eps, b, E2, Eprime, relief, F_i)
+        curves["sigma_root_MPa"][i] = s_base * ls["share_max"]
+        curves["p_contact_MPa"][i] = p_base * np.sqrt(ls["share_max"])
+        curves["Nc_proxy"][i] = ls["n_eff"]
+    return curves
+
+
+def peak_factors(p, d, samples=512):
+    """(root max, root min, contact max) factors on the base stresses.
+
+    Ripple extremes, or for designs with ``load_sharing`` on, the extremes
+    of the most loaded tooth's share over one mesh pitch at the design's
+    load.  Scalars for a scalar design, else arrays over designs.
+    """
+    s_hi, s_lo = ripple_extremes("sigma_root_MPa")
+    p_hi, _ = ripple_extremes("p_contact_MPa")
+    on = np.broadcast_to(p.get("load_sharing", False), np.shape(p["z1"]))
+    if not on.any():
+        return s_hi, s_lo, p_hi
+
+    F = d["Fn_base"] * p["KA"] * p["KV"]
+    cols = [np.broadcast_to(np.asarray(a, dtype=float), on.shape) for a in
+            (p["z1"], d["eps_alpha"], p["b"], d["E2"], d["Eprime"], p["tip_relief"], F)]
+    out = [np.full(on.shape, v) for v in (s_hi, s_lo, p_hi)]
+    rows = [()] if on.ndim == 0 else [(i,) for i in np.flatnonzero(on)]
+    for i in rows:
+        z1, eps, b, E2, Eprime, relief, F_i = (c[i] for c in cols)
+        phi = np.linspace(0.0, 2 * np.pi / max(int(z1), 1), samples, endpoint=False)
+        share = tooth_loads(phi, int(z1), eps, b, E2, Eprime, relief, F_i)["share_max"]
+        out[0][i], out[1][i], out[2][i] = share.max(), share.min(), np.sqrt(share.max())
+    if on.ndim == 0:
+        return tuple(float(o) for o in out)
+    return tuple(out)
+
+
+def safety_terms(p, wheel, sigma_max, p_max):
+    """S-N safety factors of the peak root stress and contact pressure.
+
+    Missing S-N data or zero stress gives NaN safety factors.
+    """
     sn = wheel.get("SN", {})
     contact_sn = sn.get("contact_allow_MPa_vs_N", [])
     root_sn = sn.get("root_allow_MPa_vs_N", [])
 
-    N_life = n1 * 60 * life_h / ratio  # wheel cycles
-
-    sigma_root_max = float(np.max(sigma_root_MPa))
-    p_contact_max = float(np.max(p_contact_MPa))
+    N_life = p["n1"] * 60 * p["life_h"] / p["ratio"]  # wheel cycles
+    sigma_max = np.asarray(sigma_max, dtype=float)
+    p_max = np.asarray(p_max, dtype=float)
 
-    SF_root = None
+    nan = np.full(np.broadcast(N_life, sigma_max).shape, np.nan)
+    SF_root = nan.copy()
     if root_sn:
-        allow_root = _interp_sn(root_sn, max(N_life, 1))
-        if allow_root and sigma_root_max > 0:
-            SF_root = allow_root / sigma_root_max
+        allow_root = sn_allow(root_sn, N_life)
+        ok = (allow_root != 0) & (sigma_max > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            SF_root = np.where(ok, allow_root / sigma_max, np.nan)
 
-    SF_contact = None
+    SF_contact = nan.copy()
     if contact_sn:
-        allow_contact = _interp_sn(contact_sn, max(N_life, 1))
-        if allow_contact and p_contact_max > 0:
-            SF_contact = allow_contact / p_contact_max
+        allow_contact = sn_allow(contact_sn, N_life)
+        ok = (allow_contact != 0) & (p_max > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            SF_contact = np.where(ok, allow_contact / p_max, np.nan)
+    return {"N_life": N_life, "SF_root": SF_root, "SF_contact": SF_contact}
+
+
+def damage_terms(p, wheel, sigma_max, sigma_min):
+    """Miner damage of the root stress cycle over ``life_h``."""
+    root_sn = wheel.get("SN", {}).get("root_allow_MPa_vs_N", [])
+    sigma_max = np.asarray(sigma_max, dtype=float)
+    sigma_min = np.asarray(sigma_min, dtype=float)
 
     # Miner damage proxy (rainflow simplified: assume sinusoidal load)
     # For a sinusoidal stress, equivalent amplitude = (max-min)/2
-    sigma_amp = 0.5 * (float(np.max(sigma_root_MPa)) - float(np.min(sigma_root_MPa)))
-    damage_root = 0.0
-    if root_sn and sigma_amp > 0:
-        # Simplified: each revolution contributes z1 cycles of sigma_amp
-        n_revs = n1 * 60 * life_h
-        n_cycles_total = n_revs * z1
-        # Find allowable N for this amplitude from SN curve (inverse lookup)
-        pts = sorted(root_sn, key=lambda p: p[1], reverse=True)
-        log_ns = [math.log10(p[0]) for p in pts]
-        stresses = [p[1] for p in pts]
-        if sigma_amp >= min(stresses):
-            logN_allow = float(np.interp(sigma_amp, stresses[::-1], log_ns[::-1]))
-            N_allow = 10 ** logN_allow
-            damage_root = n_cycles_total / N_allow if N_allow > 0 else 999.0
-
-    meta = {
-        "z1": z1,
-        "z2": z2,
-        "d1_mm": d1,
-        "da1_mm": da1,
-        "df1_mm": df1,
-        "d2_mm": d2,
-        "da2_mm": da2,
-        "df2_mm": df2,
-        "a_mm": a_mm,
-        "a_calc_mm": a_calc,
-        "a_target_mm": a_target,
-        "delta_a_mm": delta_a,
-        "x1": x1,
-        "x2": x2,
-        "q": q,
-        "beta_deg": beta_deg,
-        "gamma_deg": gamma_deg,
-        "px_mm": px,
-        "pz_mm": pz,
-        "L_worm_mm": L_worm,
-        "alpha_n_deg": math.degrees(alpha_n),
-        "eta0": eta0,
-        "Eprime_GPa": Eprime,
-        "KA": KA,
-        "KV": KV,
-        "KHb": KHb,
-        "KFb": KFb,
-        "SF_root": SF_root,
-        "SF_contact": SF_contact,
-        "damage_root": damage_root,
-        "N_life": N_life,
-        "Fn_base_N": Fn_base,
-        "rho_eq_mm": rho_eq,
+    sigma_amp = 0.5 * (sigma_max - sigma_min)
+    sigma_mean = 0.5 * (sigma_max + sigma_min)
+    model = p.get("mean_stress", 0)
+    sigma_amp_eq = sigma_amp
+    if np.any(model):
+        sigma_amp_eq = mean_stress_amplitude(sigma_amp, sigma_mean, model, wheel.get("Rm_MPa"),
+                                             wheel.get("walker_gamma", 0.5))
+    # Simplified: each revolution contributes z1 cycles of sigma_amp
+    n_cycles_total = p["n1"] * 60 * p["life_h"] * p["z1"]
+    damage_root = np.zeros(np.broadcast(n_cycles_total, sigma_amp_eq).shape)
+    if root_sn:
+        N_allow = sn_cycles(root_sn, sigma_amp_eq)
+        with np.errstate(divide="ignore"):
+            damage_root = np.where(sigma_amp_eq > 0, n_cycles_total / N_allow, 0.0)
+    return {
+        "sigma_amp": sigma_amp, "sigma_mean": sigma_mean, "sigma_amp_eq": sigma_amp_eq,
+        "n_cycles_total": n_cycles_total, "damage_root": damage_root,
     }
 
+
+def fatigue_terms(p, wheel, sigma_max, sigma_min, p_max):
+    """S-N safety factors and Miner damage from the curve extremes.
+
+    Missing S-N data or zero stress gives NaN safety factors.
+    """
+    return {**safety_terms(p, wheel, sigma_max, p_max),
+            **damage_terms(p, wheel, sigma_max, sigma_min)}
+
+
+def life_hours(life_h, points=LIFE_POINTS, decades=LIFE_DECADES):
+    """Log-spaced hours around ``life_h`` ((points,), or (designs, points))."""
+    life_h = np.maximum(np.asarray(life_h, dtype=float), 1e-9)
+    return np.geomspace(life_h * 10.0 ** -decades, life_h * 10.0 ** decades, points, axis=-1)
+
+
+def life_curve(p, wheel, sigma_max, sigma_min, p_max, hours=None, SF_target=None):
+    """
+    Miner damage and safety factors versus operating hours in one pass.
+
+    N_life and the counted cycles are linear in the hours, so damage is the
+    damage per hour (``damage_terms`` at 1 h) times the hours and the
+    safety factors are ``safety_terms`` with all hours broadcast at once.
+    The lives follow in closed form: D = 1 at 1 / (damage per hour), SF =
+    target where the S-N allowable falls to target * peak stress
+    (``sn_life``).
+
+    Parameters
+    ----------
+    p : dict
+        Parsed inputs, scalars or 1-D design arrays.
+    sigma_max, sigma_min, p_max : float or array_like
+        Curve extremes per design.
+    hours : array_like, optional
+        Operating hours (H,); default ``life_hours(p["life_h"])``.
+    SF_target : float, optional
+        Safety factor for the SF lives; default ``p["SF_target"]``.
+
+    Returns
+    -------
+    dict with hours, damage_root, SF_root, SF_contact ((H,) or (designs,
+    H)), SF_target and the lives life_D1_h, life_SF_root_h,
+    life_SF_contact_h per design (inf = never, NaN = no S-N data).
+    """
+    sn = wheel.get("SN", {})
+    contact_sn = sn.get("contact_allow_MPa_vs_N", [])
+    root_sn = sn.get("root_allow_MPa_vs_N", [])
+    target = p.get("SF_target", 1.0) if SF_target is None else SF_target
+    hours = life_hours(p["life_h"]) if hours is None else np.asarray(hours, dtype=float)
+
+    def _col(v):
+        return np.asarray(v, dtype=float)[..., None]
+
+    sigma_max = np.asarray(sigma_max, dtype=float)
+    p_max = np.asarray(p_max, dtype=float)
+    rate = damage_terms(dict(p, life_h=1.0), wheel, sigma_max, sigma_min)["damage_root"]
+    sf = safety_terms({"n1": _col(p["n1"]), "ratio": _col(p["ratio"]), "life_h": hours},
+                      wheel, _col(sigma_max), _col(p_max))
+
+    # Wheel cycles -> hours
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h_per_cycle = p["ratio"] / (p["n1"] * 60.0)
+        life_D1 = np.where(rate > 0, 1.0 / rate, np.inf)
+    nan = np.full(np.shape(life_D1), np.nan)
+    life_root, life_contact = nan, nan.copy()
+    if root_sn:
+        life_root = np.where(sigma_max > 0, sn_life(root_sn, target * sigma_max) * h_per_cycle,
+                             np.nan)
+    if contact_sn:
+        life_contact = np.where(p_max > 0, sn_life(contact_sn, target * p_max) * h_per_cycle,
+                                np.nan)
     return {
-        "phi": phi,
-        "p_contact_MPa": p_contact_MPa,
-        "sigma_root_MPa": sigma_root_MPa,
-        "T2_Nm": T2_Nm,
-        "eta": eta,
-        "Nc_proxy": Nc_proxy,
-        "meta": meta,
+        "hours": hours, "damage_root": _col(rate) * hours, "SF_root": sf["SF_root"],
+        "SF_contact": sf["SF_contact"], "SF_target": target, "life_D1_h": life_D1,
+        "life_SF_root_h": life_root, "life_SF_contact_h": life_contact,
     }
+
+
+def life_meta(life):
+    """Meta fields of a life curve (the lives)."""
+    return {k: life[k] for k in ("life_D1_h", "life_SF_root_h", "life_SF_contact_h")}
+
+
+def operating_temperature(p, g, wheel):
+    """Temperature / friction stage: fixed temp_C, or the thermal balance."""
+    thermal = p.get("thermal", False)
+    th = None
+    if np.any(thermal):
+        th = thermal_balance(p, g, wheel, T_init=p.get("T_init"))
+    if th is None:
+        P_in = p["T1"] * 2.0 * np.pi * p["n1"] / 60.0
+        eta0 = efficiency(p["alpha_n"], p["mu"], g["gamma"])
+        return {"temp_C": p["temp_C"], "mu": p["mu"], "P_loss_W": P_in * (1.0 - eta0),
+                "thermal_converged": True, "thermal_iter": 0}
+    return {
+        "temp_C": np.where(thermal, th["temp_C"], p["temp_C"]),
+        "mu": np.where(thermal, th["mu"], p["mu"]),
+        "P_loss_W": th["P_loss_W"],
+        "thermal_converged": np.where(thermal, th["converged"], True),
+        "thermal_iter": np.where(thermal, th["iterations"], 0),
+    }
+
+
+def face_load_factor(p, d):
+    """KHb stage: the input value, or the face-width slice model for "auto".
+
+    The slice model is loaded with the nominal mesh force Fn * KA * KV.
+    """
+    auto = p.get("KHb_auto", False)
+    if not np.any(auto):
+        return p["KHb"]
+    F = d["Fn_base"] * p["KA"] * p["KV"]
+    args = (p["b"], p["mn"], d["Eprime"], p["n_slices"], F, p["fHb"], p["crown"])
+    if np.ndim(auto) == 0:
+        return khb_from_slices(*(float(a) for a in args[:3]), max(int(args[3]), 1),
+                               *(float(a) for a in args[4:]))
+    shape = np.shape(auto)
+    khb = np.array(np.broadcast_to(p["KHb"], shape), dtype=float)
+    idx = np.flatnonzero(auto)
+    sub = [np.broadcast_to(a, shape)[idx] for a in args]
+    sub[3] = np.maximum(sub[3], 1)
+    khb[idx] = khb_batch(*sub)
+    return khb
+
+
+def design_terms(p, steel, wheel):
+    """Geometry, material and load stages for scalar or array designs."""
+    g = geometry(p)
+    th = operating_temperature(p, g, wheel)
+    m = material_terms(p, steel, wheel, temp_C=th["temp_C"])
+    m["mu"] = th["mu"]
+    t = load_terms(p, g, m)
+    khb = face_load_factor(p, {**m, **t})
+    if np.any(p.get("KHb_auto", False)):
+        t = load_terms(dict(p, KHb=khb), g, m)
+    return {**g, **th, **m, **t, "KHb": khb}
+
+
+def build_meta(p, d, f):
+    """Assemble the meta dict (array-valued for batches)."""
+    return {
+        "z1": p["z1"],
+        "z2": p["z2"],
+        "d1_mm": d["d1"],
+        "da1_mm": d["da1"],
+        "df1_mm": d["df1"],
+        "d2_mm": d["d2"],
+        "da2_mm": d["da2"],
+        "df2_mm": d["df2"],
+        "a_mm": d["a_mm"],
+        "a_calc_mm": d["a_calc"],
+        "a_target_mm": d["a_target"],
+        "delta_a_mm": d["delta_a"],
+        "x1": p["x1"],
+        "x2": p["x2"],
+        "q": d["q"],
+        "beta_deg": d["beta_deg"],
+        "gamma_deg": d["gamma_deg"],
+        "px_mm": d["px"],
+        "pz_mm": d["pz"],
+        "L_worm_mm": d["L_worm"],
+        "alpha_n_deg": np.degrees(p["alpha_n"]),
+        "eta0": d["eta0"],
+        "Eprime_GPa": d["Eprime"],
+        "temp_C": d["temp_C"],
+        "mu": d["mu"],
+        "P_loss_W": d["P_loss_W"],
+        "thermal": p["thermal"],
+        "thermal_converged": d["thermal_converged"],
+        "thermal_iter": d["thermal_iter"],
+        "KA": p["KA"],
+        "KV": p["KV"],
+        "KHb": d["KHb"],
+        "KHb_auto": p["KHb_auto"],
+        "KFb": p["KFb"],
+        "SF_root": f["SF_root"],
+        "SF_contact": f["SF_contact"],
+        "damage_root": f["damage_root"],
+        "mean_stress": np.take(MEAN_STRESS_MODELS, p["mean_stress"]),
+        "sigma_amp_eq_MPa": f["sigma_amp_eq"],
+        "N_life": f["N_life"],
+        "Fn_base_N": d["Fn_base"],
+        "rho_eq_mm": d["rho_eq"],
+        "eps_alpha": d["eps_alpha"],
+        "load_sharing": p["load_sharing"],
+        "steps": p["steps"],
+        "steps_auto": p["steps_auto"],
+        "phase_err_bound": phase_error_bound(p["z1"], p["steps"]),
+    }
+
+
+def _py_scalar(v):
+    """0-d numpy value -> Python bool/int/float/str, NaN -> None."""
+    if isinstance(v, np.ndarray):
+        v = v[()]
+    if isinstance(v, str):
+        return str(v)
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    v = float(v)
+    return None if math.isnan(v) else v
+
+
+def scalar_meta(p, d, f):
+    """Meta dict of Python scalars for a single design."""
+    return {k: _py_scalar(v) for k, v in build_meta(p, d, f).items()}
+
+
+def compute_worm_cycle(inp, steel, wheel, dtype=None):
+    """
+    Main computation entry point.
+
+    Parameters
+    ----------
+    inp : dict
+        All input parameters as string values.
+    steel : dict
+        Worm material JSON data.
+    wheel : dict
+        Wheel material JSON data.
+    dtype : str or numpy dtype, optional
+        Precision of the phase arrays ("float64" default, "float32" to halve
+        memory).  Falls back to ``inp["precision"]``.  Meta values are always
+        computed in float64.
+
+    Returns
+    -------
+    dict with keys:
+        phi, p_contact_MPa, sigma_root_MPa, T2_Nm, eta, Nc_proxy, meta,
+        life (``life_curve``; meta gains its lives) (plus collective when
+        ``load_collective`` is given)
+    """
+    dt = resolve_dtype(dtype if dtype is not None else inp.get("precision"))
+    p = parse_inputs(inp)
+    d = design_terms(p, steel, wheel)
+
+    # Phase sweep
+    phi = phase_grid(p["steps"], dt)
+    h = harmonics(phi, p["z1"], dt)
+    curves = phase_curves(d, h, dt)
+    apply_load_sharing(p, d, phi, curves)
+
+    extremes = (curves["sigma_root_MPa"].max(), curves["sigma_root_MPa"].min(),
+                curves["p_contact_MPa"].max())
+    f = fatigue_terms(p, wheel, *extremes)
+
+    meta = scalar_meta(p, d, f)
+    res = {"phi": phi, **curves, "meta": meta}
+
+    # Damage and safety factors versus operating hours
+    life = life_curve(p, wheel, *extremes)
+    res["life"] = life
+    meta.update({k: _py_scalar(v) for k, v in life_meta(life).items()})
+
+    # Root stress across the face width (feeds the 3D plot)
+    if p["n_slices"] > 0 and p["b"] > 0:
+        sl = slice_loads(p["b"], p["mn"], float(d["Eprime"]), p["n_slices"],
+                         float(d["Fn_base"]) * p["KA"] * p["KV"], phi, p["z1"],
+                         p["fHb"], p["crown"])
+        res["x_slices_mm"] = sl["x_mm"]
+        # sigma_root already carries KHb; replace it with the local slice ratio
+        res["sigma_root_slices_MPa"] = (curves["sigma_root_MPa"][:, None] / d["KHb"]
+                                        * sl["load_ratio"]).astype(dt, copy=False)
+
+    # Load collective: per-bin SF and Miner damage over the duty cycle
+    from .collective import parse_collective, collective_terms, collective_meta
+    spec = parse_collective(inp.get("load_collective"))
+    if spec is not None:
+        coll = collective_terms(p, steel, wheel, spec)
+        res["collective"] = coll
+        meta.update({k: _py_scalar(v) for k, v in collective_meta(coll).items()})
+    return res
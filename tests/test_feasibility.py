@@ -0,0 +1,19 @@
+import numpy as np
+
+from src.batch import stack_inputs
+from src.feasibility import screen
+
+BASE = {"T1_Nm": "6", "n1_rpm": "3000", "z1": "2", "z2": "50", "mn_mm": "2.5",
+        "beta_deg": "11.31"}
+
+
+def test_positive_wheel_shift_is_feasible():
+    shifts = (-0.3, 0.0, 0.1, 0.2, 0.25, 0.3, 0.5)
+    res = screen(stack_inputs([dict(BASE, x2=str(x)) for x in shifts]))
+    assert res["ok"].all(), list(res["reason"])
+
+
+def test_center_distance_below_a_calc_fails_clearance():
+    res = screen(stack_inputs([dict(BASE, x2="0.3"), dict(BASE, x2="0.3", a_target_mm="70")]))
+    assert list(res["ok"]) == [True, False]
+    assert res["reason"][1] == "tip_clearance"